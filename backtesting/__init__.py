@@ -1,6 +1,20 @@
 """Backtesting utilities."""
 
-from .engine import run_backtest
-from .metrics import compute_metrics
+from .engine import BacktestResult, run_backtest
+from .metrics import MetricsAccumulator, compute_metrics
+from .portfolio import PortfolioResult, combine_portfolio
+from .plots import EquityCurve, prepare_equity_curve
+from .robustness import RobustnessReport, resample_returns
 
-__all__ = ["run_backtest", "compute_metrics"]
+__all__ = [
+    "BacktestResult",
+    "run_backtest",
+    "MetricsAccumulator",
+    "compute_metrics",
+    "EquityCurve",
+    "prepare_equity_curve",
+    "PortfolioResult",
+    "combine_portfolio",
+    "RobustnessReport",
+    "resample_returns",
+]
@@ -1,18 +1,278 @@
-"""Backtest engine skeleton."""
+"""Vectorized bar-level backtest engine.
+
+Positions follow the signal of the previous bar and are opened at the next
+bar's open. Every trade carries a stop-loss and a take-profit derived from
+the risk settings; hits are resolved from each bar's high/low with a fixed
+intrabar priority, so results are deterministic without tick data.
+
+Stop distances, leverage and the drawdown halt come from the array functions
+in ``risk_management``, the same ones the live loop uses.
+"""
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping
+
+import numpy as np
+import pandas as pd
+
+from risk_management import drawdown_halt_mask, position_leverage, stop_distances
+
+from .metrics import MetricsAccumulator
+
+EXIT_STOP = "stop"
+EXIT_TARGET = "target"
+EXIT_SIGNAL = "signal"
+EXIT_END = "end"
+
+
+@dataclass
+class BacktestResult:
+    metrics: Dict[str, float]
+    trades: pd.DataFrame
+    equity: np.ndarray
+    position: np.ndarray
+    stop: np.ndarray
+
+
+def _has_column(data: Any, name: str) -> bool:
+    if isinstance(data, list) and data and isinstance(data[0], Mapping):
+        return name in data[0]
+    return isinstance(data, (pd.DataFrame, Mapping)) and name in data
+
 
+def _column(data: Any, name: str) -> np.ndarray:
+    """Extract one column from a dataframe, mapping, list of dicts or raw array."""
+    if isinstance(data, list) and data and isinstance(data[0], Mapping):
+        data = pd.DataFrame(data)
+    if isinstance(data, (pd.DataFrame, Mapping)):
+        if name not in data:
+            raise ValueError(f"Missing required column: {name}")
+        return np.asarray(data[name], dtype=float)
+    return np.asarray(data, dtype=float)
 
-def run_backtest(signals: List[Dict[str, Any]], prices: List[Dict[str, Any]], config: Dict[str, Any]) -> Dict[str, float]:
-    """Run a simple backtest loop.
+
+def _empty_ledger() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "entry_index": np.array([], dtype=np.int64),
+            "exit_index": np.array([], dtype=np.int64),
+            "direction": np.array([], dtype=np.int8),
+            "entry_price": np.array([], dtype=float),
+            "exit_price": np.array([], dtype=float),
+            "stop_price": np.array([], dtype=float),
+            "target_price": np.array([], dtype=float),
+            "exit_reason": np.array([], dtype=object),
+            "r_multiple": np.array([], dtype=float),
+            "return": np.array([], dtype=float),
+            "pnl": np.array([], dtype=float),
+        }
+    )
+
+
+def run_backtest(signals: Any, prices: Any, config: Dict[str, Any]) -> BacktestResult:
+    """Run a single-pass, vectorized backtest.
 
     Args:
-        signals: List of signal dicts.
-        prices: List of price dicts.
-        config: Backtest configuration.
+        signals: Per-bar target direction (-1, 0, 1). A dataframe or mapping
+            must carry a ``signal`` column; anything else is read as an array.
+        prices: OHLC data with ``open``, ``high``, ``low`` and ``close`` columns
+            and an optional ``volatility`` column for volatility-scaled stops.
+        config: Risk and friction settings. Uses ``account_balance``,
+            ``risk_percent``, ``stop_loss`` (fraction of entry price, or the
+            fallback when ``stop_vol_multiple`` scales stops by the
+            volatility at the decision bar), ``take_profit`` or
+            ``reward_risk`` (target as a multiple of the stop), ``fee_bps``,
+            ``slippage_bps``, optional ``max_leverage``, ``max_drawdown``
+            (no new exposure once equity breaches it, as in the live loop),
+            ``intrabar_priority`` (``"stop"`` or ``"target"`` when both levels
+            sit inside the same bar) and ``periods_per_year`` for ratios.
 
     Returns:
-        Summary metrics.
+        Backtest result with summary metrics, trade ledger, per-bar equity,
+        per-bar signed exposure (position notional / equity) and the per-bar
+        stop distance of the position held (0 when flat).
     """
-    return {"trades": 0, "win_rate": 0.0, "expectancy": 0.0, "max_drawdown": 0.0}
+    signal = np.sign(np.nan_to_num(_column(signals, "signal"))).astype(np.int8)
+    open_ = _column(prices, "open")
+    high = _column(prices, "high")
+    low = _column(prices, "low")
+    close = _column(prices, "close")
+
+    n = len(close)
+    if not (len(signal) == len(open_) == len(high) == len(low) == n):
+        raise ValueError("signals and prices must have the same length")
+    if n < 2:
+        raise ValueError("run_backtest requires at least 2 bars")
+
+    if float(config.get("stop_loss", 0.001)) <= 0:
+        raise ValueError("stop_loss must be positive")
+    risk_config = {"risk_percent": 0.01, "stop_loss": 0.001, **config}
+    volatility = _column(prices, "volatility") if _has_column(prices, "volatility") else None
+    stops = np.broadcast_to(stop_distances(risk_config, volatility), (n,))
+
+    trades, equity, position, stop = _simulate(signal, open_, high, low, close, stops, risk_config)
+    halted = drawdown_halt_mask(risk_config, equity)
+    if halted.any():
+        # The breach is seen at that bar's close, so targets from there on are flat.
+        signal = signal.copy()
+        signal[int(np.argmax(halted)) :] = 0
+        trades, equity, position, stop = _simulate(signal, open_, high, low, close, stops, risk_config)
+
+    metrics = _summarize(trades, equity, position, config)
+    return BacktestResult(metrics=metrics, trades=trades, equity=equity, position=position, stop=stop)
+
+
+def _simulate(
+    signal: np.ndarray,
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    stops: np.ndarray,
+    config: Dict[str, Any],
+) -> tuple[pd.DataFrame, np.ndarray, np.ndarray, np.ndarray]:
+    """Trade ledger, equity, exposure and held stop distance for one signal path; ``stops`` is per decision bar."""
+    n = len(close)
+    initial_equity = float(config.get("account_balance", 10000.0))
+    fee = float(config.get("fee_bps", 6.0)) / 10000.0
+    slip = float(config.get("slippage_bps", 2.0)) / 10000.0
+    stop_first = str(config.get("intrabar_priority", "stop")) == "stop"
+
+    idx = np.arange(n)
+
+    # Target position for each bar: decided on the previous close, filled at this open.
+    desired = np.zeros(n, dtype=np.int8)
+    desired[1:] = signal[:-1]
+
+    change = np.empty(n, dtype=bool)
+    change[0] = True
+    change[1:] = desired[1:] != desired[:-1]
+    run_starts = np.flatnonzero(change)
+    run_ends = np.append(run_starts[1:], n)
+    run_dir = desired[run_starts].astype(float)
+
+    trade_runs = run_dir != 0
+    if not np.any(trade_runs):
+        return _empty_ledger(), np.full(n, initial_equity), np.zeros(n), np.zeros(n)
+
+    # Each run uses the stop known at its decision bar (the bar before entry).
+    run_stop = stops[np.maximum(run_starts - 1, 0)]
+    if "take_profit" in config:
+        run_target = np.full(len(run_starts), float(config["take_profit"]))
+    else:
+        run_target = run_stop * float(config.get("reward_risk", 2.0))
+
+    # Broadcast each run's entry state onto its bars.
+    run_id = np.cumsum(change) - 1
+    bar_dir = run_dir[run_id]
+    entry_bar = run_starts[run_id]
+    entry_price_bar = open_[entry_bar] * (1.0 + bar_dir * slip)
+    stop_bar = entry_price_bar * (1.0 - bar_dir * run_stop[run_id])
+    target_bar = entry_price_bar * (1.0 + bar_dir * run_target[run_id])
+
+    is_long = bar_dir > 0
+    is_short = bar_dir < 0
+    hit_stop = (is_long & (low <= stop_bar)) | (is_short & (high >= stop_bar))
+    hit_target = (is_long & (high >= target_bar)) | (is_short & (low <= target_bar))
+
+    first_hit = np.minimum.reduceat(np.where(hit_stop | hit_target, idx, n), run_starts)
+
+    starts = run_starts[trade_runs]
+    ends = run_ends[trade_runs]
+    direction = run_dir[trade_runs]
+    hit_at = first_hit[trade_runs]
+    stop_pct = run_stop[trade_runs]
+    leverage = position_leverage(config, stop_pct)
+
+    entry_price = entry_price_bar[starts]
+    stop_price = stop_bar[starts]
+    target_price = target_bar[starts]
+
+    hit = hit_at < ends
+    safe_hit = np.minimum(hit_at, n - 1)
+    both = hit_stop[safe_hit] & hit_target[safe_hit]
+    stopped = hit & (hit_stop[safe_hit] & (~hit_target[safe_hit] | (both & stop_first)))
+    targeted = hit & ~stopped
+    by_signal = ~hit & (ends < n)
+
+    exit_index = np.where(hit, hit_at, np.where(by_signal, ends, n - 1))
+    hit_open = open_[exit_index]
+    gapped = exit_index > starts
+
+    # Gaps through a level fill at the open; stops and market exits pay slippage.
+    stop_fill = np.where(
+        gapped,
+        np.where(direction > 0, np.minimum(hit_open, stop_price), np.maximum(hit_open, stop_price)),
+        stop_price,
+    )
+    target_fill = np.where(
+        gapped,
+        np.where(direction > 0, np.maximum(hit_open, target_price), np.minimum(hit_open, target_price)),
+        target_price,
+    )
+    market_fill = np.where(by_signal, hit_open, close[exit_index])
+    exit_price = np.where(stopped, stop_fill, np.where(targeted, target_fill, market_fill))
+    exit_price = np.where(targeted, exit_price, exit_price * (1.0 - direction * slip))
+
+    gross = direction * (exit_price - entry_price) / entry_price
+    trade_return = leverage * (gross - fee * (1.0 + exit_price / entry_price))
+    r_multiple = trade_return / (leverage * stop_pct)
+
+    growth = np.cumprod(1.0 + trade_return)
+    equity_after = initial_equity * growth
+    equity_before = np.concatenate(([initial_equity], equity_after[:-1]))
+
+    exit_reason = np.where(
+        stopped, EXIT_STOP, np.where(targeted, EXIT_TARGET, np.where(by_signal, EXIT_SIGNAL, EXIT_END))
+    )
+    trades = pd.DataFrame(
+        {
+            "entry_index": starts.astype(np.int64),
+            "exit_index": exit_index.astype(np.int64),
+            "direction": direction.astype(np.int8),
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "stop_price": stop_price,
+            "target_price": target_price,
+            "exit_reason": exit_reason.astype(object),
+            "r_multiple": r_multiple,
+            "return": trade_return,
+            "pnl": equity_after - equity_before,
+        }
+    )
+
+    # Realized equity steps at each exit bar; open trades are marked to the close.
+    n_trades = len(starts)
+    trade_ids = np.arange(1, n_trades + 1)
+    closed_mark = np.zeros(n, dtype=np.int64)
+    closed_mark[exit_index] = trade_ids
+    last_closed = np.maximum.accumulate(closed_mark)
+    realized = np.where(last_closed > 0, equity_after[np.maximum(last_closed - 1, 0)], initial_equity)
+
+    entry_mark = np.zeros(n, dtype=np.int64)
+    entry_mark[starts] = trade_ids
+    last_entry = np.maximum.accumulate(entry_mark)
+    open_trade = np.maximum(last_entry - 1, 0)
+    active = (last_entry > 0) & (idx < exit_index[open_trade])
+
+    active_dir = direction[open_trade]
+    active_entry = entry_price[open_trade]
+    unrealized = leverage[open_trade] * (active_dir * (close - active_entry) / active_entry - fee)
+    equity = np.where(active, equity_before[open_trade] * (1.0 + unrealized), realized)
+    # Stop/target/end exits still hold the position during the exit bar itself.
+    held_until = exit_index + (~by_signal)
+    held = (last_entry > 0) & (idx < held_until[open_trade])
+    position = np.where(held, active_dir * leverage[open_trade], 0.0)
+    stop = np.where(held, stop_pct[open_trade], 0.0)
+    return trades, equity, position, stop
+
+
+def _summarize(trades: pd.DataFrame, equity: np.ndarray, position: np.ndarray, config: Dict[str, Any]) -> Dict[str, float]:
+    """Summary metrics from a ledger and equity curve."""
+    initial_equity = float(config.get("account_balance", 10000.0))
+    bar_returns = np.diff(equity, prepend=initial_equity) / np.concatenate(([initial_equity], equity[:-1]))
+    accumulator = MetricsAccumulator(periods_per_year=float(config.get("periods_per_year", 252.0)))
+    accumulator.update_bars(bar_returns, position != 0)
+    accumulator.update_trades(trades["r_multiple"].to_numpy(dtype=float), trades["pnl"].to_numpy(dtype=float))
+    return accumulator.summary()
@@ -1,10 +1,168 @@
-"""Backtest metric calculations."""
+"""Backtest metric calculations.
+
+``MetricsAccumulator`` keeps constant-size running state, so the same object
+can summarize a finished backtest, follow a live session bar by bar, or
+combine partial results from parallel backtest shards.
+"""
 from __future__ import annotations
 
+import math
+from dataclasses import dataclass
 from typing import Dict, List
 
+import numpy as np
+
+
+@dataclass
+class MetricsAccumulator:
+    """Running trade and per-bar return statistics with O(1) updates.
+
+    Bar returns feed Welford mean/variance, downside deviation, exposure and a
+    log-equity drawdown tracker. Trades feed win rate, expectancy and profit
+    factor. ``merge`` combines shards; drawdown merging assumes ``other``
+    covers the period immediately after ``self``.
+    """
+
+    periods_per_year: float = 252.0
+    bars: int = 0
+    exposed_bars: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    downside_sq: float = 0.0
+    log_equity: float = 0.0
+    log_peak: float = 0.0
+    log_trough: float = 0.0
+    max_drawdown_log: float = 0.0
+    trades: int = 0
+    wins: int = 0
+    r_sum: float = 0.0
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+
+    def update_bar(self, ret: float, exposed: bool = False) -> None:
+        """Add one bar's fractional return."""
+        ret = float(ret)
+        self.bars += 1
+        delta = ret - self.mean
+        self.mean += delta / self.bars
+        self.m2 += delta * (ret - self.mean)
+        if ret < 0:
+            self.downside_sq += ret * ret
+        if exposed:
+            self.exposed_bars += 1
+
+        self.log_equity += math.log1p(ret)
+        self.log_peak = max(self.log_peak, self.log_equity)
+        self.log_trough = min(self.log_trough, self.log_equity)
+        self.max_drawdown_log = max(self.max_drawdown_log, self.log_peak - self.log_equity)
+
+    def update_bars(self, returns: np.ndarray, exposure: np.ndarray | None = None) -> None:
+        """Add a contiguous block of bar returns in one vectorized step."""
+        returns = np.asarray(returns, dtype=np.float64)
+        if returns.size == 0:
+            return
+        level = np.cumsum(np.log1p(returns))
+        peak = np.maximum.accumulate(np.maximum(level, 0.0))
+        block = MetricsAccumulator(
+            periods_per_year=self.periods_per_year,
+            bars=int(returns.size),
+            exposed_bars=int(np.count_nonzero(exposure)) if exposure is not None else 0,
+            mean=float(np.mean(returns)),
+            m2=float(np.sum((returns - np.mean(returns)) ** 2)),
+            downside_sq=float(np.sum(np.minimum(returns, 0.0) ** 2)),
+            log_equity=float(level[-1]),
+            log_peak=float(peak[-1]),
+            log_trough=float(min(np.min(level), 0.0)),
+            max_drawdown_log=float(np.max(peak - level)),
+        )
+        self.merge(block)
+
+    def update_trade(self, r_multiple: float, pnl: float | None = None) -> None:
+        """Add one closed trade; ``pnl`` defaults to the R-multiple."""
+        r_multiple = float(r_multiple)
+        pnl = r_multiple if pnl is None else float(pnl)
+        self.trades += 1
+        self.r_sum += r_multiple
+        if r_multiple > 0:
+            self.wins += 1
+        if pnl > 0:
+            self.gross_profit += pnl
+        else:
+            self.gross_loss -= pnl
+
+    def update_trades(self, r_multiples: np.ndarray, pnls: np.ndarray | None = None) -> None:
+        """Add a block of closed trades in one vectorized step."""
+        r_multiples = np.asarray(r_multiples, dtype=np.float64)
+        pnls = r_multiples if pnls is None else np.asarray(pnls, dtype=np.float64)
+        self.trades += int(r_multiples.size)
+        self.wins += int(np.count_nonzero(r_multiples > 0))
+        self.r_sum += float(np.sum(r_multiples))
+        self.gross_profit += float(np.sum(pnls[pnls > 0]))
+        self.gross_loss -= float(np.sum(pnls[pnls <= 0]))
+
+    def merge(self, other: "MetricsAccumulator") -> "MetricsAccumulator":
+        """Fold ``other`` (the following period) into this accumulator in place."""
+        if other.bars:
+            total = self.bars + other.bars
+            delta = other.mean - self.mean
+            self.mean += delta * other.bars / total
+            self.m2 += other.m2 + delta * delta * self.bars * other.bars / total
+            self.bars = total
+            self.exposed_bars += other.exposed_bars
+            self.downside_sq += other.downside_sq
+
+            self.max_drawdown_log = max(
+                self.max_drawdown_log,
+                other.max_drawdown_log,
+                self.log_peak - (self.log_equity + other.log_trough),
+            )
+            self.log_peak = max(self.log_peak, self.log_equity + other.log_peak)
+            self.log_trough = min(self.log_trough, self.log_equity + other.log_trough)
+            self.log_equity += other.log_equity
+
+        self.trades += other.trades
+        self.wins += other.wins
+        self.r_sum += other.r_sum
+        self.gross_profit += other.gross_profit
+        self.gross_loss += other.gross_loss
+        return self
+
+    def summary(self) -> Dict[str, float]:
+        """Return the current metrics snapshot."""
+        std = math.sqrt(self.m2 / (self.bars - 1)) if self.bars > 1 else 0.0
+        downside = math.sqrt(self.downside_sq / self.bars) if self.bars else 0.0
+        annualize = math.sqrt(self.periods_per_year)
+        return {
+            "trades": float(self.trades),
+            "win_rate": self.wins / self.trades if self.trades else 0.0,
+            "expectancy": self.r_sum / self.trades if self.trades else 0.0,
+            "profit_factor": self.gross_profit / self.gross_loss if self.gross_loss > 0 else 0.0,
+            "max_drawdown": -math.expm1(-self.max_drawdown_log),
+            "total_return_pct": math.expm1(self.log_equity) * 100,
+            "mean_return": self.mean,
+            "volatility": std,
+            "sharpe": self.mean / std * annualize if std > 0 else 0.0,
+            "sortino": self.mean / downside * annualize if downside > 0 else 0.0,
+            "exposure": self.exposed_bars / self.bars if self.bars else 0.0,
+            "bars": float(self.bars),
+        }
+
 
 def compute_metrics(trades: List[Dict[str, float]]) -> Dict[str, float]:
-    """Compute summary metrics from trade results."""
-    total = len(trades)
-    return {"trades": total, "win_rate": 0.0, "expectancy": 0.0, "max_drawdown": 0.0}
+    """Compute summary metrics from trade results.
+
+    Each trade needs ``r_multiple``; an optional ``pnl`` feeds the profit
+    factor and an optional ``return`` (fraction of equity) feeds the
+    drawdown and ratio metrics, treating each trade as one period.
+    """
+    accumulator = MetricsAccumulator()
+    if not trades:
+        return accumulator.summary()
+
+    r_multiples = np.array([trade.get("r_multiple", 0.0) for trade in trades], dtype=np.float64)
+    pnls = np.array([trade.get("pnl", trade.get("r_multiple", 0.0)) for trade in trades], dtype=np.float64)
+    accumulator.update_trades(r_multiples, pnls)
+    if all("return" in trade for trade in trades):
+        returns = np.array([trade["return"] for trade in trades], dtype=np.float64)
+        accumulator.update_bars(returns, np.ones(len(returns), dtype=bool))
+    return accumulator.summary()
@@ -1,9 +1,136 @@
-"""Plotting utilities for backtests."""
+"""Plotting utilities for backtests.
+
+Per-bar equity on intraday data quickly reaches tens of millions of points,
+so curves are built in one vectorized pass and can be decimated to a target
+point count before rendering.
+"""
 from __future__ import annotations
 
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class EquityCurve:
+    index: np.ndarray
+    equity: np.ndarray
+    decimated_index: np.ndarray
+    decimated_equity: np.ndarray
+
+
+def _equity_from_source(source: Any, initial_equity: float) -> np.ndarray:
+    """Build a full-resolution equity curve from a ledger or returns array."""
+    if hasattr(source, "equity"):
+        return np.asarray(source.equity, dtype=np.float64)
+    if isinstance(source, list):
+        source = pd.DataFrame(source) if source and isinstance(source[0], dict) else np.asarray(source, dtype=float)
+    if isinstance(source, pd.DataFrame):
+        if "return" in source:
+            returns = source["return"].to_numpy(dtype=np.float64)
+        elif "pnl" in source:
+            return initial_equity + np.cumsum(source["pnl"].to_numpy(dtype=np.float64))
+        else:
+            raise ValueError("Trade ledger needs a 'return' or 'pnl' column")
+    else:
+        returns = np.asarray(source, dtype=np.float64)
+    return initial_equity * np.cumprod(1.0 + returns)
+
+
+def _minmax_indices(values: np.ndarray, target_points: int) -> np.ndarray:
+    """Keep the series endpoints plus the minimum and maximum of every bucket."""
+    n = len(values)
+    buckets = max(1, (target_points - 2) // 2)
+    width = -(-n // buckets)
+    padded = np.pad(values, (0, buckets * width - n), mode="edge").reshape(buckets, width)
+    offsets = np.arange(buckets) * width
+    lows = offsets + np.argmin(padded, axis=1)
+    highs = offsets + np.argmax(padded, axis=1)
+    keep = np.concatenate(([0, n - 1], lows, highs))
+    return np.unique(np.minimum(keep, n - 1))
+
+
+def _lttb_indices(values: np.ndarray, target_points: int) -> np.ndarray:
+    """Largest-triangle-three-buckets selection (one point per bucket)."""
+    n = len(values)
+    buckets = target_points - 2
+    edges = np.linspace(1, n - 1, buckets + 1).astype(np.int64)
+    x = np.arange(n, dtype=np.float64)
+    selected = np.empty(target_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for b in range(buckets):
+        start, stop = edges[b], max(edges[b + 1], edges[b] + 1)
+        if b + 1 < buckets:
+            next_start, next_stop = edges[b + 1], max(edges[b + 2], edges[b + 1] + 1)
+            avg_x = x[next_start:next_stop].mean()
+            avg_y = values[next_start:next_stop].mean()
+        else:
+            avg_x, avg_y = x[-1], values[-1]
+        area = np.abs(
+            (x[previous] - avg_x) * (values[start:stop] - values[previous])
+            - (x[previous] - x[start:stop]) * (avg_y - values[previous])
+        )
+        previous = start + int(np.argmax(area))
+        selected[b + 1] = previous
+    return np.unique(selected)
+
+
+def downsample_curve(values: np.ndarray, target_points: int, method: str = "minmax") -> np.ndarray:
+    """Return sorted indices of a shape-preserving subset of ``values``.
+
+    The deepest drawdown trough and its preceding peak are always kept, so
+    decimation never hides the worst drawdown.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if target_points < 4:
+        raise ValueError("target_points must be at least 4")
+    if n <= target_points:
+        return np.arange(n)
+
+    if method == "minmax":
+        indices = _minmax_indices(values, target_points)
+    elif method == "lttb":
+        indices = _lttb_indices(values, target_points)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+
+    peak = np.maximum.accumulate(values)
+    trough = int(np.argmax((peak - values) / np.where(peak != 0, np.abs(peak), 1.0)))
+    peak_at = int(np.argmax(values[: trough + 1]))
+    return np.union1d(indices, [peak_at, trough])
+
+
+def prepare_equity_curve(
+    source: Any,
+    initial_equity: float = 1.0,
+    target_points: int | None = None,
+    method: str = "minmax",
+) -> EquityCurve:
+    """Return full-resolution and decimated equity series for plotting.
+
+    Args:
+        source: Trade ledger (dataframe or list of dicts with ``return`` or
+            ``pnl``), a per-bar/per-trade returns array, or a backtest result
+            whose ``equity`` curve is used as-is.
+        initial_equity: Starting equity.
+        target_points: Approximate point budget for the decimated series;
+            ``None`` keeps every point.
+        method: ``"minmax"`` (bucket extremes) or ``"lttb"``.
+
+    Returns:
+        Equity curve with both the full and the decimated series.
+    """
+    equity = _equity_from_source(source, initial_equity)
+    index = np.arange(len(equity))
+    if target_points is None or len(equity) == 0:
+        return EquityCurve(index=index, equity=equity, decimated_index=index, decimated_equity=equity)
 
+    keep = downsample_curve(equity, target_points, method=method)
+    return EquityCurve(index=index, equity=equity, decimated_index=keep, decimated_equity=equity[keep])
 
-def prepare_equity_curve(trades: List[Dict[str, float]]) -> List[float]:
-    """Return an equity curve series for plotting."""
-    return [0.0]
@@ -0,0 +1,215 @@
+"""Combine per-symbol backtests into one portfolio on a common timeline."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from risk_management import drawdown_halt_mask
+
+from .engine import BacktestResult
+from .metrics import MetricsAccumulator
+
+
+@dataclass
+class PortfolioResult:
+    timestamps: pd.DatetimeIndex
+    equity: np.ndarray
+    returns: np.ndarray
+    scale: np.ndarray
+    metrics: Dict[str, float]
+    symbol_metrics: Dict[str, Dict[str, float]]
+
+
+class _TradePath:
+    """One symbol's standalone backtest with each bar's PnL attributed to the trade that earned it.
+
+    When a signal exit and the next entry share a bar, the exiting trade's
+    final move on that bar is split out as ``handover`` (owned by ``previous``).
+    """
+
+    def __init__(self, result: BacktestResult, initial_equity: float):
+        equity = np.asarray(result.equity, dtype=np.float64)
+        n = len(equity)
+        trades = result.trades
+        self.starts = trades["entry_index"].to_numpy(dtype=np.int64)
+        exits = trades["exit_index"].to_numpy(dtype=np.int64)
+        pnl = trades["pnl"].to_numpy(dtype=np.float64)
+        equity_after = initial_equity + np.cumsum(pnl)
+        self.entry_equity = equity_after - pnl
+
+        previous_equity = np.concatenate(([initial_equity], equity[:-1]))
+        self.owner = np.full(n, -1, dtype=np.int64)
+        self.previous = np.full(n, -1, dtype=np.int64)
+        self.handover = np.zeros(n)
+        self.holder = np.full(n, -1, dtype=np.int64)
+        self.risk = np.zeros(n)
+        if len(self.starts):
+            entry_mark = np.zeros(n, dtype=np.int64)
+            entry_mark[self.starts] = np.arange(1, len(self.starts) + 1)
+            last = np.maximum.accumulate(entry_mark) - 1
+            trade = np.maximum(last, 0)
+            self.owner = np.where((last >= 0) & (np.arange(n) <= exits[trade]), last, -1)
+
+            reversal = np.flatnonzero(exits[:-1] == self.starts[1:]) + 1
+            bars = self.starts[reversal]
+            self.previous[bars] = reversal - 1
+            self.handover[bars] = equity_after[reversal - 1] - previous_equity[bars]
+
+            # Currency risk of the held position: exposure x stop distance x the trade's entry equity.
+            held = result.position != 0
+            self.holder = np.where(held, trade, -1)
+            self.risk = np.where(held, np.abs(result.position) * result.stop * self.entry_equity[trade], 0.0)
+        self.pnl = equity - previous_equity - self.handover
+        self.trade_risk = self.risk[self.starts]
+
+
+def _replay(
+    paths: List[_TradePath],
+    columns: List[Tuple[List[int], List[float], List[int], List[float], List[int], List[float]]],
+    entries: Dict[int, List[Tuple[int, int]]],
+    initial_equity: float,
+    max_open_risk: float,
+    halt_at: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[np.ndarray], List[np.ndarray]]:
+    """Walk the timeline, sizing each trade off the portfolio equity at its entry.
+
+    Returns per-bar portfolio equity, returns and scale factor, plus each
+    trade's PnL in the portfolio and its size relative to the standalone
+    trade. Bars after ``halt_at`` carry no exposure.
+    """
+    bars = len(columns[0][0])
+    weights = [np.zeros(len(path.starts)).tolist() for path in paths]
+    trade_pnl = [np.zeros(len(path.starts)) for path in paths]
+    equity = np.empty(bars)
+    returns = np.zeros(bars)
+    scale = np.zeros(bars)
+    value = initial_equity
+    active = min(bars, halt_at + 1)
+    for bar in range(active):
+        for symbol, trade in entries.get(bar, ()):
+            weights[symbol][trade] = value / paths[symbol].entry_equity[trade]
+        total_risk = 0.0
+        for symbol, (_, _, _, _, holder, risk) in enumerate(columns):
+            if holder[bar] >= 0:
+                total_risk += weights[symbol][holder[bar]] * risk[bar]
+        factor = min(1.0, max_open_risk * value / total_risk) if total_risk > 0 else 1.0
+
+        bar_pnl = 0.0
+        for symbol, (owner, pnl, previous, handover, _, _) in enumerate(columns):
+            if owner[bar] >= 0 and pnl[bar]:
+                amount = factor * weights[symbol][owner[bar]] * pnl[bar]
+                trade_pnl[symbol][owner[bar]] += amount
+                bar_pnl += amount
+            if previous[bar] >= 0:
+                amount = factor * weights[symbol][previous[bar]] * handover[bar]
+                trade_pnl[symbol][previous[bar]] += amount
+                bar_pnl += amount
+        returns[bar] = bar_pnl / value
+        scale[bar] = factor
+        value += bar_pnl
+        equity[bar] = value
+    equity[active:] = value
+    return equity, returns, scale, trade_pnl, [np.asarray(w) for w in weights]
+
+
+def combine_portfolio(
+    results: Dict[str, BacktestResult],
+    timestamps: Dict[str, Any],
+    config: Dict[str, Any],
+) -> PortfolioResult:
+    """Merge per-symbol backtests into one equity curve under shared risk limits.
+
+    Every trade is sized off the portfolio equity at its entry: its
+    standalone PnL is multiplied by portfolio equity over the symbol's own
+    equity at that bar. Open risk per symbol is position size times the stop
+    distance the trade was sized with; whenever the sum across symbols
+    exceeds ``max_open_risk`` of portfolio equity, all PnL on that bar is
+    scaled down proportionally. Once portfolio drawdown breaches
+    ``max_drawdown`` (``drawdown_halt_mask``), every position is treated as
+    closed at that bar's close and nothing trades afterwards.
+
+    Trade metrics use each trade's PnL as booked in the portfolio (trades
+    entered after a halt are dropped). R multiples are that PnL over the risk
+    the trade was sized with, so the open-risk cap shows up as smaller R.
+
+    Args:
+        results: Backtest result per symbol.
+        timestamps: Bar timestamps per symbol, aligned with each result.
+        config: Risk settings (``account_balance``, ``risk_percent``,
+            ``max_open_risk``, ``max_drawdown``, ``periods_per_year``).
+
+    Returns:
+        Portfolio equity, returns, per-bar scale factor (0 once halted) and metrics.
+    """
+    if not results:
+        raise ValueError("combine_portfolio needs at least one symbol")
+
+    initial_equity = float(config.get("account_balance", 10000.0))
+    max_open_risk = float(config.get("max_open_risk", float(config.get("risk_percent", 0.01)) * len(results)))
+
+    indexes = {symbol: pd.DatetimeIndex(pd.to_datetime(timestamps[symbol], utc=True)) for symbol in results}
+    timeline = indexes[next(iter(results))]
+    for index in indexes.values():
+        timeline = timeline.union(index)
+    bars = len(timeline)
+
+    paths: List[_TradePath] = []
+    columns = []
+    entry_bars: List[np.ndarray] = []
+    entries: Dict[int, List[Tuple[int, int]]] = {}
+    for symbol, result in results.items():
+        path = _TradePath(result, initial_equity)
+        at = timeline.get_indexer(indexes[symbol])
+        owner = np.full(bars, -1, dtype=np.int64)
+        pnl = np.zeros(bars)
+        previous = np.full(bars, -1, dtype=np.int64)
+        handover = np.zeros(bars)
+        owner[at], pnl[at], previous[at], handover[at] = path.owner, path.pnl, path.previous, path.handover
+        # A position stays open between a symbol's own bars, so its risk carries forward.
+        mark = np.zeros(bars, dtype=np.int64)
+        mark[at] = np.arange(1, len(at) + 1)
+        last = np.maximum.accumulate(mark) - 1
+        holder = np.where(last >= 0, path.holder[np.maximum(last, 0)], -1)
+        risk = np.where(last >= 0, path.risk[np.maximum(last, 0)], 0.0)
+        columns.append((owner.tolist(), pnl.tolist(), previous.tolist(), handover.tolist(), holder.tolist(), risk.tolist()))
+        entry_bars.append(at[path.starts])
+        for trade, bar in enumerate(entry_bars[-1].tolist()):
+            entries.setdefault(bar, []).append((len(paths), trade))
+        paths.append(path)
+
+    equity, returns, scale, trade_pnl, weights = _replay(paths, columns, entries, initial_equity, max_open_risk, bars)
+    halted = drawdown_halt_mask(config, equity)
+    halt_at = int(np.argmax(halted)) if halted.any() else bars
+    if halt_at < bars:
+        # The breach is seen at that bar's close; the rerun is flat from the next bar.
+        equity, returns, scale, trade_pnl, weights = _replay(paths, columns, entries, initial_equity, max_open_risk, halt_at)
+
+    exposed = np.zeros(bars, dtype=bool)
+    for column in columns:
+        exposed |= np.asarray(column[4]) >= 0
+    exposed[halt_at + 1 :] = False
+
+    accumulator = MetricsAccumulator(periods_per_year=float(config.get("periods_per_year", 252.0)))
+    accumulator.update_bars(returns, exposed)
+    for path, entry_bar, pnl, weight in zip(paths, entry_bars, trade_pnl, weights):
+        entered = entry_bar <= halt_at
+        sized_risk = weight[entered] * path.trade_risk[entered]
+        r_multiple = np.divide(pnl[entered], sized_risk, out=np.zeros(len(sized_risk)), where=sized_risk > 0)
+        accumulator.update_trades(r_multiple, pnl[entered])
+    metrics = accumulator.summary()
+    metrics["symbols"] = float(len(results))
+    metrics["constrained_bars"] = float(np.mean(scale[: halt_at + 1] < 1.0))
+    metrics["halted"] = float(halt_at < bars)
+    metrics["max_open_risk"] = max_open_risk
+
+    return PortfolioResult(
+        timestamps=timeline,
+        equity=equity,
+        returns=returns,
+        scale=scale,
+        metrics=metrics,
+        symbol_metrics={symbol: result.metrics for symbol, result in results.items()},
+    )
@@ -0,0 +1,272 @@
+"""Monte Carlo / bootstrap robustness analysis of backtest returns.
+
+Resamples are evaluated as batched 2D NumPy operations and split into
+deterministically seeded tasks that can run across worker processes.
+
+The block bootstrap never materializes resampled bar series: every possible
+block is summarized once (log return, running peak/trough, internal
+drawdown, wins), and a resample is the ordered merge of its block
+summaries. Trade-level ``shuffle`` and ``iid`` resampling gather the full
+paths, which is cheap at ledger sizes.
+"""
+from __future__ import annotations
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("block", "shuffle", "iid")
+TASK_RESAMPLES = 25000
+
+
+@dataclass
+class RobustnessReport:
+    method: str
+    resamples: int
+    block_size: int
+    confidence: float
+    observed: Dict[str, float]
+    intervals: Dict[str, Dict[str, float]]
+    probability_of_loss: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "resamples": float(self.resamples),
+            "block_size": float(self.block_size),
+            "confidence": self.confidence,
+            "observed": self.observed,
+            "intervals": self.intervals,
+            "probability_of_loss": self.probability_of_loss,
+        }
+
+
+def _returns_from_source(source: Any, method: str) -> np.ndarray:
+    """Pick per-bar returns (block) or per-trade returns (shuffle/iid)."""
+    if hasattr(source, "trades") and hasattr(source, "equity"):
+        if method == "block":
+            equity = np.asarray(source.equity, dtype=np.float64)
+            return np.diff(equity) / equity[:-1]
+        source = source.trades
+    if isinstance(source, pd.DataFrame):
+        return source["return"].to_numpy(dtype=np.float64)
+    return np.asarray(source, dtype=np.float64)
+
+
+def _path_stats(log_paths: np.ndarray, win_paths: np.ndarray, active_paths: np.ndarray) -> np.ndarray:
+    """Total log return, max log drawdown and win rate for each row."""
+    level = np.cumsum(log_paths, axis=1)
+    peak = np.maximum.accumulate(np.maximum(level, 0.0), axis=1)
+    drawdown = np.max(peak - level, axis=1)
+    active = active_paths.sum(axis=1)
+    win_rate = np.divide(win_paths.sum(axis=1), active, out=np.zeros(len(active)), where=active > 0)
+    return np.column_stack((level[:, -1], drawdown, win_rate))
+
+
+def _block_tables(
+    log_returns: np.ndarray, wins: np.ndarray, active: np.ndarray, length: int, chunk_elements: int
+) -> np.ndarray:
+    """Summaries of every contiguous block of ``length`` bars.
+
+    Rows: total log return, peak and trough of the running level (both
+    include the block start at 0), internal max drawdown, wins, active.
+    Levels are read off the prefix sums in slices of about
+    ``chunk_elements`` values, so memory stays O(n) for any block length.
+    """
+    prefix = np.concatenate(([0.0], np.cumsum(log_returns)))
+    csum_w = np.concatenate(([0.0], np.cumsum(wins)))
+    csum_a = np.concatenate(([0.0], np.cumsum(active)))
+    count = len(log_returns) - length + 1
+    windows = np.lib.stride_tricks.sliding_window_view(prefix[1:], length)
+    tables = np.empty((6, count))
+    tables[0] = prefix[length : length + count] - prefix[:count]
+    tables[4] = csum_w[length : length + count] - csum_w[:count]
+    tables[5] = csum_a[length : length + count] - csum_a[:count]
+    rows = max(1, chunk_elements // length)
+    for lo in range(0, count, rows):
+        hi = min(lo + rows, count)
+        level = windows[lo:hi] - prefix[lo:hi, None]
+        peak = np.maximum.accumulate(np.maximum(level, 0.0), axis=1)
+        tables[1, lo:hi] = peak[:, -1]
+        tables[2, lo:hi] = np.minimum(level.min(axis=1), 0.0)
+        tables[3, lo:hi] = np.max(peak - level, axis=1)
+    return tables
+
+
+def _block_layout(n: int, block_size: int) -> List[int]:
+    full_blocks, remainder = divmod(n, block_size)
+    return [block_size] * full_blocks + ([remainder] if remainder else [])
+
+
+def _merge_blocks(tables: Dict[int, np.ndarray], lengths: List[int], rng: np.random.Generator, m: int) -> np.ndarray:
+    """Stats of ``m`` block-bootstrap paths, each the ordered merge of ``len(lengths)`` picked blocks."""
+    n_blocks = len(lengths)
+    full = lengths.count(lengths[0])  # full-size blocks first, then at most one shorter remainder
+    groups = [(lengths[0], slice(0, full))] + ([(lengths[-1], slice(full, n_blocks))] if full < n_blocks else [])
+    fields = np.empty((6, m, n_blocks))
+    for length, cols in groups:
+        table = tables[length]
+        pick = rng.integers(0, table.shape[1], size=(m, cols.stop - cols.start), dtype=np.int32)
+        for row in range(6):
+            # One np.take per field is about twice as fast as fancy-indexing the whole table.
+            fields[row, :, cols] = np.take(table[row], pick)
+    total, blk_peak, blk_trough, blk_drawdown, blk_wins, blk_active = fields
+
+    # Level at the start of each block, and the running peak reached before it.
+    start = np.cumsum(total, axis=1)
+    start -= total
+    blk_peak += start
+    np.maximum.accumulate(blk_peak, axis=1, out=blk_peak)
+    peak_before = np.empty_like(blk_peak)
+    peak_before[:, 0] = 0.0
+    np.maximum(blk_peak[:, :-1], 0.0, out=peak_before[:, 1:])
+    peak_before -= start
+    peak_before -= blk_trough
+    np.maximum(peak_before, blk_drawdown, out=peak_before)
+
+    won = blk_wins.sum(axis=1)
+    traded = blk_active.sum(axis=1)
+    win_rate = np.divide(won, traded, out=np.zeros(m), where=traded > 0)
+    return np.column_stack((start[:, -1] + total[:, -1], peak_before.max(axis=1), win_rate))
+
+
+def _run_task(args: Tuple[Any, ...]) -> np.ndarray:
+    """Evaluate one seeded batch of resamples; returns an (m, 3) stats array."""
+    method, log_returns, wins, active, block_size, count, seed_seq, chunk_elements, tables = args
+    rng = np.random.default_rng(seed_seq)
+    n = len(log_returns)
+    out: List[np.ndarray] = []
+
+    if method == "block":
+        # Paths are merged from precomputed block summaries, a batch of rows at a time.
+        lengths = _block_layout(n, block_size)
+        rows = max(1, chunk_elements // (6 * len(lengths)))
+        done = 0
+        while done < count:
+            m = min(rows, count - done)
+            out.append(_merge_blocks(tables, lengths, rng, m))
+            done += m
+    else:
+        rows = max(1, chunk_elements // max(n, 1))
+        done = 0
+        while done < count:
+            m = min(rows, count - done)
+            if method == "shuffle":
+                idx = np.argsort(rng.random((m, n)), axis=1)
+            else:
+                idx = rng.integers(0, n, size=(m, n))
+            out.append(_path_stats(log_returns[idx], wins[idx], active[idx]))
+            done += m
+    return np.concatenate(out)
+
+
+def resample_returns(
+    source: Any,
+    n_resamples: int = 10000,
+    method: str = "block",
+    block_size: int | None = None,
+    confidence: float = 0.95,
+    seed: int = 42,
+    workers: int = 1,
+    chunk_elements: int = 4_000_000,
+) -> RobustnessReport:
+    """Bootstrap confidence intervals for return, drawdown and win rate.
+
+    Args:
+        source: Returns array, trade ledger (``return`` column) or backtest
+            result. ``block`` resamples per-bar returns; ``shuffle`` and
+            ``iid`` resample per-trade returns.
+        n_resamples: Number of resampled paths.
+        method: ``"block"`` (moving block bootstrap), ``"shuffle"`` (trade
+            order permutation) or ``"iid"`` (trade bootstrap).
+        block_size: Block length in bars; defaults to ``n ** (1/3)``.
+        confidence: Two-sided interval coverage.
+        seed: Base seed; results are identical for any ``workers`` value.
+        workers: Number of processes (1 runs in-process).
+        chunk_elements: Upper bound on array elements per batched step.
+
+    Returns:
+        Robustness report with observed values and percentile intervals.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}")
+    if not 0.0 < confidence < 1.0:
+        raise ValueError("confidence must be between 0 and 1")
+
+    returns = _returns_from_source(source, method)
+    returns = returns[np.isfinite(returns)]
+    n = len(returns)
+    if n < 2:
+        raise ValueError("Need at least two returns to resample")
+
+    if block_size is None:
+        block_size = max(1, int(round(n ** (1.0 / 3.0))))
+    block_size = int(min(max(block_size, 1), n)) if method == "block" else 1
+
+    log_returns = np.log1p(np.maximum(returns, -1.0 + 1e-12))
+    wins = (returns > 0).astype(np.float64)
+    active = (returns != 0).astype(np.float64)
+
+    tables: Dict[int, np.ndarray] = {}
+    if method == "block":
+        tables = {
+            length: _block_tables(log_returns, wins, active, length, chunk_elements)
+            for length in set(_block_layout(n, block_size))
+        }
+
+    seeds = np.random.SeedSequence(seed).spawn(math.ceil(n_resamples / TASK_RESAMPLES))
+    tasks = [
+        (
+            method,
+            log_returns,
+            wins,
+            active,
+            block_size,
+            min(TASK_RESAMPLES, n_resamples - i * TASK_RESAMPLES),
+            s,
+            chunk_elements,
+            tables,
+        )
+        for i, s in enumerate(seeds)
+    ]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_task, tasks))
+    else:
+        results = [_run_task(task) for task in tasks]
+    stats = np.concatenate(results)
+
+    total_return_pct = np.expm1(stats[:, 0]) * 100
+    max_drawdown_pct = np.expm1(-stats[:, 1]) * 100
+    win_rate = stats[:, 2]
+
+    observed_stats = _path_stats(log_returns[None, :], wins[None, :], active[None, :])[0]
+    observed = {
+        "total_return_pct": float(np.expm1(observed_stats[0]) * 100),
+        "max_drawdown_pct": float(np.expm1(-observed_stats[1]) * 100),
+        "win_rate": float(observed_stats[2]),
+    }
+
+    tail = (1.0 - confidence) / 2.0 * 100
+    intervals: Dict[str, Dict[str, float]] = {}
+    for name, values in (
+        ("total_return_pct", total_return_pct),
+        ("max_drawdown_pct", max_drawdown_pct),
+        ("win_rate", win_rate),
+    ):
+        lower, median, upper = np.percentile(values, [tail, 50.0, 100.0 - tail])
+        intervals[name] = {"lower": float(lower), "median": float(median), "upper": float(upper)}
+
+    return RobustnessReport(
+        method=method,
+        resamples=int(len(stats)),
+        block_size=block_size,
+        confidence=confidence,
+        observed=observed,
+        intervals=intervals,
+        probability_of_loss=float(np.mean(total_return_pct < 0)),
+    )
@@ -0,0 +1,6 @@
+"""Synthetic-data benchmarks for the pipeline stages."""
+
+from .synthetic import generate_ohlcv
+from .suite import compare_results, run_suite
+
+__all__ = ["generate_ohlcv", "run_suite", "compare_results"]
@@ -0,0 +1,190 @@
+"""Validate float32 mode against float64: metric deltas, memory and time."""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from environment.action_space import Action
+from environment.ict_env import ICTTradingEnv
+from features.precision import cast_floats
+from models.multitimeframe.btc_mtf_pipeline import (
+    build_timeframe_features,
+    compute_strategy_returns,
+    execute_trade_model,
+    load_btcusd_5min,
+    merge_timeframes,
+    split_train_test,
+    tune_signal_threshold,
+)
+from models.q_learning.train import build_observations_from_prices, train_q_learning
+
+from .synthetic import generate_ohlcv
+
+PRECISIONS = ("float64", "float32")
+
+
+def _best(func: Callable[[], Any], repeat: int) -> Tuple[Any, float]:
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        result = None
+        gc.collect()
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return result, best
+
+
+def _frame_bytes(frames: Sequence[pd.DataFrame]) -> int:
+    return int(sum(frame.memory_usage(index=True, deep=True).sum() for frame in frames))
+
+
+def _observation_bytes(observations: Sequence[Sequence[float]]) -> int:
+    """Bytes of the observations as an ``(n, 1)`` array, so both precisions are compared as arrays."""
+    return int(np.asarray(observations).nbytes)
+
+
+def _env_steps(observations: Sequence[Sequence[float]], steps: int) -> None:
+    env = ICTTradingEnv(observations)
+    env.reset()
+    for i in range(steps):
+        if env.step(Action((i % 3) + 1))[2]:
+            env.reset()
+
+
+def _run(
+    df_5m: pd.DataFrame, precision: str, repeat: int, fee_bps: float, slippage_bps: float, q_episodes: int
+) -> Dict[str, Any]:
+    config: Dict[str, Any] = {} if precision == "float64" else {"precision": precision}
+    df = cast_floats(df_5m.copy(), config)
+    seconds: Dict[str, float] = {}
+
+    tf_features, seconds["features"] = _best(lambda: build_timeframe_features(df, config), repeat)
+    merged, seconds["merge"] = _best(lambda: merge_timeframes(tf_features), repeat)
+    train_df, test_df = split_train_test(merged)
+    threshold, seconds["tune"] = _best(lambda: tune_signal_threshold(train_df), repeat)
+    kwargs = {"threshold": threshold, "fee_bps": fee_bps, "slippage_bps": slippage_bps}
+    (train_metrics, test_metrics), seconds["execute"] = _best(
+        lambda: (execute_trade_model(train_df, **kwargs), execute_trade_model(test_df, **kwargs)), repeat
+    )
+    signal, returns = compute_strategy_returns(merged, **kwargs)
+
+    prices = pd.DataFrame({"Close": df["close"].to_numpy()})
+    observations = build_observations_from_prices(prices, precision)
+    _, seconds["env_steps"] = _best(lambda: _env_steps(observations, len(observations)), repeat)
+    q_obs = observations[:2000]
+    q_result, seconds["train_q_learning"] = _best(
+        lambda: train_q_learning(q_episodes, 0.1, 0.95, 0.1, 7, q_obs, precision=precision), repeat
+    )
+
+    return {
+        "seconds": seconds,
+        "bytes": {
+            "features": _frame_bytes(list(tf_features.values())),
+            "merged": _frame_bytes([merged]),
+            "returns": int(signal.nbytes + returns.nbytes),
+            "observations": _observation_bytes(observations),
+            "q_table": int(np.asarray(q_result["q_table"], dtype=precision).nbytes),
+        },
+        "metrics": {"train": train_metrics, "test": test_metrics, "q_avg_reward": q_result["avg_reward_all"]},
+        "merged": merged,
+    }
+
+
+def _delta(reference: float, value: float) -> Dict[str, float]:
+    diff = value - reference
+    return {
+        "float64": reference,
+        "float32": value,
+        "abs_delta": abs(diff),
+        "rel_delta": abs(diff) / abs(reference) if reference else abs(diff),
+    }
+
+
+def precision_report(
+    df_5m: pd.DataFrame, *, repeat: int = 3, fee_bps: float = 6.0, slippage_bps: float = 2.0, q_episodes: int = 5
+) -> Dict[str, Any]:
+    """Run features, merge, tune, execute, env and Q-learning in both precisions and compare.
+
+    Reports per-metric absolute/relative deltas of float32 against float64,
+    the largest relative difference over the merged feature columns, the
+    bytes held by each stage's outputs and best-of-``repeat`` stage times.
+    """
+    runs = {precision: _run(df_5m, precision, repeat, fee_bps, slippage_bps, q_episodes) for precision in PRECISIONS}
+    ref, low = runs["float64"], runs["float32"]
+
+    metrics = {
+        split: {name: _delta(value, low["metrics"][split][name]) for name, value in ref["metrics"][split].items()}
+        for split in ("train", "test")
+    }
+    metrics["q_avg_reward"] = _delta(ref["metrics"]["q_avg_reward"], low["metrics"]["q_avg_reward"])
+
+    feature_deltas: Dict[str, float] = {}
+    for name, column in ref["merged"].items():
+        if column.dtype.kind != "f":
+            continue
+        a = column.to_numpy(dtype=np.float64)
+        b = low["merged"][name].to_numpy(dtype=np.float64)
+        scale = np.maximum(np.abs(a), 1e-12)
+        diff = np.abs(a - b) / scale
+        feature_deltas[name] = float(np.nanmax(diff)) if np.isfinite(diff).any() else 0.0
+
+    memory = {
+        stage: {
+            "float64_mb": size / 1e6,
+            "float32_mb": low["bytes"][stage] / 1e6,
+            "saving_pct": (1.0 - low["bytes"][stage] / size) * 100 if size else 0.0,
+        }
+        for stage, size in ref["bytes"].items()
+    }
+    timing = {
+        stage: {
+            "float64_s": seconds,
+            "float32_s": low["seconds"][stage],
+            "speedup": seconds / low["seconds"][stage] if low["seconds"][stage] > 0 else float("inf"),
+        }
+        for stage, seconds in ref["seconds"].items()
+    }
+    return {
+        "bars": len(df_5m),
+        "metrics": metrics,
+        "max_feature_rel_delta": feature_deltas,
+        "memory": memory,
+        "time": timing,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare float32 and float64 pipeline runs.")
+    parser.add_argument("--source-csv", default=None, help="BTCUSD 5-minute CSV (default: synthetic bars)")
+    parser.add_argument("--bars", type=int, default=200_000, help="Synthetic bars when no CSV is given")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=Path("artifacts/precision_report.json"))
+    args = parser.parse_args()
+
+    df_5m = load_btcusd_5min(args.source_csv) if args.source_csv else generate_ohlcv(args.bars, args.seed)
+    report = precision_report(df_5m, repeat=args.repeat)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    for split in ("train", "test"):
+        for name in ("total_return_pct", "max_drawdown_pct", "win_rate", "trades"):
+            row = report["metrics"][split][name]
+            print(f"{split:<5} {name:<18} {row['float64']:>14.6f} {row['float32']:>14.6f}  rel {row['rel_delta']:.2e}")
+    for stage, row in report["memory"].items():
+        print(f"memory {stage:<14} {row['float64_mb']:>9.2f} MB -> {row['float32_mb']:>9.2f} MB  ({row['saving_pct']:5.1f}% saved)")
+    for stage, row in report["time"].items():
+        print(f"time   {stage:<18} {row['float64_s']:>8.4f}s -> {row['float32_s']:>8.4f}s  x{row['speedup']:.2f}")
+    print(f"Saved precision report: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
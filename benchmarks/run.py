@@ -0,0 +1,77 @@
+"""Run the stage benchmarks and optionally compare against a stored baseline."""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .suite import DEFAULT_SIZES, compare_results, run_suite
+
+
+def _format_mb(value: float | None) -> str:
+    return "-" if value is None else f"{value:9.1f}"
+
+
+def _print_result(entry: Dict[str, Any]) -> None:
+    print(
+        f"{entry['stage']:<40} {entry['bars']:>11,} {entry['seconds']:>10.4f}s "
+        f"{entry['throughput']:>14,.0f} {entry['unit']}/s  peak {_format_mb(entry['peak_mb'])} MB",
+        flush=True,
+    )
+
+
+def _print_comparison(rows: List[Dict[str, Any]]) -> None:
+    for row in rows:
+        flag = f"REGRESSION ({row['reason']})" if row["regression"] else "ok"
+        memory = "" if row["memory_ratio"] is None else f"  mem x{row['memory_ratio']:.2f}"
+        print(
+            f"{row['stage']:<40} {row['bars']:>11,} {row['baseline_seconds']:>9.4f}s -> {row['seconds']:>9.4f}s "
+            f"x{row['time_ratio']:.2f}{memory}  {flag}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages on deterministic synthetic OHLCV.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Bar counts to run (10k..100M)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best is reported")
+    parser.add_argument("--stages", nargs="+", default=None, help="Only these stages (e.g. features merge_timeframes env)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    parser.add_argument("--env-steps", type=int, default=100_000)
+    parser.add_argument("--q-bars", type=int, default=2_000)
+    parser.add_argument("--q-episodes", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=Path("artifacts/benchmarks.json"))
+    parser.add_argument("--compare", type=Path, default=None, help="Baseline JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative slowdown before flagging")
+    parser.add_argument("--memory-threshold", type=float, default=0.2, help="Allowed relative peak-memory growth")
+    args = parser.parse_args()
+
+    report = run_suite(
+        args.sizes,
+        seed=args.seed,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        stages=args.stages,
+        env_steps=args.env_steps,
+        q_bars=args.q_bars,
+        q_episodes=args.q_episodes,
+        progress=_print_result,
+    )
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Saved benchmark results: {args.output}")
+
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        rows = compare_results(report, baseline, threshold=args.threshold, memory_threshold=args.memory_threshold)
+        _print_comparison(rows)
+        regressions = sum(row["regression"] for row in rows)
+        print(f"{regressions} regression(s) against {args.compare}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
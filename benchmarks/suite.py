@@ -0,0 +1,272 @@
+"""Stage-by-stage timing and memory benchmarks over synthetic OHLCV."""
+from __future__ import annotations
+
+import gc
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from environment.action_space import Action
+from environment.ict_env import ICTTradingEnv
+from features import FEATURE_STEPS
+from models.multitimeframe.btc_mtf_pipeline import (
+    TIMEFRAMES,
+    _normalize_columns,
+    build_timeframe_features,
+    execute_trade_model,
+    load_btcusd_5min,
+    merge_timeframes,
+    resample_ohlcv,
+)
+from models.q_learning.train import train_q_learning
+
+from .synthetic import generate_ohlcv
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+_ACTIONS = (Action.BUY, Action.HOLD, Action.SELL, Action.CLOSE)
+_FEATURE_NAMES = [(f"features.{func.__name__}", func) for func in FEATURE_STEPS]
+_DOWNSTREAM = {
+    "build_timeframe_features": ("merge_timeframes", "execute_trade_model"),
+    "merge_timeframes": ("execute_trade_model",),
+}
+
+
+def _measure(func: Callable[[], Any], repeat: int, memory: bool) -> Tuple[Any, float, float | None]:
+    """Return ``(result, best_seconds, peak_mb)``; the tracemalloc pass is separate from the timed runs."""
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        result = None
+        gc.collect()
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+
+    peak_mb = None
+    if memory:
+        result = None
+        gc.collect()
+        tracemalloc.start()
+        try:
+            base = tracemalloc.get_traced_memory()[0]
+            result = func()
+            peak_mb = (tracemalloc.get_traced_memory()[1] - base) / 1e6
+        finally:
+            tracemalloc.stop()
+    return result, best, peak_mb
+
+
+def _env_steps(observations: List[List[float]], steps: int) -> int:
+    env = ICTTradingEnv(observations)
+    env.reset()
+    for i in range(steps):
+        _, _, done, _ = env.step(_ACTIONS[i & 3])
+        if done:
+            env.reset()
+    return steps
+
+
+def _rows(value: Any) -> int | None:
+    if isinstance(value, pd.DataFrame):
+        return len(value)
+    if isinstance(value, dict) and value and all(isinstance(v, pd.DataFrame) for v in value.values()):
+        return sum(len(v) for v in value.values())
+    return None
+
+
+def _selected(stage: str, stages: Sequence[str]) -> bool:
+    return stage in stages or stage.split(".", 1)[0] in stages
+
+
+def _feeds_selected(stage: str, stages: Sequence[str]) -> bool:
+    """Whether an unselected stage's output is an input to a selected one."""
+    if stage.startswith("features."):
+        return any(_selected(name, stages) for name, _ in _FEATURE_NAMES)
+    return any(_selected(name, stages) for name in _DOWNSTREAM.get(stage, ()))
+
+
+def _stage_plan(
+    df: pd.DataFrame, path: str, config: Dict[str, Any], env_steps: int, q_bars: int, q_episodes: int, seed: int
+) -> Iterable[Tuple[str, int, str, Callable[[], Any], Callable[[Any], None]]]:
+    """Yield ``(stage, work_units, unit, func, keep)``; ``keep`` hands a stage's output to later stages."""
+    state: Dict[str, Any] = {}
+
+    yield "load_btcusd_5min", len(df), "bars", lambda: load_btcusd_5min(path), lambda out: None
+    yield (
+        "resample_ohlcv",
+        len(df) * len(TIMEFRAMES),
+        "bars",
+        lambda: {name: resample_ohlcv(df, rule) for name, rule in TIMEFRAMES.items()},
+        lambda out: None,
+    )
+
+    state["feat"] = _normalize_columns(df)
+    for stage, func in _FEATURE_NAMES:
+        source = state["feat"]
+        yield (
+            stage,
+            len(source),
+            "bars",
+            lambda func=func, source=source: func(source, config),
+            lambda out: state.__setitem__("feat", out),
+        )
+    state.pop("feat", None)
+
+    yield (
+        "build_timeframe_features",
+        len(df),
+        "bars",
+        lambda: build_timeframe_features(df, config),
+        lambda out: state.__setitem__("tf_features", out),
+    )
+    yield (
+        "merge_timeframes",
+        len(df),
+        "bars",
+        lambda: merge_timeframes(state["tf_features"]),
+        lambda out: state.__setitem__("merged", out),
+    )
+    state.pop("tf_features", None)
+    yield "execute_trade_model", len(df), "bars", lambda: execute_trade_model(state["merged"]), lambda out: None
+    state.pop("merged", None)
+
+    observations = [[close] for close in df["close"].tolist()]
+    yield "env.step", env_steps, "steps", lambda: _env_steps(observations, env_steps), lambda out: None
+    q_obs = observations[:q_bars]
+    yield (
+        "train_q_learning",
+        q_episodes,
+        "episodes",
+        lambda: train_q_learning(q_episodes, 0.1, 0.95, 0.1, seed, q_obs),
+        lambda out: None,
+    )
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    *,
+    seed: int = 7,
+    repeat: int = 3,
+    memory: bool = True,
+    stages: Sequence[str] | None = None,
+    env_steps: int = 100_000,
+    q_bars: int = 2_000,
+    q_episodes: int = 5,
+    progress: Callable[[Dict[str, Any]], None] | None = None,
+) -> Dict[str, Any]:
+    """Time (best of ``repeat``) and memory-profile every pipeline stage at each size.
+
+    ``env.step`` runs ``min(env_steps, bars)`` steps and ``train_q_learning``
+    trains ``q_episodes`` episodes over the first ``q_bars`` bars, so those two
+    stay bounded at large sizes. Peak memory is the tracemalloc peak above the
+    allocations live before the stage, from one extra untimed run.
+    """
+    config: Dict[str, Any] = {}
+    results: List[Dict[str, Any]] = []
+    for bars in sizes:
+        started = time.perf_counter()
+        df = generate_ohlcv(bars, seed)
+        entry = {"stage": "generate_ohlcv", "bars": bars, "seconds": time.perf_counter() - started}
+        entry.update({"work": bars, "unit": "bars", "throughput": bars / entry["seconds"], "peak_mb": None})
+        results.append(entry)
+        if progress:
+            progress(entry)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bars.csv")
+            if not stages or "load_btcusd_5min" in stages:
+                df.to_csv(path, index=False)
+            plan = _stage_plan(
+                df, path, config, min(env_steps, bars), min(q_bars, bars), q_episodes, seed
+            )
+            for stage, work, unit, func, keep in plan:
+                if stages and not _selected(stage, stages):
+                    if _feeds_selected(stage, stages):
+                        keep(func())
+                    continue
+                out, seconds, peak_mb = _measure(func, repeat, memory)
+                keep(out)
+                entry = {
+                    "stage": stage,
+                    "bars": bars,
+                    "seconds": seconds,
+                    "work": work,
+                    "unit": unit,
+                    "throughput": work / seconds if seconds > 0 else float("inf"),
+                    "peak_mb": peak_mb,
+                    "rows_out": _rows(out),
+                }
+                results.append(entry)
+                if progress:
+                    progress(entry)
+        del df
+        gc.collect()
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "seed": seed,
+            "repeat": repeat,
+            "sizes": list(sizes),
+            "env_steps": env_steps,
+            "q_bars": q_bars,
+            "q_episodes": q_episodes,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    *,
+    threshold: float = 0.2,
+    memory_threshold: float = 0.2,
+    min_seconds: float = 0.005,
+    min_mb: float = 1.0,
+) -> List[Dict[str, Any]]:
+    """Match results by ``(stage, bars)`` and flag slowdowns or memory growth beyond the thresholds.
+
+    A slowdown counts only if it exceeds ``threshold`` relative and
+    ``min_seconds`` absolute (likewise ``memory_threshold``/``min_mb``), so
+    tiny stages do not flap on timer noise.
+    """
+    base = {(r["stage"], r["bars"]): r for r in baseline.get("results", [])}
+    rows: List[Dict[str, Any]] = []
+    for result in current.get("results", []):
+        previous = base.get((result["stage"], result["bars"]))
+        if previous is None:
+            continue
+        ratio = result["seconds"] / previous["seconds"] if previous["seconds"] > 0 else float("inf")
+        slower = ratio > 1.0 + threshold and result["seconds"] - previous["seconds"] > min_seconds
+        mem_ratio = None
+        bigger = False
+        if result.get("peak_mb") is not None and previous.get("peak_mb") is not None:
+            mem_ratio = result["peak_mb"] / previous["peak_mb"] if previous["peak_mb"] > 0 else float("inf")
+            bigger = mem_ratio > 1.0 + memory_threshold and result["peak_mb"] - previous["peak_mb"] > min_mb
+        rows.append(
+            {
+                "stage": result["stage"],
+                "bars": result["bars"],
+                "seconds": result["seconds"],
+                "baseline_seconds": previous["seconds"],
+                "time_ratio": ratio,
+                "peak_mb": result.get("peak_mb"),
+                "baseline_peak_mb": previous.get("peak_mb"),
+                "memory_ratio": mem_ratio,
+                "regression": slower or bigger,
+                "reason": ", ".join(r for r, flag in (("time", slower), ("memory", bigger)) if flag),
+            }
+        )
+    return rows
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 from .action_space import Action
 from .reward import calculate_reward
@@ -19,7 +19,8 @@ class StepResult:
 class ICTTradingEnv:
     """A lightweight environment skeleton (gym-compatible by signature)."""
 
-    def __init__(self, observations: List[List[float]], trade_log: List[Dict[str, float]] | None = None):
+    def __init__(self, observations: Sequence[Sequence[float]], trade_log: List[Dict[str, float]] | None = None):
+        """``observations`` is a list of rows or a 2-D array (e.g. float32); column 0 is the close."""
         if len(observations) < 2:
             raise ValueError("ICTTradingEnv requires at least 2 observations.")
 
@@ -28,12 +29,12 @@ class ICTTradingEnv:
         self._index = 0
         self._done = False
 
-    def reset(self) -> List[float]:
+    def reset(self) -> Sequence[float]:
         self._index = 0
         self._done = False
         return self.observations[self._index]
 
-    def step(self, action: Action) -> Tuple[List[float], float, bool, Dict[str, float]]:
+    def step(self, action: Action) -> Tuple[Sequence[float], float, bool, Dict[str, float]]:
         if self._done:
             return self.observations[self._index], 0.0, True, {"info": 0.0}
 
@@ -75,4 +76,4 @@ class ICTTradingEnv:
             self._done = True
 
         info = {"r_multiple": trade_result["r_multiple"], "direction": direction}
-        return self.observations[self._index], reward, self._done, info
+        return next_obs, reward, self._done, info
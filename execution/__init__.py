@@ -1,7 +1,21 @@
 """Execution layer utilities."""
 
+from .async_broker import AsyncBrokerClient, BrokerError, TokenBucket
 from .broker_api import BrokerAPI
+from .journal import Journal
+from .latency import LatencyHistogram
 from .live_trader import LiveTrader
+from .mock_exchange import MockExchange
 from .paper_trader import PaperTrader
 
-__all__ = ["BrokerAPI", "LiveTrader", "PaperTrader"]
+__all__ = [
+    "AsyncBrokerClient",
+    "BrokerError",
+    "TokenBucket",
+    "BrokerAPI",
+    "Journal",
+    "LatencyHistogram",
+    "LiveTrader",
+    "MockExchange",
+    "PaperTrader",
+]
@@ -0,0 +1,244 @@
+"""Asyncio broker client with pooled keep-alive connections.
+
+Orders are sent as JSON over HTTP/1.1 using only the standard library.
+Connections are reused from a bounded pool, and a client-side token bucket
+keeps submissions under the broker's rate limit. Requests time out and are
+retried with exponential backoff; ``429`` responses honour ``Retry-After``.
+The timeout covers connecting and the request round trip, not the wait for a
+free pool slot, so queued requests are never retried before they are sent.
+Every order carries a ``client_order_id``, so a retried submission is
+idempotent on the exchange side.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, List, Tuple
+
+
+class BrokerError(RuntimeError):
+    """Raised when an order request fails after all retries."""
+
+
+class TokenBucket:
+    """Async token bucket; tokens may go negative and the caller waits it off."""
+
+    def __init__(self, rate: float, burst: float):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._updated is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            deficit = -self._tokens
+        if deficit > 0:
+            await asyncio.sleep(deficit / self.rate)
+
+
+class _Response:
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else {}
+
+
+class ConnectionPool:
+    """Bounded pool of keep-alive stream connections to one host."""
+
+    def __init__(self, host: str, port: int, size: int, connect_timeout: float | None = None):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.connect_timeout = connect_timeout
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0
+
+    async def acquire(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        await self._slots.acquire()
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        try:
+            conn = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.connect_timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.opened += 1
+        return conn
+
+    def release(self, conn: Tuple[asyncio.StreamReader, asyncio.StreamWriter], reusable: bool) -> None:
+        if reusable:
+            self._idle.append(conn)
+        else:
+            conn[1].close()
+        self._slots.release()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+
+class AsyncBrokerClient:
+    """Concurrent, rate-limited order submission over pooled connections.
+
+    Config keys: ``host``, ``port``, ``pool_size`` (default 8), ``timeout``
+    seconds (default 2.0), ``retries`` (default 3), ``backoff`` seconds
+    (default 0.05), ``rate_limit`` orders/sec (default 0 = unlimited),
+    ``burst`` (defaults to ``rate_limit``) and ``batch_size`` (default 50).
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.host = str(config.get("host", "127.0.0.1"))
+        self.port = int(config.get("port", 8700))
+        self.timeout = float(config.get("timeout", 2.0))
+        self.retries = int(config.get("retries", 3))
+        self.backoff = float(config.get("backoff", 0.05))
+        self.batch_size = int(config.get("batch_size", 50))
+        self.pool = ConnectionPool(self.host, self.port, int(config.get("pool_size", 8)), self.timeout)
+
+        rate = float(config.get("rate_limit", 0.0))
+        self.limiter = TokenBucket(rate, float(config.get("burst", rate))) if rate > 0 else None
+        self._ids = itertools.count(1)
+        self._prefix = str(config.get("client_id", "ict"))
+        self.retried = 0
+        self.throttled = 0
+
+    async def __aenter__(self) -> "AsyncBrokerClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+    def _tag(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        if "client_order_id" in order:
+            return order
+        return {**order, "client_order_id": f"{self._prefix}-{next(self._ids)}"}
+
+    @staticmethod
+    async def _round_trip(conn: Tuple[asyncio.StreamReader, asyncio.StreamWriter], message: bytes) -> _Response:
+        reader, writer = conn
+        writer.write(message)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by broker")
+        status = int(status_line.split()[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        data = await reader.readexactly(int(headers.get("content-length", "0")))
+        return _Response(status, headers, data)
+
+    async def _request(self, method: str, path: str, payload: Any) -> _Response:
+        """One request on a pooled connection; only the round trip is subject to ``timeout``."""
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("ascii")
+
+        conn = await self.pool.acquire()
+        reusable = False
+        try:
+            response = await asyncio.wait_for(self._round_trip(conn, head + body), self.timeout)
+            reusable = response.headers.get("connection", "keep-alive").lower() != "close"
+            return response
+        finally:
+            self.pool.release(conn, reusable)
+
+    async def _send(self, path: str, payload: Any, weight: int) -> Any:
+        """Send with rate limiting, timeout and retry; returns the decoded body."""
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            if self.limiter is not None:
+                await self.limiter.acquire(weight)
+            try:
+                response = await self._request("POST", path, payload)
+            except (asyncio.TimeoutError, ConnectionError, OSError, asyncio.IncompleteReadError) as exc:
+                error: Exception = exc
+            else:
+                if response.status < 300:
+                    return response.json()
+                if response.status == 429:
+                    self.throttled += 1
+                    retry_after = float(response.headers.get("retry-after", delay))
+                    error = BrokerError("Rate limited by broker")
+                    if attempt < self.retries:
+                        self.retried += 1
+                        await asyncio.sleep(retry_after)
+                        continue
+                elif response.status >= 500:
+                    error = BrokerError(f"Broker error {response.status}: {response.body[:200]!r}")
+                else:
+                    raise BrokerError(f"Order rejected ({response.status}): {response.body[:200]!r}")
+            if attempt < self.retries:
+                self.retried += 1
+                await asyncio.sleep(delay)
+                delay *= 2
+        raise BrokerError(f"Request to {path} failed after {self.retries + 1} attempts") from error
+
+    async def place_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit one order."""
+        return await self._send("/orders", self._tag(order), 1)
+
+    async def place_orders(
+        self, orders: List[Dict[str, Any]], batched: bool = True
+    ) -> List[Dict[str, Any] | BrokerError]:
+        """Submit many orders concurrently, grouped into batch requests when ``batched``.
+
+        Returns one entry per order, in order: the exchange's ack, or the
+        ``BrokerError`` its request failed with. A failed request does not
+        cancel the others, so acks of accepted orders are never lost.
+        """
+        tagged = [self._tag(order) for order in orders]
+        if not batched:
+            replies = await asyncio.gather(*(self._send("/orders", order, 1) for order in tagged), return_exceptions=True)
+            return [_result(reply) for reply in replies]
+
+        chunks = [tagged[i : i + self.batch_size] for i in range(0, len(tagged), self.batch_size)]
+        replies = await asyncio.gather(
+            *(self._send("/orders/batch", {"orders": chunk}, len(chunk)) for chunk in chunks), return_exceptions=True
+        )
+        results: List[Dict[str, Any] | BrokerError] = []
+        for chunk, reply in zip(chunks, replies):
+            reply = _result(reply)
+            results.extend([reply] * len(chunk) if isinstance(reply, BrokerError) else reply["results"])
+        return results
+
+
+def _result(reply: Any) -> Any:
+    """Pass acks and ``BrokerError`` through; re-raise anything else (cancellation, bugs)."""
+    if isinstance(reply, BaseException) and not isinstance(reply, BrokerError):
+        raise reply
+    return reply
@@ -0,0 +1,69 @@
+"""Journal throughput and recovery benchmark."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+
+from .journal import Journal
+from .paper_trader import PaperTrader
+
+
+def run_benchmark(records: int, sync_every: int, snapshot_every: int, fsync: bool = True) -> Dict[str, float]:
+    """Append ``records`` order/fill records through a journaled PaperTrader, then time recovery."""
+    rng = np.random.default_rng(7)
+    prices = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, records)))
+    config = {"symbol": "BTCUSD", "fee_bps": 6.0}
+    journal_config = {"sync_every": sync_every, "snapshot_every": snapshot_every, "fsync": fsync}
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "orders.journal")
+        trader = PaperTrader(config, Journal(path, journal_config))
+        started = time.perf_counter()
+        for i, price in enumerate(prices.tolist()):
+            trader.execute({"side": "buy" if i % 2 else "sell", "qty": 1.0, "type": "limit", "price": price * 0.999})
+            if i % 2:
+                trader.on_tick("BTCUSD", price)
+        trader.journal.commit()
+        elapsed = time.perf_counter() - started
+        written = trader.journal.records
+        commits = trader.journal.commits
+        trader.close()
+
+        started = time.perf_counter()
+        recovered = PaperTrader(config, Journal(path, journal_config))
+        recovery = time.perf_counter() - started
+        tail = recovered.journal.records - recovered.journal.snapshot_offset
+        recovered.close()
+
+    return {
+        "records": float(written),
+        "seconds": elapsed,
+        "records_per_sec": written / elapsed if elapsed > 0 else 0.0,
+        "commits": float(commits),
+        "records_per_commit": written / commits if commits else 0.0,
+        "recovery_ms": recovery * 1000.0,
+        "replayed_tail_records": float(tail),
+        "open_orders": float(len(recovered.open_orders)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark journal append throughput and crash-recovery replay.")
+    parser.add_argument("--records", type=int, default=200000, help="Orders to submit (each also produces fills)")
+    parser.add_argument("--sync-every", type=int, default=256, help="Records per group commit (fsync)")
+    parser.add_argument("--snapshot-every", type=int, default=10000)
+    parser.add_argument("--no-fsync", action="store_true", help="Skip fsync (page-cache durability only)")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.records, args.sync_every, args.snapshot_every, fsync=not args.no_fsync)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Fixed-bucket latency histograms for execution instrumentation."""
+from __future__ import annotations
+
+import math
+from typing import Dict
+
+import numpy as np
+
+
+class LatencyHistogram:
+    """Log-spaced histogram of durations with O(1) recording.
+
+    Buckets span ``min_seconds`` to ``max_seconds`` with ``per_decade``
+    buckets per power of ten; percentiles are reported at bucket upper
+    edges, so their relative error is bounded by the bucket width (~12% at
+    the default 20 per decade).
+    """
+
+    def __init__(self, min_seconds: float = 1e-6, max_seconds: float = 100.0, per_decade: int = 20):
+        self._log_min = math.log10(min_seconds)
+        self._per_decade = per_decade
+        self._buckets = int(math.ceil((math.log10(max_seconds) - self._log_min) * per_decade)) + 1
+        self.counts = np.zeros(self._buckets + 1, dtype=np.int64)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds <= 0:
+            bucket = 0
+        else:
+            bucket = int((math.log10(seconds) - self._log_min) * self._per_decade) + 1
+            bucket = min(max(bucket, 0), self._buckets)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        if len(other.counts) != len(self.counts):
+            raise ValueError("Histograms must share bucket layout to merge")
+        self.counts += other.counts
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def _upper_edge(self, bucket: int) -> float:
+        return 10 ** (self._log_min + bucket / self._per_decade)
+
+    def percentile(self, q: float) -> float:
+        """Approximate ``q``-th percentile (0-100) in seconds."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(math.ceil(q / 100.0 * self.count)))
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return min(self._upper_edge(bucket), self.max)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50/p90/p99 and max in milliseconds."""
+        return {
+            "count": float(self.count),
+            "mean_ms": self.total / self.count * 1000.0 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000.0,
+            "p90_ms": self.percentile(90) * 1000.0,
+            "p99_ms": self.percentile(99) * 1000.0,
+            "max_ms": self.max * 1000.0,
+        }
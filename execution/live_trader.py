@@ -1,18 +1,308 @@
-"""Live trading loop."""
+"""Live trading loop.
+
+``LiveTrader.run`` drives an asyncio pipeline::
+
+    bar ingest -> feature update -> decision -> risk check -> order submit
+
+Stages are connected by bounded queues, so a slow stage blocks the stages
+upstream of it instead of letting work pile up (backpressure). Each stage
+records its queue wait and service time in latency histograms, and every
+order records the end-to-end time from bar ingest to broker ack. A
+sentinel drains the pipeline on shutdown so no accepted bar is lost.
+
+Every bar passes through every stage, whether or not it produces an order.
+Brokers that simulate fills from the bar stream (``on_bar``, as the paper
+trader does) are fed each bar by the submit stage, in bar order and before
+that bar's own order is placed. An order decided on a bar's close therefore
+rests until the next bar and fills at its open, as in the backtest, while
+the stages before submit keep working ahead.
+
+The tracked position counts only orders the broker acknowledged. Orders the
+risk stage has sized but submit has not yet placed are held as pending
+quantity, and a failed submission is rolled back and counted as a rejection
+instead of stopping the loop; ``stop()`` is the only way to shut it down.
+When the broker keeps a journal, a timer commits records that have waited
+``sync_interval`` even if no new bar arrives to trigger it.
+"""
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List
+
+from features.incremental import IncrementalFeatures
+from risk_management import ExposureTracker, check_max_drawdown, position_quantities, stop_distances
 
 from .broker_api import BrokerAPI
+from .latency import LatencyHistogram
+
+STAGES = ("features", "decision", "risk", "submit")
+_STOP = object()
+
+
+@dataclass
+class BarEvent:
+    bar: Dict[str, Any]
+    ingested: float
+    enqueued: float = 0.0
+    features: Dict[str, Any] = field(default_factory=dict)
+    target: int = 0
+    stop: float = 0.0
+    order: Dict[str, Any] | None = None
+
+
+def default_policy(features: Dict[str, Any]) -> int:
+    """Per-timeframe MTF rule: BOS + bullish FVG is long, MSS + bearish FVG is short."""
+    if features["bos"] and features["fvg_direction"] == "bullish":
+        return 1
+    if features["mss"] and features["fvg_direction"] == "bearish":
+        return -1
+    return 0
 
 
 class LiveTrader:
     """Executes live trades using a broker API."""
 
-    def __init__(self, broker: BrokerAPI, config: Dict[str, str]):
+    def __init__(
+        self,
+        broker: BrokerAPI | Any,
+        config: Dict[str, Any],
+        policy: Callable[[Dict[str, Any]], int] | None = None,
+    ):
         self.broker = broker
         self.config = config
+        self.policy = policy or default_policy
+        self.symbol = str(config.get("symbol", "default"))
+        self.queue_size = int(config.get("queue_size", 64))
+
+        self.stage_latency = {name: LatencyHistogram() for name in STAGES}
+        self.queue_wait = {name: LatencyHistogram() for name in STAGES}
+        self.end_to_end = LatencyHistogram()
+        self.backpressure_waits = 0
+        self.bars = 0
+        self.acks: List[Dict[str, Any]] = []
+        self.rejected = 0
+        self.rejections: Dict[str, int] = {}
+
+        self.position_qty = 0.0
+        self.exposure = ExposureTracker(config)
+        self._fills_seen = 0
+        self._order_stops: Dict[int, float] = {}
+        self._pending_qty = 0.0
+        self._stopping: asyncio.Event | None = None
 
     def execute(self, order: Dict[str, str]) -> Dict[str, str]:
         """Execute a live order."""
         return self.broker.place_order(order)
+
+    def stop(self) -> None:
+        """Request a graceful shutdown: stop ingesting and drain queued bars."""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _put(self, queue: "asyncio.Queue[Any]", item: Any) -> None:
+        if queue.full():
+            self.backpressure_waits += 1
+        if isinstance(item, BarEvent):
+            item.enqueued = time.perf_counter()
+        await queue.put(item)
+
+    async def _ingest(self, bars: Any, out: "asyncio.Queue[Any]") -> None:
+        async for bar in _aiter(bars):
+            if self._stopping.is_set():
+                break
+            self.bars += 1
+            await self._put(out, BarEvent(bar=bar, ingested=time.perf_counter()))
+        await out.put(_STOP)
+
+    async def _stage(
+        self,
+        name: str,
+        inbox: "asyncio.Queue[Any]",
+        outbox: "asyncio.Queue[Any] | None",
+        handler: Callable[[BarEvent], Any],
+    ) -> None:
+        service = self.stage_latency[name]
+        waited = self.queue_wait[name]
+        while True:
+            event = await inbox.get()
+            if event is _STOP:
+                if outbox is not None:
+                    await outbox.put(_STOP)
+                return
+            started = time.perf_counter()
+            waited.record(started - event.enqueued)
+            result = handler(event)
+            if inspect.isawaitable(result):
+                await result
+            service.record(time.perf_counter() - started)
+            if outbox is not None:
+                await self._put(outbox, event)
+
+    def _on_features(self, event: BarEvent) -> None:
+        event.features = self._features.update(event.bar)
+
+    def _on_decision(self, event: BarEvent) -> None:
+        event.target = int(self.policy(event.features))
+
+    def _sync_fills(self) -> None:
+        """Feed fills the broker recorded since the last bar into the exposure tracker."""
+        ledger = getattr(self.broker, "ledger", None)
+        if ledger is None or ledger.size == self._fills_seen:
+            return
+        for fill in ledger.fills[self._fills_seen :].tolist():
+            order_id, symbol_id, _, _, side, qty, price, fee, _ = fill
+            # Open risk uses the stop distance the risk stage sized the order with.
+            stop = self._order_stops.pop(order_id, None)
+            self.exposure.on_fill(ledger.symbols[symbol_id], side * qty, price, fee, stop)
+        self._fills_seen = ledger.size
+
+    def _reject(self, reason: str) -> None:
+        self.rejected += 1
+        self.rejections[reason] = self.rejections.get(reason, 0) + 1
+
+    def _on_risk(self, event: BarEvent) -> None:
+        # Same rules as the backtest engine: drawdown halt, volatility-scaled stop, risk-based size.
+        symbol = str(event.bar.get("symbol", self.symbol))
+        price = float(event.bar["close"])
+        self._sync_fills()
+        self.exposure.mark(symbol, price)
+
+        target = event.target
+        if target != 0 and not check_max_drawdown(self.config, self.exposure.drawdown):
+            self._reject("max_drawdown")
+            target = 0
+        # Size against acknowledged plus still-queued orders, so nothing is ordered twice.
+        intended = self.position_qty + self._pending_qty
+        current = (intended > 0) - (intended < 0)
+        if target == current:
+            return
+
+        stop_pct = float(stop_distances(self.config, event.features.get("volatility")))
+        event.stop = stop_pct
+        unit_qty = float(position_quantities(self.config, price, stop_pct, self.exposure.equity))
+        delta = target * unit_qty - intended
+        if abs(delta) < 1e-12:
+            return
+        decision = self.exposure.check_order(symbol, delta, price, stop_pct)
+        if not decision:
+            self._reject(decision.reason)
+            return
+        event.order = {
+            "symbol": symbol,
+            "side": "buy" if delta > 0 else "sell",
+            "qty": abs(delta),
+            "type": "market",
+        }
+        self._pending_qty += delta
+
+    async def _on_submit(self, event: BarEvent) -> None:
+        on_bar = getattr(self.broker, "on_bar", None)
+        if on_bar is not None:
+            # Fill earlier orders on this bar before placing the order decided on its close.
+            on_bar(event.bar)
+        order = event.order
+        if order is None:
+            return
+        delta = order["qty"] if order["side"] == "buy" else -order["qty"]
+        self._pending_qty -= delta
+        try:
+            ack = self.broker.place_order(order)
+            if inspect.isawaitable(ack):
+                ack = await ack
+        except Exception:
+            self._reject("submit_error")
+            return
+        self.position_qty += delta
+        self.end_to_end.record(time.perf_counter() - event.ingested)
+        self.acks.append(ack)
+        if getattr(self.broker, "ledger", None) is None:
+            # No fill feed from this broker: assume the order filled at the decision price.
+            self.exposure.on_fill(order["symbol"], delta, float(event.bar["close"]), stop_distance=event.stop)
+        elif isinstance(ack, dict) and "order_id" in ack:
+            self._order_stops[int(ack["order_id"])] = event.stop
+
+    def _resume_position(self) -> None:
+        """Start from the broker's (possibly journal-recovered) position plus unfilled market orders."""
+        positions = getattr(self.broker, "positions", None)
+        if positions is None:
+            return
+        # The journal does not record stops, so recovered positions carry the stop
+        # the risk stage would use without a volatility estimate.
+        stop = float(stop_distances(self.config, None))
+        for symbol, position in positions.items():
+            if position.qty:
+                self.exposure.on_fill(symbol, position.qty, position.avg_price, stop_distance=stop)
+                self.exposure.mark(symbol, position.last_price or position.avg_price)
+            self.exposure.realized_pnl += position.realized_pnl
+        ledger = getattr(self.broker, "ledger", None)
+        self._fills_seen = ledger.size if ledger is not None else 0
+        qty = positions[self.symbol].qty if self.symbol in positions else 0.0
+        for order in getattr(self.broker, "open_orders", {}).values():
+            if order["symbol"] == self.symbol and order["type"] == "market":
+                qty += order["qty"] if order["side"] == "buy" else -order["qty"]
+        self.position_qty = qty
+
+    async def run(self, bars: Iterable[Dict[str, Any]] | AsyncIterator[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run the pipeline until ``bars`` is exhausted or ``stop()`` is called."""
+        self._resume_position()
+        self._stopping = asyncio.Event()
+        self._pending_qty = 0.0
+        self._features = IncrementalFeatures(self.config)
+        queues = {name: asyncio.Queue(maxsize=self.queue_size) for name in STAGES}
+        handlers = {
+            "features": self._on_features,
+            "decision": self._on_decision,
+            "risk": self._on_risk,
+            "submit": self._on_submit,
+        }
+
+        tasks = [asyncio.create_task(self._ingest(bars, queues["features"]))]
+        for i, name in enumerate(STAGES):
+            outbox = queues[STAGES[i + 1]] if i + 1 < len(STAGES) else None
+            tasks.append(asyncio.create_task(self._stage(name, queues[name], outbox, handlers[name])))
+        journal = getattr(self.broker, "journal", None)
+        flusher = asyncio.create_task(self._flush_journal(journal)) if journal is not None else None
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if flusher is not None:
+                flusher.cancel()
+        return self.latency_report()
+
+    async def _flush_journal(self, journal: Any) -> None:
+        """Commit journal records that have waited ``sync_interval`` while no bars arrive."""
+        while True:
+            await asyncio.sleep(journal.sync_interval)
+            if journal.commit_due:
+                journal.commit()
+
+    def latency_report(self) -> Dict[str, Any]:
+        """Per-stage service and queue-wait latency plus bar-to-ack latency."""
+        return {
+            "bars": float(self.bars),
+            "orders": float(len(self.acks)),
+            "risk_rejections": float(self.rejected),
+            "rejections_by_reason": {reason: float(count) for reason, count in self.rejections.items()},
+            "exposure": self.exposure.summary(),
+            "backpressure_waits": float(self.backpressure_waits),
+            "stages": {
+                name: {"service": self.stage_latency[name].summary(), "queue_wait": self.queue_wait[name].summary()}
+                for name in STAGES
+            },
+            "bar_to_ack": self.end_to_end.summary(),
+        }
+
+
+async def _aiter(bars: Any) -> AsyncIterator[Dict[str, Any]]:
+    if hasattr(bars, "__aiter__"):
+        async for bar in bars:
+            yield bar
+    else:
+        for bar in bars:
+            yield bar
+            await asyncio.sleep(0)
@@ -0,0 +1,105 @@
+"""Offline load test of the async broker client against the mock exchange."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .async_broker import AsyncBrokerClient, BrokerError
+from .mock_exchange import MockExchange
+
+
+async def run_load_test(
+    orders: int,
+    concurrency: int,
+    batch_size: int,
+    client_config: Dict[str, Any],
+    exchange_config: Dict[str, Any],
+) -> Dict[str, float]:
+    """Submit ``orders`` orders and report throughput and latency percentiles.
+
+    With ``batch_size > 1`` each request carries that many orders and every
+    order in a batch is assigned the batch's round-trip latency.
+    """
+    async with MockExchange(exchange_config) as exchange:
+        config = {**client_config, "host": exchange.host, "port": exchange.port, "batch_size": max(batch_size, 1)}
+        async with AsyncBrokerClient(config) as client:
+            payloads = [
+                {"symbol": "BTCUSD", "side": "buy" if i % 2 else "sell", "qty": 1.0, "type": "market"}
+                for i in range(orders)
+            ]
+            size = max(batch_size, 1)
+            groups = [payloads[i : i + size] for i in range(0, orders, size)]
+            latencies: List[float] = []
+            failed = 0
+            gate = asyncio.Semaphore(concurrency)
+
+            async def submit(group: List[Dict[str, Any]]) -> None:
+                nonlocal failed
+                async with gate:
+                    t0 = time.perf_counter()
+                    if size > 1:
+                        results = await client.place_orders(group)
+                        failed += sum(isinstance(result, BrokerError) for result in results)
+                    else:
+                        try:
+                            await client.place_order(group[0])
+                        except BrokerError:
+                            failed += 1
+                    latencies.extend([time.perf_counter() - t0] * len(group))
+
+            started = time.perf_counter()
+            await asyncio.gather(*(submit(group) for group in groups))
+            elapsed = time.perf_counter() - started
+
+            p50, p90, p99, p_max = np.percentile(np.array(latencies) * 1000.0, [50, 90, 99, 100])
+            return {
+                "orders": float(orders),
+                "accepted": float(len(exchange.orders)),
+                "failed": float(failed),
+                "seconds": elapsed,
+                "orders_per_sec": orders / elapsed if elapsed > 0 else 0.0,
+                "latency_p50_ms": float(p50),
+                "latency_p90_ms": float(p90),
+                "latency_p99_ms": float(p99),
+                "latency_max_ms": float(p_max),
+                "connections_opened": float(client.pool.opened),
+                "retries": float(client.retried),
+                "throttled": float(client.throttled),
+            }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the async broker client against a local mock exchange.")
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=1, help="Orders per request (1 = single-order requests)")
+    parser.add_argument("--pool-size", type=int, default=8)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Client-side orders/sec limit (0 = off)")
+    parser.add_argument("--exchange-rate-limit", type=float, default=0.0, help="Mock exchange orders/sec limit")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Mock exchange latency per request")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run_load_test(
+            args.orders,
+            args.concurrency,
+            args.batch_size,
+            {"pool_size": args.pool_size, "rate_limit": args.rate_limit, "retries": 5},
+            {
+                "latency": args.latency_ms / 1000.0,
+                "failure_rate": args.failure_rate,
+                "rate_limit": args.exchange_rate_limit,
+            },
+        )
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Local mock exchange for offline broker-client testing.
+
+Serves the same JSON-over-HTTP/1.1 order API the async broker client
+speaks (``POST /orders`` and ``POST /orders/batch``) with keep-alive
+connections, configurable latency, random failures and a server-side rate
+limit that answers ``429`` with ``Retry-After``.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import random
+from typing import Any, Dict, List, Tuple
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests", 503: "Service Unavailable"}
+
+
+class MockExchange:
+    """In-process asyncio order server.
+
+    Config keys: ``host`` (default 127.0.0.1), ``port`` (0 picks a free port),
+    ``latency`` seconds per request, ``failure_rate`` (fraction answered with
+    503), ``rate_limit`` orders/sec (0 = unlimited) and ``seed``.
+    """
+
+    def __init__(self, config: Dict[str, Any] | None = None):
+        config = config or {}
+        self.host = str(config.get("host", "127.0.0.1"))
+        self.port = int(config.get("port", 0))
+        self.latency = float(config.get("latency", 0.0))
+        self.failure_rate = float(config.get("failure_rate", 0.0))
+        self.rate_limit = float(config.get("rate_limit", 0.0))
+        self._rng = random.Random(config.get("seed", 7))
+        self._ids = itertools.count(1)
+        self._server: asyncio.AbstractServer | None = None
+        self._window_start = 0.0
+        self._window_count = 0
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self.connections = 0
+
+    async def start(self) -> "MockExchange":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockExchange":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    def _accept(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        client_id = str(order.get("client_order_id", ""))
+        existing = self.orders.get(client_id)
+        if existing is not None:
+            return existing
+        ack = {"status": "accepted", "order_id": str(next(self._ids)), "client_order_id": client_id}
+        if client_id:
+            self.orders[client_id] = ack
+        return ack
+
+    def _throttled(self, weight: int) -> float:
+        """Return seconds to wait if this request exceeds the 1-second window limit."""
+        if self.rate_limit <= 0:
+            return 0.0
+        now = asyncio.get_running_loop().time()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_count = 0
+        if self._window_count + weight > self.rate_limit:
+            return max(1.0 - (now - self._window_start), 0.001)
+        self._window_count += weight
+        return 0.0
+
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+        if method != "POST" or path not in ("/orders", "/orders/batch"):
+            return 404, {"error": "not found"}, {}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "invalid json"}, {}
+        orders: List[Dict[str, Any]] = payload["orders"] if path == "/orders/batch" else [payload]
+
+        wait = self._throttled(len(orders))
+        if wait:
+            return 429, {"error": "rate limited"}, {"Retry-After": f"{wait:.3f}"}
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            return 503, {"error": "unavailable"}, {}
+
+        results = [self._accept(order) for order in orders]
+        return 200, ({"results": results} if path == "/orders/batch" else results[0]), {}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    if name.strip().lower() == "content-length":
+                        length = int(value.strip())
+                body = await reader.readexactly(length) if length else b""
+                self.requests += 1
+
+                status, payload, headers = await self._route(method, path, body)
+                data = json.dumps(payload).encode("utf-8")
+                extra = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {_REASONS.get(status, 'OK')}\r\nContent-Type: application/json\r\n"
+                        f"Content-Length: {len(data)}\r\nConnection: keep-alive\r\n{extra}\r\n"
+                    ).encode("ascii")
+                    + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
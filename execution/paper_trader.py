@@ -1,17 +1,483 @@
-"""Paper trading loop."""
+"""Paper trading loop.
+
+Orders rest in price-ordered heaps per symbol and side and are matched
+against a streamed bar or tick feed. Only orders at the top of each heap are
+examined, so a bar costs O(1) when nothing trades and O(log n) per fill.
+Cancelled orders are dropped lazily when they surface at the top.
+
+With a ``Journal`` attached, every order, cancel and fill is logged and the
+trader periodically snapshots its open orders and positions; constructing a
+trader on an existing journal rebuilds that state before accepting orders.
+"""
 from __future__ import annotations
 
-from typing import Dict
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .journal import CANCEL, FILL, ORDER, ORDER_TYPES, Journal
+
+FILL_DTYPE = np.dtype(
+    [
+        ("order_id", np.int64),
+        ("symbol", np.int32),
+        ("bar", np.int64),
+        ("timestamp", np.float64),
+        ("side", np.int8),
+        ("qty", np.float64),
+        ("price", np.float64),
+        ("fee", np.float64),
+        ("realized_pnl", np.float64),
+    ]
+)
+
+
+class FillLedger:
+    """Append-only, array-backed fill record that grows by doubling."""
+
+    def __init__(self, capacity: int = 1024):
+        self._data = np.zeros(capacity, dtype=FILL_DTYPE)
+        self.size = 0
+        self.symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+
+    def symbol_id(self, symbol: str) -> int:
+        if symbol not in self._symbol_ids:
+            self._symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return self._symbol_ids[symbol]
+
+    def _reserve(self, size: int) -> None:
+        if size > len(self._data):
+            capacity = len(self._data)
+            while capacity < size:
+                capacity *= 2
+            grown = np.zeros(capacity, dtype=FILL_DTYPE)
+            grown[: self.size] = self._data[: self.size]
+            self._data = grown
+
+    def append(self, record: Tuple[Any, ...]) -> None:
+        self._reserve(self.size + 1)
+        self._data[self.size] = record
+        self.size += 1
+
+    def extend(self, columns: Dict[str, np.ndarray]) -> None:
+        """Append fills given as one equal-length array per ``FILL_DTYPE`` field."""
+        count = len(columns["order_id"])
+        self._reserve(self.size + count)
+        block = self._data[self.size : self.size + count]
+        for name in FILL_DTYPE.names:
+            block[name] = columns[name]
+        self.size += count
+
+    @property
+    def fills(self) -> np.ndarray:
+        return self._data[: self.size]
+
+    def to_frame(self) -> "Any":
+        import pandas as pd
+
+        frame = pd.DataFrame(self.fills)
+        frame["symbol"] = np.asarray(self.symbols, dtype=object)[frame["symbol"].to_numpy()] if self.size else []
+        return frame
+
+
+@dataclass
+class Position:
+    qty: float = 0.0
+    avg_price: float = 0.0
+    realized_pnl: float = 0.0
+    last_price: float = 0.0
+
+    def apply(self, signed_qty: float, price: float) -> float:
+        """Apply a fill and return the realized PnL it produced."""
+        if signed_qty == 0:
+            return 0.0
+        realized = 0.0
+        if self.qty == 0 or (self.qty > 0) == (signed_qty > 0):
+            total = self.qty + signed_qty
+            self.avg_price = (self.avg_price * self.qty + price * signed_qty) / total
+            self.qty = total
+        else:
+            closing = min(abs(signed_qty), abs(self.qty))
+            direction = 1.0 if self.qty > 0 else -1.0
+            realized = closing * (price - self.avg_price) * direction
+            self.qty += signed_qty
+            if abs(self.qty) < 1e-12:
+                self.qty = 0.0
+                self.avg_price = 0.0
+            elif (self.qty > 0) != (direction > 0):
+                self.avg_price = price
+        self.realized_pnl += realized
+        return realized
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return self.qty * (self.last_price - self.avg_price)
+
+
+_OPEN_ORDER_DTYPE = np.dtype(
+    [
+        ("order_id", np.int64),
+        ("symbol", np.int32),
+        ("side", np.int8),
+        ("order_type", np.uint8),
+        ("qty", np.float64),
+        ("price", np.float64),
+        ("bar", np.int64),
+    ]
+)
+_POSITION_DTYPE = np.dtype(
+    [
+        ("symbol", np.int32),
+        ("qty", np.float64),
+        ("avg_price", np.float64),
+        ("realized_pnl", np.float64),
+        ("last_price", np.float64),
+    ]
+)
+
+
+@dataclass
+class _Book:
+    bars: int = 0
+    buy_limits: List[Tuple[float, int, int]] = field(default_factory=list)
+    sell_limits: List[Tuple[float, int, int]] = field(default_factory=list)
+    buy_stops: List[Tuple[float, int, int]] = field(default_factory=list)
+    sell_stops: List[Tuple[float, int, int]] = field(default_factory=list)
+    market: List[int] = field(default_factory=list)
+    pending: Deque[Tuple[int, int]] = field(default_factory=deque)
 
 
 class PaperTrader:
-    """Simulated trading without broker integration."""
+    """Simulated trading without broker integration.
 
-    def __init__(self, config: Dict[str, str]):
+    Config keys: ``symbol`` (default for orders without one), ``slippage_bps``
+    (market and stop fills), ``fee_bps`` (all fills) and ``latency_bars``
+    (bars an order waits before it can fill; default 0 = next bar).
+    """
+
+    def __init__(self, config: Dict[str, Any], journal: Journal | None = None):
         self.config = config
-        self.orders: list[Dict[str, str]] = []
+        self.orders: list[Dict[str, Any]] = []
+        self.default_symbol = str(config.get("symbol", "default"))
+        self.slippage = float(config.get("slippage_bps", 0.0)) / 10000.0
+        self.fee = float(config.get("fee_bps", 0.0)) / 10000.0
+        self.latency_bars = int(config.get("latency_bars", 0))
+
+        self.ledger = FillLedger()
+        self.positions: Dict[str, Position] = {}
+        self._books: Dict[str, _Book] = {}
+        self._open: Dict[int, Dict[str, Any]] = {}
+        self._cancelled: set[int] = set()
+        self._seq = itertools.count()
+        self._last_order_id = 0
+
+        self.journal = journal
+        if journal is not None:
+            self._recover()
+
+    def _book(self, symbol: str) -> _Book:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _Book()
+        return book
+
+    def execute(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        """Accept a market, limit or stop order for simulated matching."""
+        order_type = str(order.get("type", "market")).lower()
+        side = str(order.get("side", "buy")).lower()
+        if order_type not in ("market", "limit", "stop"):
+            raise ValueError(f"Unsupported order type: {order_type}")
+        if side not in ("buy", "sell"):
+            raise ValueError(f"Unsupported order side: {side}")
+        qty = float(order.get("qty", 0.0))
+        if qty <= 0:
+            raise ValueError("Order qty must be positive")
+        if order_type != "market" and "price" not in order:
+            raise ValueError(f"{order_type} orders need a price")
 
-    def execute(self, order: Dict[str, str]) -> Dict[str, str]:
-        """Store a simulated order."""
         self.orders.append(order)
-        return {"status": "paper_submitted", "order_id": str(len(self.orders))}
+        self._last_order_id += 1
+        order_id = self._last_order_id
+        symbol = str(order.get("symbol", self.default_symbol))
+        book = self._book(symbol)
+        record = {
+            "order_id": order_id,
+            "symbol": symbol,
+            "side": side,
+            "type": order_type,
+            "qty": qty,
+            "price": float(order["price"]) if order_type != "market" else 0.0,
+            "bar": book.bars,
+        }
+        self._open[order_id] = record
+        book.pending.append((book.bars + self.latency_bars, order_id))
+        if self.journal is not None:
+            sign = 1 if side == "buy" else -1
+            self.journal.log_order(order_id, symbol, sign, order_type, qty, record["price"], book.bars)
+            self._maybe_snapshot()
+        return {"status": "paper_submitted", "order_id": str(order_id)}
+
+    place_order = execute
+
+    def cancel(self, order_id: int | str) -> bool:
+        """Cancel a resting order; returns False if it already filled or is unknown."""
+        order_id = int(order_id)
+        if order_id not in self._open:
+            return False
+        del self._open[order_id]
+        self._cancelled.add(order_id)
+        if self.journal is not None:
+            self.journal.log_cancel(order_id)
+            self._maybe_snapshot()
+        return True
+
+    @property
+    def open_orders(self) -> Dict[int, Dict[str, Any]]:
+        return self._open
+
+    def _rest(self, book: _Book, order_id: int) -> None:
+        record = self._open.get(order_id)
+        if record is None:
+            self._cancelled.discard(order_id)
+            return
+        price, seq = record["price"], next(self._seq)
+        if record["type"] == "market":
+            book.market.append(order_id)
+        elif record["type"] == "limit":
+            if record["side"] == "buy":
+                heapq.heappush(book.buy_limits, (-price, seq, order_id))
+            else:
+                heapq.heappush(book.sell_limits, (price, seq, order_id))
+        elif record["side"] == "buy":
+            heapq.heappush(book.buy_stops, (price, seq, order_id))
+        else:
+            heapq.heappush(book.sell_stops, (-price, seq, order_id))
+
+    def _fill(self, record: Dict[str, Any], price: float, bar: int, timestamp: float) -> Tuple[Any, ...]:
+        del self._open[record["order_id"]]
+        side = 1 if record["side"] == "buy" else -1
+        position = self.positions.setdefault(record["symbol"], Position())
+        fee = abs(record["qty"] * price) * self.fee
+        realized = position.apply(side * record["qty"], price) - fee
+        position.realized_pnl -= fee
+        fill = (
+            record["order_id"],
+            self.ledger.symbol_id(record["symbol"]),
+            bar,
+            timestamp,
+            side,
+            record["qty"],
+            price,
+            fee,
+            realized,
+        )
+        self.ledger.append(fill)
+        if self.journal is not None:
+            self.journal.log_fill(record["order_id"], record["symbol"], bar, timestamp, side, record["qty"], price, fee, realized)
+        return fill
+
+    def _pop_live(self, heap: List[Tuple[float, int, int]]) -> Tuple[float, int, int] | None:
+        """Peek the best live entry, discarding cancelled ones."""
+        while heap:
+            top = heap[0]
+            if top[2] in self._cancelled:
+                heapq.heappop(heap)
+                self._cancelled.discard(top[2])
+                continue
+            return top
+        return None
+
+    def on_bar(self, bar: Dict[str, Any]) -> List[Tuple[Any, ...]]:
+        """Match resting orders against one bar (``open/high/low/close``, optional ``symbol``/``timestamp``)."""
+        symbol = str(bar.get("symbol", self.default_symbol))
+        open_, high, low, close = (float(bar[k]) for k in ("open", "high", "low", "close"))
+        timestamp = float(bar.get("timestamp", 0.0))
+        book = self._book(symbol)
+        index = book.bars
+        book.bars += 1
+
+        while book.pending and book.pending[0][0] <= index:
+            self._rest(book, book.pending.popleft()[1])
+
+        fills: List[Tuple[Any, ...]] = []
+        for order_id in book.market:
+            record = self._open.get(order_id)
+            if record is None:
+                self._cancelled.discard(order_id)
+            else:
+                side = 1 if record["side"] == "buy" else -1
+                fills.append(self._fill(record, open_ * (1 + side * self.slippage), index, timestamp))
+        book.market.clear()
+
+        while (top := self._pop_live(book.buy_limits)) is not None and low <= -top[0]:
+            heapq.heappop(book.buy_limits)
+            fills.append(self._fill(self._open[top[2]], min(open_, -top[0]), index, timestamp))
+        while (top := self._pop_live(book.sell_limits)) is not None and high >= top[0]:
+            heapq.heappop(book.sell_limits)
+            fills.append(self._fill(self._open[top[2]], max(open_, top[0]), index, timestamp))
+        while (top := self._pop_live(book.buy_stops)) is not None and high >= top[0]:
+            heapq.heappop(book.buy_stops)
+            fills.append(self._fill(self._open[top[2]], max(open_, top[0]) * (1 + self.slippage), index, timestamp))
+        while (top := self._pop_live(book.sell_stops)) is not None and low <= -top[0]:
+            heapq.heappop(book.sell_stops)
+            fills.append(self._fill(self._open[top[2]], min(open_, -top[0]) * (1 - self.slippage), index, timestamp))
+
+        position = self.positions.get(symbol)
+        if position is not None:
+            position.last_price = close
+        if self.journal is not None:
+            if fills:
+                self._maybe_snapshot()
+            if self.journal.commit_due:
+                self.journal.commit()
+        return fills
+
+    def on_tick(self, symbol: str, price: float, timestamp: float = 0.0) -> List[Tuple[Any, ...]]:
+        """Match against a single trade price."""
+        return self.on_bar({"symbol": symbol, "open": price, "high": price, "low": price, "close": price, "timestamp": timestamp})
+
+    def run(self, bars: Iterable[Dict[str, Any]]) -> FillLedger:
+        """Stream a sequence of bars through the matcher."""
+        for bar in bars:
+            self.on_bar(bar)
+        return self.ledger
+
+    def summary(self) -> Dict[str, float]:
+        """Aggregate PnL and activity across symbols."""
+        realized = sum(p.realized_pnl for p in self.positions.values())
+        unrealized = sum(p.unrealized_pnl for p in self.positions.values())
+        return {
+            "orders": float(self._last_order_id),
+            "fills": float(self.ledger.size),
+            "open_orders": float(len(self._open)),
+            "realized_pnl": float(realized),
+            "unrealized_pnl": float(unrealized),
+            "total_pnl": float(realized + unrealized),
+            "fees": float(self.ledger.fills["fee"].sum()),
+        }
+
+    def close(self) -> None:
+        """Commit and close the journal, if any."""
+        if self.journal is not None:
+            self.journal.close()
+
+    # -- journal snapshot / recovery ----------------------------------------
+
+    def _maybe_snapshot(self) -> None:
+        if self.journal.snapshot_due:
+            self.journal.snapshot(self._snapshot_state())
+
+    def _snapshot_state(self) -> Dict[str, np.ndarray]:
+        journal = self.journal
+        orders = np.array(
+            [
+                (
+                    order_id,
+                    journal.symbol_id(record["symbol"]),
+                    1 if record["side"] == "buy" else -1,
+                    ORDER_TYPES.index(record["type"]),
+                    record["qty"],
+                    record["price"],
+                    record["bar"],
+                )
+                for order_id, record in self._open.items()
+            ],
+            dtype=_OPEN_ORDER_DTYPE,
+        )
+        positions = np.array(
+            [
+                (journal.symbol_id(symbol), p.qty, p.avg_price, p.realized_pnl, p.last_price)
+                for symbol, p in self.positions.items()
+            ],
+            dtype=_POSITION_DTYPE,
+        )
+        bars = {journal.symbol_id(symbol): book.bars for symbol, book in self._books.items()}
+        bar_counts = np.zeros(len(journal.symbols), dtype=np.int64)
+        bar_counts[list(bars)] = list(bars.values())
+        return {
+            "orders": orders,
+            "positions": positions,
+            "bars": bar_counts,
+            "last_order_id": np.array(self._last_order_id, dtype=np.int64),
+        }
+
+    def _recover(self) -> None:
+        """Rebuild open orders and positions from the latest snapshot plus the journal tail.
+
+        The fill ledger is rebuilt from every FILL record in the journal, so
+        it matches an uninterrupted run up to the last committed record. Bar
+        counts after the snapshot are inferred from the bars recorded on
+        orders and fills, so bars with no activity before a crash are not
+        counted.
+        """
+        state, tail = self.journal.recover()
+        symbols = self.journal.symbols
+        self._recover_ledger(self.journal.fill_records(), symbols)
+        bars: Dict[str, int] = {}
+        if state is not None:
+            for row in state["positions"].tolist():
+                self.positions[symbols[row[0]]] = Position(row[1], row[2], row[3], row[4])
+            for row in state["orders"].tolist():
+                order_id, symbol_id, side, order_type, qty, price, bar = row
+                self._open[order_id] = self._order_record(order_id, symbols[symbol_id], side, order_type, qty, price, bar)
+            bars = {symbols[i]: int(n) for i, n in enumerate(state["bars"]) if n}
+            self._last_order_id = int(state["last_order_id"])
+
+        for row in tail.tolist():
+            kind, side, order_type, _, symbol_id, order_id, bar, _, qty, price, fee = row[:11]
+            if kind == ORDER:
+                symbol = symbols[symbol_id]
+                self._open[order_id] = self._order_record(order_id, symbol, side, order_type, qty, price, bar)
+                self._last_order_id = max(self._last_order_id, order_id)
+                bars[symbol] = max(bars.get(symbol, 0), bar)
+            elif kind == CANCEL:
+                self._open.pop(order_id, None)
+            elif kind == FILL:
+                symbol = symbols[symbol_id]
+                self._open.pop(order_id, None)
+                position = self.positions.setdefault(symbol, Position())
+                position.apply(side * qty, price)
+                position.realized_pnl -= fee
+                position.last_price = price
+                bars[symbol] = max(bars.get(symbol, 0), bar + 1)
+
+        for symbol, count in bars.items():
+            self._book(symbol).bars = count
+        for order_id in sorted(self._open):
+            record = self._open[order_id]
+            book = self._book(record["symbol"])
+            eligible = record["bar"] + self.latency_bars
+            if eligible < book.bars:
+                self._rest(book, order_id)
+            else:
+                book.pending.append((eligible, order_id))
+
+    def _recover_ledger(self, fills: np.ndarray, symbols: List[str]) -> None:
+        # Ledger symbol ids follow first-fill order, as they do when fills arrive live.
+        ids, first = np.unique(fills["symbol"], return_index=True)
+        lookup = np.zeros(len(symbols), dtype=np.int32)
+        for symbol_id in ids[np.argsort(first)]:
+            lookup[symbol_id] = self.ledger.symbol_id(symbols[symbol_id])
+        columns = {name: fills[name] for name in FILL_DTYPE.names}
+        columns["symbol"] = lookup[fills["symbol"]]
+        self.ledger.extend(columns)
+
+    @staticmethod
+    def _order_record(
+        order_id: int, symbol: str, side: int, order_type: int, qty: float, price: float, bar: int
+    ) -> Dict[str, Any]:
+        return {
+            "order_id": order_id,
+            "symbol": symbol,
+            "side": "buy" if side > 0 else "sell",
+            "type": ORDER_TYPES[order_type],
+            "qty": qty,
+            "price": price,
+            "bar": bar,
+        }
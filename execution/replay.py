@@ -0,0 +1,69 @@
+"""Replay a recorded bar file through the live trading loop against the paper trader."""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import signal
+from typing import Any, AsyncIterator, Dict
+
+from risk_management import load_risk_config
+
+from .journal import Journal
+from .live_trader import LiveTrader
+from .paper_trader import PaperTrader
+
+
+async def replay_bars(path: str, symbol: str, interval: float = 0.0) -> AsyncIterator[Dict[str, Any]]:
+    """Replay a recorded OHLCV CSV as an async bar stream (``interval`` seconds apart)."""
+    import pandas as pd
+
+    frame = pd.read_csv(path)
+    for row in frame[["timestamp", "open", "high", "low", "close", "volume"]].itertuples(index=False):
+        yield {
+            "symbol": symbol,
+            "timestamp": pd.Timestamp(row.timestamp).timestamp(),
+            "open": row.open,
+            "high": row.high,
+            "low": row.low,
+            "close": row.close,
+            "volume": row.volume,
+        }
+        await asyncio.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the live trading loop offline against a recorded bar file.")
+    parser.add_argument("--bars", default="data/btcusd_5min_sample.csv", help="Recorded OHLCV CSV")
+    parser.add_argument("--symbol", default="BTCUSD")
+    parser.add_argument("--interval", type=float, default=0.0, help="Seconds between replayed bars")
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--slippage-bps", type=float, default=2.0)
+    parser.add_argument("--fee-bps", type=float, default=6.0)
+    parser.add_argument("--journal", default=None, help="Order journal path; an existing journal is recovered first")
+    args = parser.parse_args()
+
+    config: Dict[str, Any] = {**load_risk_config(), "symbol": args.symbol, "queue_size": args.queue_size}
+    journal = Journal(args.journal) if args.journal else None
+    broker = PaperTrader({"symbol": args.symbol, "slippage_bps": args.slippage_bps, "fee_bps": args.fee_bps}, journal)
+    trader = LiveTrader(broker, config)
+
+    async def _run() -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, trader.stop)
+            except (NotImplementedError, RuntimeError):
+                pass
+        return await trader.run(replay_bars(args.bars, args.symbol, args.interval))
+
+    try:
+        report = asyncio.run(_run())
+    finally:
+        broker.close()
+    report["paper"] = broker.summary()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,21 @@ from .premium_discount import compute_premium_discount
 from .sessions import encode_sessions
 from .smt_divergence import compute_smt_divergence
 from .indicators import compute_indicators
+from .incremental import IncrementalFeatures
+from .cache import FeatureCache
+from .precision import cast_floats, float_dtype
+
+# The feature stack, in application order, shared by every pipeline entry point.
+FEATURE_STEPS = (
+    compute_market_structure,
+    compute_liquidity,
+    compute_order_blocks,
+    compute_fair_value_gaps,
+    compute_premium_discount,
+    encode_sessions,
+    compute_smt_divergence,
+    compute_indicators,
+)
 
 __all__ = [
     "compute_market_structure",
@@ -18,4 +33,9 @@ __all__ = [
     "encode_sessions",
     "compute_smt_divergence",
     "compute_indicators",
+    "IncrementalFeatures",
+    "FeatureCache",
+    "cast_floats",
+    "float_dtype",
+    "FEATURE_STEPS",
 ]
@@ -0,0 +1,329 @@
+"""Content-addressed on-disk cache for feature frames.
+
+A cached step is keyed by a hash of its input frame, the step function's
+name and arguments, and a code version (a hash of the function's module
+source plus ``CACHE_VERSION``), so editing a feature module invalidates its
+entries automatically. Frames produced by a step are keyed by derivation
+(input key + step) rather than by re-hashing their contents, so a chain of
+steps hashes the raw input only once and a warm run loads just the last
+cached frame of the chain.
+
+Each entry is one binary columnar file: a JSON header followed by 64-byte
+aligned raw column buffers (strings as category codes), read back with
+zero-copy ``np.frombuffer`` views. Entries are evicted least-recently-used
+once the directory exceeds ``max_bytes``. Frames returned by the cache must be
+treated as immutable; derived keys assume they are not modified in place.
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CACHE_VERSION = 1
+_MAGIC = b"FCACHE01"
+_ALIGN = 64
+
+Step = Tuple[Callable[..., "pd.DataFrame"], Tuple[Any, ...]]
+
+
+def _digest(*parts: Any) -> "hashlib.blake2b":
+    h = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        h.update(part if isinstance(part, (bytes, memoryview)) else str(part).encode())
+        h.update(b"\0")
+    return h
+
+
+def _encode_objects(values: np.ndarray) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]] | None:
+    import pandas as pd
+
+    missing = pd.isna(values)
+    present = values[~missing]
+    spec: Dict[str, Any] = {"missing": "none" if any(v is None for v in values[missing][:1]) else "nan"}
+    inferred = pd.api.types.infer_dtype(present, skipna=False) if len(present) else "empty"
+    if inferred in ("string", "empty"):
+        categories, codes = np.unique(present.astype(str), return_inverse=True)
+        full = np.full(len(values), -1, dtype=np.int32)
+        full[~missing] = codes
+        spec["kind"] = "strings"
+        return {"codes": full, "categories": categories.astype(str)}, spec
+    if inferred in ("floating", "integer", "mixed-integer-float"):
+        numbers = np.full(len(values), np.nan)
+        numbers[~missing] = present.astype(float)
+        spec["kind"] = "numbers"
+        spec["integer"] = inferred == "integer"
+        return {"values": numbers, "missing": missing}, spec
+    return None
+
+
+def _encode(frame: "pd.DataFrame") -> Tuple[Dict[str, np.ndarray], Dict[str, Any]] | None:
+    """Column arrays and metadata for ``frame``, or None if a column type is not supported."""
+    import pandas as pd
+
+    arrays: Dict[str, np.ndarray] = {}
+    columns: List[Dict[str, Any]] = []
+    for i, (name, series) in enumerate(frame.items()):
+        dtype = series.dtype
+        spec: Dict[str, Any] = {"name": name, "dtype": str(dtype)}
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            spec["kind"] = "datetime_tz"
+            spec["tz"] = str(dtype.tz)
+            arrays[f"c{i}"] = series.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+        elif isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+            spec["kind"] = "numpy"
+            arrays[f"c{i}"] = series.to_numpy()
+        elif dtype == object or pd.api.types.is_string_dtype(dtype):
+            encoded = _encode_objects(series.to_numpy(dtype=object))
+            if encoded is None:
+                return None
+            parts, extra = encoded
+            spec.update(extra)
+            for part, values in parts.items():
+                arrays[f"c{i}_{part}"] = values
+        else:
+            return None
+        columns.append(spec)
+
+    index = frame.index
+    if isinstance(index, pd.RangeIndex):
+        index_spec: Any = [index.start, index.stop, index.step]
+    elif index.dtype.kind in "biufM":
+        index_spec = "array"
+        arrays["index"] = index.to_numpy()
+    else:
+        return None
+    return arrays, {"columns": columns, "index": index_spec}
+
+
+def _write_columns(path: Path, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> None:
+    """Write a JSON header (array layout + frame metadata) followed by aligned raw buffers."""
+    layout = {}
+    offset = 0
+    buffers = []
+    for name, values in arrays.items():
+        values = np.ascontiguousarray(values)
+        layout[name] = {"dtype": values.dtype.str, "shape": list(values.shape), "offset": offset}
+        buffers.append((offset, values))
+        offset += -(-values.nbytes // _ALIGN) * _ALIGN
+    header = json.dumps({"arrays": layout, "meta": meta}).encode()
+    start = -(-(len(_MAGIC) + 8 + len(header)) // _ALIGN) * _ALIGN
+    with open(path, "wb") as handle:
+        handle.write(_MAGIC + len(header).to_bytes(8, "little") + header)
+        handle.write(b"\0" * (start - handle.tell()))
+        for position, values in buffers:
+            handle.seek(start + position)
+            handle.write(values.view(np.uint8).data)
+
+
+def _read_columns(path: Path) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    raw = path.read_bytes()
+    if raw[: len(_MAGIC)] != _MAGIC:
+        raise ValueError(f"Not a feature cache file: {path}")
+    size = int.from_bytes(raw[len(_MAGIC) : len(_MAGIC) + 8], "little")
+    header = json.loads(raw[len(_MAGIC) + 8 : len(_MAGIC) + 8 + size])
+    start = -(-(len(_MAGIC) + 8 + size) // _ALIGN) * _ALIGN
+    arrays: Dict[str, np.ndarray] = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        arrays[name] = np.frombuffer(raw, dtype=dtype, count=count, offset=start + spec["offset"]).reshape(spec["shape"])
+    return arrays, header["meta"]
+
+
+def _decode(data: Dict[str, np.ndarray], meta: Dict[str, Any]) -> "pd.DataFrame":
+    import pandas as pd
+
+    columns: Dict[Any, Any] = {}
+    for i, spec in enumerate(meta["columns"]):
+        kind = spec["kind"]
+        if kind == "numpy":
+            columns[spec["name"]] = data[f"c{i}"]
+            continue
+        if kind == "datetime_tz":
+            columns[spec["name"]] = pd.Series(data[f"c{i}"]).dt.tz_localize("UTC").dt.tz_convert(spec["tz"])
+            continue
+        missing_value = None if spec["missing"] == "none" else np.nan
+        if kind == "strings":
+            codes = data[f"c{i}_codes"]
+            values = np.full(len(codes), missing_value, dtype=object)
+            present = codes >= 0
+            values[present] = data[f"c{i}_categories"].astype(object)[codes[present]]
+        else:
+            numbers = data[f"c{i}_values"]
+            values = numbers.astype(np.int64 if spec["integer"] else float).astype(object)
+            values[data[f"c{i}_missing"]] = missing_value
+        columns[spec["name"]] = pd.Series(values, dtype=spec["dtype"] if spec["dtype"] != "object" else object)
+
+    index_spec = meta["index"]
+    index = pd.RangeIndex(*index_spec) if isinstance(index_spec, list) else pd.Index(data["index"])
+    frame = pd.DataFrame(
+        {name: col.array if isinstance(col, pd.Series) else col for name, col in columns.items()}, index=index
+    )
+    # Construction infers ``str`` for object arrays of strings; put object columns back as stored.
+    for name, col in columns.items():
+        if isinstance(col, pd.Series) and col.dtype == object:
+            frame[name] = pd.Series(col.to_numpy(), index=index, dtype=object)
+    return frame
+
+
+class FeatureCache:
+    """Size-bounded, content-addressed cache of feature frames in ``directory``."""
+
+    def __init__(self, directory: str | Path, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._derived: Dict[int, Tuple["weakref.ref[pd.DataFrame]", Tuple[Any, ...], str]] = {}
+        self._code_versions: Dict[Callable[..., Any], str] = {}
+
+    # -- keys ----------------------------------------------------------------
+
+    def frame_key(self, frame: "pd.DataFrame") -> str:
+        """Key of a frame: its derivation key if the cache produced it, else a content hash."""
+        import pandas as pd
+
+        known = self._derived.get(id(frame))
+        if known is not None and known[0]() is frame and known[1] == (tuple(frame.columns), len(frame)):
+            return known[2]
+
+        h = _digest("frame", CACHE_VERSION, type(frame.index).__name__, len(frame))
+        index = frame.index
+        if isinstance(index, pd.RangeIndex):
+            h.update(f"{index.start}:{index.stop}:{index.step}".encode())
+        else:
+            h.update(pd.util.hash_pandas_object(index.to_series(), index=False).to_numpy().data)
+        for name, series in frame.items():
+            h.update(f"{name}\0{series.dtype}\0".encode())
+            values = series.values
+            if isinstance(values, np.ndarray) and values.dtype.kind in "biufcmM":
+                h.update(np.ascontiguousarray(values).view(np.uint8).data)
+            else:
+                h.update(pd.util.hash_pandas_object(series, index=False).to_numpy().data)
+        key = h.hexdigest()
+        self._remember(frame, key)
+        return key
+
+    def _code_version(self, func: Callable[..., Any]) -> str:
+        func = inspect.unwrap(func)
+        version = self._code_versions.get(func)
+        if version is None:
+            try:
+                source = Path(inspect.getsourcefile(func) or "").read_bytes()
+            except (OSError, TypeError):
+                source = inspect.getsource(func).encode()
+            version = self._code_versions[func] = _digest(CACHE_VERSION, source).hexdigest()
+        return version
+
+    def step_key(self, source_key: str, func: Callable[..., Any], args: Sequence[Any]) -> str:
+        params = json.dumps(list(args), sort_keys=True, default=repr)
+        # Qualified name plus module source hash, so keys match whether a module runs as __main__ or is imported.
+        return _digest("step", source_key, func.__qualname__, params, self._code_version(func)).hexdigest()
+
+    def _remember(self, frame: "pd.DataFrame", key: str) -> None:
+        if len(self._derived) > 4096:
+            self._derived = {i: entry for i, entry in self._derived.items() if entry[0]() is not None}
+        self._derived[id(frame)] = (weakref.ref(frame), (tuple(frame.columns), len(frame)), key)
+
+    # -- storage -------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.cols"
+
+    def load(self, key: str) -> "pd.DataFrame | None":
+        path = self._path(key)
+        try:
+            frame = _decode(*_read_columns(path))
+            os.utime(path)
+        except (FileNotFoundError, ValueError, KeyError, OSError):
+            return None
+        self._remember(frame, key)
+        return frame
+
+    def store(self, key: str, frame: "pd.DataFrame") -> bool:
+        """Persist ``frame`` under ``key``; returns False if it has unsupported column types."""
+        encoded = _encode(frame)
+        if encoded is None:
+            return False
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        _write_columns(tmp, *encoded)
+        os.replace(tmp, path)
+        self._remember(frame, key)
+        self._evict()
+        return True
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.cols"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.cols"):
+            path.unlink(missing_ok=True)
+
+    # -- memoized calls ------------------------------------------------------
+
+    def chain(self, frame: "pd.DataFrame", steps: Sequence[Step], store_intermediate: bool = False) -> "pd.DataFrame":
+        """Apply ``func(frame, *args)`` for each step, reusing the deepest cached result.
+
+        Only the final frame is stored unless ``store_intermediate`` is set;
+        intermediate entries written by other chains are still reused.
+        """
+        keys: List[str] = []
+        key = self.frame_key(frame)
+        for func, args in steps:
+            key = self.step_key(key, func, args)
+            keys.append(key)
+
+        start = 0
+        for i in range(len(steps) - 1, -1, -1):
+            cached = self.load(keys[i])
+            if cached is not None:
+                frame, start = cached, i + 1
+                self.hits += 1
+                break
+        for i in range(start, len(steps)):
+            func, args = steps[i]
+            frame = func(frame, *args)
+            self.misses += 1
+            if store_intermediate or i == len(steps) - 1:
+                self.store(keys[i], frame)
+        return frame
+
+    def call(self, func: Callable[..., "pd.DataFrame"], frame: "pd.DataFrame", *args: Any) -> "pd.DataFrame":
+        """Memoized ``func(frame, *args)``."""
+        return self.chain(frame, [(func, args)])
+
+    def stats(self) -> Dict[str, float]:
+        sizes = [path.stat().st_size for path in self.directory.glob("*.cols")]
+        return {
+            "hits": float(self.hits),
+            "misses": float(self.misses),
+            "entries": float(len(sizes)),
+            "bytes": float(sum(sizes)),
+        }
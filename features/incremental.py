@@ -0,0 +1,94 @@
+"""Incremental (bar-by-bar) versions of the structure, FVG and volatility features."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Dict, Tuple
+
+
+class IncrementalFeatures:
+    """Streaming market structure and FVG detection with O(1) updates.
+
+    Matches ``compute_market_structure`` (``bos``/``mss`` against the prior
+    ``swing_lookback`` bars) and ``compute_fair_value_gaps``. An FVG belongs
+    to the middle bar of a three-bar pattern, so it is only known once the
+    third bar closes; ``fvg_direction`` in each update refers to the previous
+    bar. ``volatility`` follows ``compute_indicators`` (rolling sample std of
+    close-to-close returns, 0.0 until ``volatility_window`` returns exist).
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.lookback = max(1, int(config.get("swing_lookback", 3)))
+        self.gap_threshold = float(config.get("fvg_min_gap", 0.0))
+        # Monotonic deques of (bar index, value) for rolling max high / min low.
+        self._highs: Deque[Tuple[int, float]] = deque()
+        self._lows: Deque[Tuple[int, float]] = deque()
+        self._recent: Deque[Tuple[float, float]] = deque(maxlen=3)
+        self._index = -1
+        self.volatility_window = int(config.get("volatility_window", 20))
+        self._returns: Deque[float] = deque()
+        self._return_sum = 0.0
+        self._return_sumsq = 0.0
+        self._last_close: float | None = None
+
+    def _window_extremes(self) -> Tuple[float | None, float | None]:
+        if self._index < self.lookback:
+            return None, None
+        return self._highs[0][1], self._lows[0][1]
+
+    def update(self, bar: Dict[str, Any]) -> Dict[str, Any]:
+        """Consume one closed bar and return its feature snapshot."""
+        high, low, close = float(bar["high"]), float(bar["low"]), float(bar["close"])
+        self._index += 1
+        index = self._index
+
+        # Extremes of the previous ``lookback`` bars, before adding this one.
+        prior_high, prior_low = self._window_extremes()
+        bos = prior_high is not None and close > prior_high
+        mss = prior_low is not None and close < prior_low
+
+        while self._highs and self._highs[-1][1] <= high:
+            self._highs.pop()
+        self._highs.append((index, high))
+        while self._lows and self._lows[-1][1] >= low:
+            self._lows.pop()
+        self._lows.append((index, low))
+        cutoff = index - self.lookback + 1
+        while self._highs[0][0] < cutoff:
+            self._highs.popleft()
+        while self._lows[0][0] < cutoff:
+            self._lows.popleft()
+
+        self._recent.append((high, low))
+        fvg_direction = None
+        if len(self._recent) == 3:
+            (first_high, first_low), _, (third_high, third_low) = self._recent
+            if first_high < third_low - self.gap_threshold:
+                fvg_direction = "bullish"
+            elif first_low > third_high + self.gap_threshold:
+                fvg_direction = "bearish"
+
+        volatility = 0.0
+        if self._last_close:
+            change = close / self._last_close - 1.0
+            self._returns.append(change)
+            self._return_sum += change
+            self._return_sumsq += change * change
+            if len(self._returns) > self.volatility_window:
+                dropped = self._returns.popleft()
+                self._return_sum -= dropped
+                self._return_sumsq -= dropped * dropped
+            count = len(self._returns)
+            if count == self.volatility_window and count > 1:
+                variance = (self._return_sumsq - self._return_sum * self._return_sum / count) / (count - 1)
+                volatility = max(variance, 0.0) ** 0.5
+        self._last_close = close
+
+        return {
+            "index": index,
+            "close": close,
+            "bos": bos,
+            "mss": mss,
+            "structure_direction": "bullish" if bos else "bearish" if mss else "neutral",
+            "fvg_direction": fvg_direction,
+            "volatility": volatility,
+        }
@@ -12,12 +12,15 @@ def compute_indicators(data: "pd.DataFrame", config: Dict[str, Any]) -> "pd.Data
 
     Args:
         data: OHLCV dataframe.
-        config: Configuration options for indicators.
+        config: Configuration options for indicators (``volatility_window``).
 
     Returns:
         Dataframe with indicator columns appended.
     """
     data = data.copy()
-    data["volatility"] = 0.0
+    # Rolling standard deviation of close-to-close returns; 0.0 until the window fills.
+    window = int(config.get("volatility_window", 20))
+    returns = data["close"].pct_change()
+    data["volatility"] = returns.rolling(window, min_periods=window).std().fillna(0.0)
     data["trend_strength"] = 0.0
     return data
@@ -0,0 +1,50 @@
+"""Floating-point precision setting shared by the feature steps."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PRECISIONS = {"float64": np.dtype(np.float64), "float32": np.dtype(np.float32)}
+
+
+def float_dtype(config: Dict[str, Any]) -> np.dtype:
+    """Float dtype selected by ``config["precision"]`` (``"float64"`` by default)."""
+    precision = config.get("precision", "float64")
+    try:
+        return PRECISIONS[str(precision)]
+    except KeyError:
+        raise ValueError(f"precision must be one of {sorted(PRECISIONS)}, got {precision!r}") from None
+
+
+def cast_floats(data: "pd.DataFrame", config: Dict[str, Any]) -> "pd.DataFrame":
+    """Cast float columns, and object columns holding only numbers or None, to the configured precision.
+
+    Returns ``data`` itself at float64; otherwise a new frame with the cast
+    columns, leaving ``data`` untouched so the call can run as a cached
+    feature step. All-None placeholder columns become NaN floats; integer,
+    bool and string columns are left alone.
+    """
+    dtype = float_dtype(config)
+    if dtype == np.float64:
+        return data
+    import pandas as pd
+
+    cast: Dict[str, Any] = {}
+    for name, column in data.items():
+        if column.dtype.kind == "f":
+            if column.dtype != dtype:
+                cast[name] = column.astype(dtype)
+        elif column.dtype == object:
+            first = column.first_valid_index()
+            if first is None:
+                cast[name] = np.full(len(column), np.nan, dtype=dtype)
+            elif isinstance(column[first], (int, float)) and not isinstance(column[first], bool):
+                try:
+                    cast[name] = pd.to_numeric(column, errors="raise").astype(dtype)
+                except (TypeError, ValueError):
+                    continue
+    return data.assign(**cast) if cast else data
@@ -0,0 +1,5 @@
+"""Pipeline instrumentation."""
+
+from .profiler import NULL_PROFILER, NullProfiler, StageProfiler
+
+__all__ = ["StageProfiler", "NullProfiler", "NULL_PROFILER"]
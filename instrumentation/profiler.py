@@ -0,0 +1,236 @@
+"""Named-stage profiling: wall time, CPU time, peak RSS and rows in/out."""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+_STATUS = "/proc/self/status"
+_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def _status_kb(field: bytes) -> int | None:
+    try:
+        with open(_STATUS, "rb") as handle:
+            for line in handle:
+                if line.startswith(field):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _maxrss_kb() -> int:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage // 1024 if sys.platform == "darwin" else usage
+
+
+def _can_reset_peak() -> bool:
+    try:
+        with open(_CLEAR_REFS, "w") as handle:
+            handle.write("5")
+        return _status_kb(b"VmHWM:") is not None
+    except OSError:
+        return False
+
+
+def _rows(value: Any) -> int | None:
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+class Stage:
+    """One profiled stage; set ``rows_out`` (and optionally ``rows_in``) inside the ``with`` block."""
+
+    __slots__ = ("name", "path", "depth", "rows_in", "rows_out", "attrs", "start", "wall", "cpu", "rss_start", "peak", "_cpu0")
+
+    def __init__(self, name: str, path: str, depth: int, rows_in: int | None, attrs: Dict[str, Any]):
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.rows_in = rows_in
+        self.rows_out: int | None = None
+        self.attrs = attrs
+        self.start = 0.0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rss_start = 0
+        self.peak = 0
+        self._cpu0 = 0.0
+
+    def to_dict(self, origin: float) -> Dict[str, Any]:
+        return {
+            "stage": self.path,
+            "depth": self.depth,
+            "start_s": self.start - origin,
+            "wall_s": self.wall,
+            "cpu_s": self.cpu,
+            "rss_start_mb": self.rss_start / 1024.0,
+            "peak_rss_delta_mb": max(self.peak - self.rss_start, 0) / 1024.0,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            **self.attrs,
+        }
+
+
+class _StageContext:
+    __slots__ = ("profiler", "stage")
+
+    def __init__(self, profiler: "StageProfiler", stage: Stage):
+        self.profiler = profiler
+        self.stage = stage
+
+    def __enter__(self) -> Stage:
+        self.profiler._enter(self.stage)
+        return self.stage
+
+    def __exit__(self, *exc: Any) -> None:
+        self.profiler._exit(self.stage)
+
+
+class StageProfiler:
+    """Record nested stages for one pipeline run.
+
+    ``with profiler.stage("merge", rows_in=n) as s: ...; s.rows_out = len(out)``
+    records wall and CPU time and the peak RSS reached inside the stage,
+    reported as a delta over the RSS at entry. On Linux the kernel's RSS
+    high-water mark is reset at every stage boundary (``/proc/self/clear_refs``),
+    so each stage gets its own peak; elsewhere the process-lifetime
+    ``ru_maxrss`` is used and only stages that raise it show a delta.
+    Nested stages are named by path (``features/1hr/compute_indicators``).
+    Stages must be entered from one thread.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.stages: List[Stage] = []
+        self._open: List[Stage] = []
+        self._origin = time.perf_counter()
+        self._reset_peak = _can_reset_peak()
+        self._thread = threading.get_ident()
+
+    def _rss_kb(self) -> int:
+        return _status_kb(b"VmRSS:") or _maxrss_kb()
+
+    def _peak_kb(self) -> int:
+        if self._reset_peak:
+            return _status_kb(b"VmHWM:") or 0
+        return _maxrss_kb()
+
+    def _fold_peak(self) -> None:
+        peak = self._peak_kb()
+        for stage in self._open:
+            if peak > stage.peak:
+                stage.peak = peak
+
+    def _enter(self, stage: Stage) -> None:
+        if self._reset_peak:
+            # Credit the high-water mark so far to the enclosing stages before resetting it.
+            self._fold_peak()
+            with open(_CLEAR_REFS, "w") as handle:
+                handle.write("5")
+        stage.rss_start = self._rss_kb()
+        stage.peak = stage.rss_start
+        self._open.append(stage)
+        self.stages.append(stage)
+        stage._cpu0 = time.process_time()
+        stage.start = time.perf_counter()
+
+    def _exit(self, stage: Stage) -> None:
+        stage.wall = time.perf_counter() - stage.start
+        stage.cpu = time.process_time() - stage._cpu0
+        self._fold_peak()
+        self._open.pop()
+
+    def stage(self, name: str, rows_in: int | None = None, **attrs: Any) -> _StageContext:
+        parent = self._open[-1].path + "/" if self._open else ""
+        return _StageContext(self, Stage(name, parent + name, len(self._open), rows_in, attrs))
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Profile every call of ``func``; rows in/out are taken from ``len()`` of the first argument and the result.
+
+        The wrapper carries ``func``'s name and ``__wrapped__``, so
+        ``FeatureCache`` step keys are unchanged.
+        """
+
+        @functools.wraps(func)
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            with self.stage(name, _rows(args[0]) if args else None) as stage:
+                result = func(*args, **kwargs)
+                stage.rows_out = _rows(result)
+            return result
+
+        return profiled
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "peak_rss_source": "VmHWM" if self._reset_peak else "ru_maxrss",
+            "stages": [stage.to_dict(self._origin) for stage in self.stages],
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format (chrome://tracing, Perfetto, speedscope) with one complete event per stage."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": stage.name,
+                "cat": "pipeline",
+                "ph": "X",
+                "ts": (stage.start - self._origin) * 1e6,
+                "dur": stage.wall * 1e6,
+                "pid": pid,
+                "tid": self._thread,
+                "args": {k: v for k, v in stage.to_dict(self._origin).items() if k not in ("start_s", "wall_s")},
+            }
+            for stage in self.stages
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, metrics_path: str | Path) -> tuple[Path, Path]:
+        """Write ``<stem>.profile.json`` and ``<stem>.trace.json`` next to ``metrics_path``."""
+        metrics_path = Path(metrics_path)
+        metrics_path.parent.mkdir(parents=True, exist_ok=True)
+        profile_path = metrics_path.with_name(f"{metrics_path.stem}.profile.json")
+        trace_path = metrics_path.with_name(f"{metrics_path.stem}.trace.json")
+        profile_path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        trace_path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return profile_path, trace_path
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        return None
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off: stages are a shared no-op context and ``wrap`` returns ``func`` itself."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name: str, rows_in: int | None = None, **attrs: Any) -> _NullStage:
+        return self._stage
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        return func
+
+
+NULL_PROFILER = NullProfiler()
@@ -1,30 +1,34 @@
 """Entry point for running the ICT trading system pipeline."""
 from __future__ import annotations
 
-from features import (
-    compute_fair_value_gaps,
-    compute_indicators,
-    compute_liquidity,
-    compute_market_structure,
-    compute_order_blocks,
-    compute_premium_discount,
-    compute_smt_divergence,
-    encode_sessions,
-)
+import numpy as np
+
+from features import FEATURE_STEPS, FeatureCache, cast_floats, float_dtype
+from instrumentation import NULL_PROFILER, NullProfiler, StageProfiler
 from strategies import generate_sweep_mss_ob_signals
 
 
-def run_pipeline(data, config):
-    """Run a minimal feature + strategy pipeline on input data."""
-    features = compute_market_structure(data, config)
-    features = compute_liquidity(features, config)
-    features = compute_order_blocks(features, config)
-    features = compute_fair_value_gaps(features, config)
-    features = compute_premium_discount(features, config)
-    features = encode_sessions(features, config)
-    features = compute_smt_divergence(features, config)
-    features = compute_indicators(features, config)
-    signals = generate_sweep_mss_ob_signals(features, config)
+def run_pipeline(
+    data, config, cache: FeatureCache | None = None, profiler: StageProfiler | NullProfiler = NULL_PROFILER
+):
+    """Run a minimal feature + strategy pipeline on input data.
+
+    Pass a ``FeatureCache`` to reuse features computed earlier for the same
+    data, config and feature code, and a ``StageProfiler`` to record each
+    feature function and the signal stage.
+    """
+    steps = [(profiler.wrap(func.__name__, func), (config,)) for func in FEATURE_STEPS]
+    if float_dtype(config) != np.float64:
+        steps.append((profiler.wrap("cast_floats", cast_floats), (config,)))
+    with profiler.stage("features", rows_in=len(data)) as stage:
+        if cache is not None:
+            features = cache.chain(data, steps)
+        else:
+            features = data
+            for func, args in steps:
+                features = func(features, *args)
+        stage.rows_out = len(features)
+    signals = profiler.wrap("signals", generate_sweep_mss_ob_signals)(features, config)
     return signals
 
 
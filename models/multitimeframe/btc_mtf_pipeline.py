@@ -4,21 +4,17 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
 
-from features import (
-    compute_fair_value_gaps,
-    compute_indicators,
-    compute_liquidity,
-    compute_market_structure,
-    compute_order_blocks,
-    compute_premium_discount,
-    compute_smt_divergence,
-    encode_sessions,
-)
+from backtesting.robustness import resample_returns
+from features import FEATURE_STEPS
+from features.cache import FeatureCache, Step
+from features.precision import PRECISIONS, cast_floats, float_dtype
+from instrumentation import NULL_PROFILER, NullProfiler, StageProfiler
+from strategies.rules import compile_rules
 
 TIMEFRAMES = {
     "1w": "1W",
@@ -31,6 +27,13 @@ TIMEFRAMES = {
     "5min": "5min",
 }
 
+TF_SIGNAL_RULES = compile_rules(
+    [
+        {"name": "tf_long", "direction": 1, "when": {"all": ["bos", {"col": "fvg_direction", "eq": "bullish"}]}},
+        {"name": "tf_short", "direction": -1, "when": {"all": ["mss", {"col": "fvg_direction", "eq": "bearish"}]}},
+    ]
+)
+
 
 def load_btcusd_5min(source_csv: str | None = None) -> pd.DataFrame:
     """Load BTCUSD 5-minute OHLCV data."""
@@ -71,28 +74,79 @@ def resample_ohlcv(df_5m: pd.DataFrame, rule: str) -> pd.DataFrame:
     return rs
 
 
-def build_features(df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
-    """Apply the same feature stack to one timeframe dataframe."""
+def _normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     feat = df.rename(
         columns={"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
     ).copy()
     feat.columns = [c.lower() if c != "timestamp" else c for c in feat.columns]
+    return feat
+
+
+def _feature_steps(config: Dict[str, Any]) -> List[Step]:
+    steps: List[Step] = [(_normalize_columns, ())] + [(func, (config,)) for func in FEATURE_STEPS]
+    if float_dtype(config) != np.float64:
+        # One cast after the whole stack; float64 runs keep their step keys.
+        steps.append((cast_floats, (config,)))
+    return steps
+
+
+def _run_steps(
+    df: pd.DataFrame, steps: List[Step], cache: FeatureCache | None, profiler: StageProfiler | NullProfiler = NULL_PROFILER
+) -> pd.DataFrame:
+    if profiler.enabled:
+        steps = [(profiler.wrap(func.__name__, func), args) for func, args in steps]
+    if cache is not None:
+        return cache.chain(df, steps)
+    for func, args in steps:
+        df = func(df, *args)
+    return df
 
-    feat = compute_market_structure(feat, config)
-    feat = compute_liquidity(feat, config)
-    feat = compute_order_blocks(feat, config)
-    feat = compute_fair_value_gaps(feat, config)
-    feat = compute_premium_discount(feat, config)
-    feat = encode_sessions(feat, config)
-    feat = compute_smt_divergence(feat, config)
-    feat = compute_indicators(feat, config)
-
-    feat["tf_signal"] = 0
-    feat.loc[(feat["bos"] == True) & (feat["fvg_direction"] == "bullish"), "tf_signal"] = 1
-    feat.loc[(feat["mss"] == True) & (feat["fvg_direction"] == "bearish"), "tf_signal"] = -1
+
+def _add_tf_signal(feat: pd.DataFrame) -> pd.DataFrame:
+    feat["tf_signal"] = TF_SIGNAL_RULES.combined(feat).astype(np.int64)
     return feat
 
 
+def build_features(
+    df: pd.DataFrame,
+    config: Dict[str, Any],
+    cache: FeatureCache | None = None,
+    profiler: StageProfiler | NullProfiler = NULL_PROFILER,
+) -> pd.DataFrame:
+    """Apply the same feature stack to one timeframe dataframe, memoized through ``cache`` if given."""
+    feat = _run_steps(df, _feature_steps(config), cache, profiler)
+    return profiler.wrap("tf_signal", _add_tf_signal)(feat)
+
+
+def build_timeframe_features(
+    df_5m: pd.DataFrame,
+    config: Dict[str, Any],
+    cache: FeatureCache | None = None,
+    profiler: StageProfiler | NullProfiler = NULL_PROFILER,
+) -> Dict[str, pd.DataFrame]:
+    """Resample 5-minute bars to every timeframe and build its features.
+
+    With a cache, resampling and each feature step are one memoized chain per
+    timeframe, so a warm run loads only the final frame. With a profiler,
+    each timeframe is a stage and every step that actually runs (not served
+    from the cache) is a child stage.
+    """
+    tf_features: Dict[str, pd.DataFrame] = {}
+    for name, rule in TIMEFRAMES.items():
+        with profiler.stage(name, rows_in=len(df_5m)) as stage:
+            steps = [(resample_ohlcv, (rule,))] + _feature_steps(config)
+            feat = _run_steps(df_5m, steps, cache, profiler)
+            feat = profiler.wrap("tf_signal", _add_tf_signal)(feat)
+            stage.rows_out = len(feat)
+        tf_features[name] = feat
+    return tf_features
+
+
+def _float_dtype(column: pd.Series) -> np.dtype:
+    """The column's dtype if it is float32/float64, else float64."""
+    return column.dtype if column.dtype in (np.float32, np.float64) else np.dtype(np.float64)
+
+
 def merge_timeframes(tf_features: Dict[str, pd.DataFrame]) -> pd.DataFrame:
     """Align all timeframe features onto 5-minute bars using asof merge."""
     base = tf_features["5min"].copy()
@@ -127,7 +181,8 @@ def merge_timeframes(tf_features: Dict[str, pd.DataFrame]) -> pd.DataFrame:
             base[c] = 0
         base[c] = base[c].fillna(0)
 
-    weighted_sum = np.zeros(len(base), dtype=float)
+    # Accumulated in float64 at either precision: near-zero sums decide the signal's sign.
+    weighted_sum = np.zeros(len(base), dtype=np.float64)
     for c in signal_cols:
         weighted_sum += base[c].to_numpy() * weight_map.get(c, 1.0)
 
@@ -155,23 +210,29 @@ def tune_signal_threshold(train: pd.DataFrame, candidates: Tuple[float, ...] = (
     best_reward = -np.inf
     for threshold in candidates:
         candidate_signal = np.where(train["signal_score"] > threshold, 1, np.where(train["signal_score"] < -threshold, -1, 0))
-        close = train["close_5min"].to_numpy(dtype=float)
+        close = train["close_5min"].to_numpy(dtype=_float_dtype(train["close_5min"]))
         returns = np.zeros_like(close)
         returns[1:] = (close[1:] - close[:-1]) / np.maximum(close[:-1], 1e-9)
         strategy_returns = np.zeros_like(close)
         strategy_returns[1:] = candidate_signal[:-1] * returns[1:]
-        reward = float(np.mean(strategy_returns))
+        reward = float(np.mean(strategy_returns, dtype=np.float64))
         if reward > best_reward:
             best_reward = reward
             best_threshold = threshold
     return float(best_threshold)
 
 
-def execute_trade_model(merged: pd.DataFrame, *, threshold: float = 0.0, fee_bps: float = 6.0, slippage_bps: float = 2.0) -> Dict[str, float]:
-    """Run execution model with friction-aware returns and thresholded signal."""
-    close = merged["close_5min"].to_numpy(dtype=float)
-    raw_score = merged["signal_score"].to_numpy(dtype=float)
-    signal = np.where(raw_score > threshold, 1, np.where(raw_score < -threshold, -1, 0)).astype(float)
+def compute_strategy_returns(
+    merged: pd.DataFrame, *, threshold: float = 0.0, fee_bps: float = 6.0, slippage_bps: float = 2.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the thresholded signal and friction-aware per-bar strategy returns.
+
+    Both arrays keep the precision of ``close_5min`` (float32 or float64).
+    """
+    dtype = _float_dtype(merged["close_5min"])
+    close = merged["close_5min"].to_numpy(dtype=dtype)
+    raw_score = merged["signal_score"].to_numpy(dtype=dtype)
+    signal = np.where(raw_score > threshold, 1, np.where(raw_score < -threshold, -1, 0)).astype(dtype)
 
     returns = np.zeros_like(close)
     returns[1:] = (close[1:] - close[:-1]) / np.maximum(close[:-1], 1e-9)
@@ -182,8 +243,18 @@ def execute_trade_model(merged: pd.DataFrame, *, threshold: float = 0.0, fee_bps
     turnover = np.abs(np.diff(signal, prepend=signal[0]))
     cost_per_turnover = (fee_bps + slippage_bps) / 10000.0
     strategy_returns -= turnover * cost_per_turnover
+    return signal, strategy_returns
+
+
+def execute_trade_model(merged: pd.DataFrame, *, threshold: float = 0.0, fee_bps: float = 6.0, slippage_bps: float = 2.0) -> Dict[str, float]:
+    """Run execution model with friction-aware returns and thresholded signal."""
+    signal, strategy_returns = compute_strategy_returns(
+        merged, threshold=threshold, fee_bps=fee_bps, slippage_bps=slippage_bps
+    )
 
-    equity = np.cumprod(1.0 + strategy_returns)
+    # Equity compounds in float64 whatever the precision of the returns.
+    equity = np.add(1.0, strategy_returns, dtype=np.float64)
+    np.cumprod(equity, out=equity)
     peak = np.maximum.accumulate(equity)
     drawdown = np.where(peak > 0, (equity - peak) / peak, 0)
 
@@ -197,7 +268,7 @@ def execute_trade_model(merged: pd.DataFrame, *, threshold: float = 0.0, fee_bps
         "fee_bps": float(fee_bps),
         "slippage_bps": float(slippage_bps),
         "total_return_pct": float((equity[-1] - 1.0) * 100),
-        "avg_bar_return_pct": float(np.mean(strategy_returns) * 100),
+        "avg_bar_return_pct": float(np.mean(strategy_returns, dtype=np.float64) * 100),
         "win_rate": float(win_rate),
         "max_drawdown_pct": float(np.min(drawdown) * 100),
     }
@@ -210,21 +281,47 @@ def run_pipeline(
     train_ratio: float,
     fee_bps: float,
     slippage_bps: float,
+    robustness_resamples: int = 0,
+    cache_dir: Path | None = None,
+    cache_max_mb: float = 512.0,
+    profile: bool = False,
+    precision: str = "float64",
 ) -> None:
-    config: Dict[str, Any] = {}
-    df_5m = load_btcusd_5min(source_csv)
-
-    tf_features: Dict[str, pd.DataFrame] = {}
-    for name, rule in TIMEFRAMES.items():
-        rs = resample_ohlcv(df_5m, rule)
-        tf_features[name] = build_features(rs, config)
-
-    merged = merge_timeframes(tf_features)
-    train_df, test_df = split_train_test(merged, train_ratio=train_ratio)
-    threshold = tune_signal_threshold(train_df)
-
-    train_metrics = execute_trade_model(train_df, threshold=threshold, fee_bps=fee_bps, slippage_bps=slippage_bps)
-    test_metrics = execute_trade_model(test_df, threshold=threshold, fee_bps=fee_bps, slippage_bps=slippage_bps)
+    """Build features, tune on the train split and evaluate on the test split.
+
+    With ``profile`` set, every stage and every feature function per
+    timeframe is timed and memory-profiled; the results are written next to
+    ``output_metrics`` as ``<stem>.profile.json`` and a Chrome/Perfetto
+    ``<stem>.trace.json``. ``precision="float32"`` keeps prices, features,
+    scores and returns in float32; equity and metric sums still accumulate
+    in float64.
+    """
+    # Only non-default precision enters the config, so float64 cache keys are unchanged.
+    config: Dict[str, Any] = {} if precision == "float64" else {"precision": precision}
+    profiler = StageProfiler() if profile else NULL_PROFILER
+    with profiler.stage("load") as stage:
+        df_5m = cast_floats(load_btcusd_5min(source_csv), config)
+        stage.rows_out = len(df_5m)
+
+    cache = FeatureCache(cache_dir, max_bytes=int(cache_max_mb * 1024 * 1024)) if cache_dir else None
+    with profiler.stage("features", rows_in=len(df_5m)) as stage:
+        tf_features = build_timeframe_features(df_5m, config, cache, profiler)
+        feature_rows = sum(len(feat) for feat in tf_features.values())
+        stage.rows_out = feature_rows
+
+    with profiler.stage("merge", rows_in=feature_rows) as stage:
+        merged = merge_timeframes(tf_features)
+        stage.rows_out = len(merged)
+    with profiler.stage("split", rows_in=len(merged)) as stage:
+        train_df, test_df = split_train_test(merged, train_ratio=train_ratio)
+        stage.rows_out = len(train_df) + len(test_df)
+    with profiler.stage("tune", rows_in=len(train_df)):
+        threshold = tune_signal_threshold(train_df)
+
+    with profiler.stage("execute_train", rows_in=len(train_df)):
+        train_metrics = execute_trade_model(train_df, threshold=threshold, fee_bps=fee_bps, slippage_bps=slippage_bps)
+    with profiler.stage("execute_test", rows_in=len(test_df)):
+        test_metrics = execute_trade_model(test_df, threshold=threshold, fee_bps=fee_bps, slippage_bps=slippage_bps)
 
     metrics = {
         "data_rows": float(len(merged)),
@@ -233,15 +330,25 @@ def run_pipeline(
         "train": train_metrics,
         "test": test_metrics,
     }
+    if robustness_resamples > 0:
+        with profiler.stage("robustness", rows_in=len(test_df), resamples=robustness_resamples):
+            _, test_returns = compute_strategy_returns(
+                test_df, threshold=threshold, fee_bps=fee_bps, slippage_bps=slippage_bps
+            )
+            metrics["test_robustness"] = resample_returns(test_returns, n_resamples=robustness_resamples).to_dict()
 
     output_features.parent.mkdir(parents=True, exist_ok=True)
     output_metrics.parent.mkdir(parents=True, exist_ok=True)
 
-    merged.to_csv(output_features, index=False)
-    output_metrics.write_text(json.dumps(metrics, indent=2), encoding="utf-8")
+    with profiler.stage("write", rows_in=len(merged)):
+        merged.to_csv(output_features, index=False)
+        output_metrics.write_text(json.dumps(metrics, indent=2), encoding="utf-8")
 
     print(f"Saved merged multi-timeframe dataset: {output_features}")
     print(f"Saved execution metrics: {output_metrics}")
+    if profiler.enabled:
+        profile_path, trace_path = profiler.write(output_metrics)
+        print(f"Saved stage profile: {profile_path} (trace: {trace_path})")
     print(json.dumps(metrics, indent=2))
 
 
@@ -253,6 +360,17 @@ def main() -> None:
     parser.add_argument("--train-ratio", type=float, default=0.7, help="Time-based train split ratio (default 0.7)")
     parser.add_argument("--fee-bps", type=float, default=6.0, help="Estimated fee in basis points per position change")
     parser.add_argument("--slippage-bps", type=float, default=2.0, help="Estimated slippage in basis points per position change")
+    parser.add_argument(
+        "--robustness-resamples", type=int, default=0, help="Block-bootstrap resamples of test returns (0 disables)"
+    )
+    parser.add_argument("--cache-dir", type=Path, default=None, help="Feature cache directory (disabled if omitted)")
+    parser.add_argument("--cache-max-mb", type=float, default=512.0, help="Feature cache size bound in MB")
+    parser.add_argument(
+        "--precision", choices=sorted(PRECISIONS), default="float64", help="Float precision of features and returns"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="Write per-stage time/memory profile and trace next to the metrics file"
+    )
     args = parser.parse_args()
 
     run_pipeline(
@@ -262,6 +380,11 @@ def main() -> None:
         train_ratio=args.train_ratio,
         fee_bps=args.fee_bps,
         slippage_bps=args.slippage_bps,
+        robustness_resamples=args.robustness_resamples,
+        cache_dir=args.cache_dir,
+        cache_max_mb=args.cache_max_mb,
+        profile=args.profile,
+        precision=args.precision,
     )
 
 
@@ -0,0 +1,142 @@
+"""Run the multi-timeframe stack for every configured symbol and combine a portfolio."""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import yaml
+
+from backtesting.engine import BacktestResult, run_backtest
+from backtesting.portfolio import combine_portfolio
+from features.cache import FeatureCache
+from risk_management import load_risk_config
+
+from .btc_mtf_pipeline import build_timeframe_features, load_btcusd_5min, merge_timeframes
+
+
+def load_symbols(path: Path) -> List[str]:
+    """Read the symbol list from ``configs/symbols.yaml``."""
+    loaded = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    symbols = loaded.get("symbols", [])
+    if not symbols:
+        raise ValueError(f"No symbols configured in {path}")
+    return [str(symbol) for symbol in symbols]
+
+
+def run_symbol(task: Tuple[str, str, Dict[str, Any], str | None]) -> Dict[str, Any]:
+    """Worker: load one symbol, build features and signals, and backtest it."""
+    symbol, source_csv, config, cache_dir = task
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    t0 = time.perf_counter()
+    df_5m = load_btcusd_5min(source_csv)
+    timings["load"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    cache = FeatureCache(cache_dir) if cache_dir else None
+    tf_features = build_timeframe_features(df_5m, config, cache)
+    timings["features"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    merged = merge_timeframes(tf_features)
+    threshold = float(config.get("signal_threshold", 0.0))
+    score = merged["signal_score"].to_numpy(dtype=float)
+    signal = np.where(score > threshold, 1, np.where(score < -threshold, -1, 0))
+    timings["signals"] = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    prices = tf_features["5min"][["timestamp", "open", "high", "low", "close"]]
+    result = run_backtest(signal, prices, config)
+    timings["backtest"] = time.perf_counter() - t0
+    timings["total"] = time.perf_counter() - started
+
+    return {
+        "symbol": symbol,
+        "pid": os.getpid(),
+        "timestamps": prices["timestamp"].to_numpy(),
+        "result": result,
+        "timings": timings,
+    }
+
+
+def run_portfolio(
+    symbols: List[str],
+    data_pattern: str,
+    config: Dict[str, Any],
+    workers: int | None = None,
+    cache_dir: str | None = None,
+) -> Dict[str, Any]:
+    """Backtest all symbols in parallel workers and combine them into one portfolio."""
+    tasks = [(symbol, data_pattern.format(symbol=symbol), config, cache_dir) for symbol in symbols]
+    missing = [path for _, path, _, _ in tasks if not Path(path).exists()]
+    if missing:
+        raise FileNotFoundError(
+            f"Missing symbol data: {missing}. Only data/btcusd_5min_sample.csv ships with the repo; "
+            "point --data-pattern at your own files or pass --symbols BTCUSD --data-pattern data/btcusd_5min_sample.csv"
+        )
+
+    started = time.perf_counter()
+    if workers == 1:
+        outputs = [run_symbol(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers or len(tasks)) as pool:
+            outputs = list(pool.map(run_symbol, tasks))
+    parallel_seconds = time.perf_counter() - started
+
+    results: Dict[str, BacktestResult] = {out["symbol"]: out["result"] for out in outputs}
+    timestamps = {out["symbol"]: out["timestamps"] for out in outputs}
+
+    t0 = time.perf_counter()
+    portfolio = combine_portfolio(results, timestamps, config)
+    combine_seconds = time.perf_counter() - t0
+
+    return {
+        "portfolio": portfolio.metrics,
+        "symbols": portfolio.symbol_metrics,
+        "timings": {
+            "workers": {out["symbol"]: {"pid": float(out["pid"]), **out["timings"]} for out in outputs},
+            "parallel_wall": parallel_seconds,
+            "combine": combine_seconds,
+        },
+        "timeline_bars": float(len(portfolio.timestamps)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parallel multi-symbol portfolio backtest.")
+    parser.add_argument("--symbols-config", type=Path, default=Path("configs/symbols.yaml"))
+    parser.add_argument("--symbols", default=None, help="Comma-separated symbols (overrides --symbols-config)")
+    parser.add_argument("--risk-config", type=Path, default=Path("configs/risk.yaml"))
+    parser.add_argument(
+        "--data-pattern", default="data/{symbol}_5min.csv", help="Per-symbol 5-minute OHLCV CSV path with {symbol}"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per symbol)")
+    parser.add_argument("--fee-bps", type=float, default=6.0)
+    parser.add_argument("--slippage-bps", type=float, default=2.0)
+    parser.add_argument("--output-metrics", type=Path, default=Path("artifacts/portfolio_metrics.json"))
+    parser.add_argument("--cache-dir", default=None, help="Feature cache directory shared by workers (disabled if omitted)")
+    args = parser.parse_args()
+
+    config: Dict[str, Any] = {
+        **load_risk_config(args.risk_config),
+        "fee_bps": args.fee_bps,
+        "slippage_bps": args.slippage_bps,
+    }
+    symbols = args.symbols.split(",") if args.symbols else load_symbols(args.symbols_config)
+    report = run_portfolio(symbols, args.data_pattern, config, workers=args.workers, cache_dir=args.cache_dir)
+
+    args.output_metrics.parent.mkdir(parents=True, exist_ok=True)
+    args.output_metrics.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Saved portfolio metrics: {args.output_metrics}")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import List
+from typing import Sequence
 from urllib.error import URLError
 
 import numpy as np
@@ -12,6 +12,7 @@ import pandas as pd
 
 from environment.action_space import Action
 from environment.ict_env import ICTTradingEnv
+from features.precision import PRECISIONS
 
 DEFAULT_STOOQ_URL = "https://stooq.com/q/d/l/?s={symbol}&i=d"
 
@@ -53,12 +54,18 @@ def load_real_close_prices(symbol: str, source_csv: str | None = None, limit: in
     return cleaned
 
 
-def build_observations_from_prices(price_df: pd.DataFrame) -> List[List[float]]:
-    """Build environment observations from close prices."""
+def build_observations_from_prices(price_df: pd.DataFrame, precision: str = "float64") -> Sequence[Sequence[float]]:
+    """Build environment observations from close prices.
+
+    ``precision="float32"`` returns an ``(n, 1)`` float32 matrix instead of
+    a list of Python floats.
+    """
+    if precision != "float64":
+        return price_df[["Close"]].to_numpy(dtype=PRECISIONS[precision])
     return [[float(close)] for close in price_df["Close"].tolist()]
 
 
-def state_from_observation(obs: List[float]) -> int:
+def state_from_observation(obs: Sequence[float]) -> int:
     """Map continuous close values to a coarse discrete state for tabular Q-learning."""
     close = obs[0]
     bucket = int(close // 2)
@@ -71,11 +78,12 @@ def train_q_learning(
     gamma: float,
     epsilon: float,
     seed: int,
-    observations: List[List[float]],
+    observations: Sequence[Sequence[float]],
+    precision: str = "float64",
 ) -> dict:
     n_states = 200
     n_actions = len(Action)
-    q_table = np.zeros((n_states, n_actions), dtype=np.float64)
+    q_table = np.zeros((n_states, n_actions), dtype=PRECISIONS[precision])
 
     rng = np.random.default_rng(seed)
     episode_rewards: list[float] = []
@@ -96,8 +104,9 @@ def train_q_learning(
             next_obs, reward, done, _ = env.step(action)
             next_state = state_from_observation(next_obs)
 
+            # The update is computed in float64 and stored at the table's precision, like other accumulators.
             best_next = float(np.max(q_table[next_state]))
-            q_old = q_table[state, action_idx]
+            q_old = float(q_table[state, action_idx])
             q_table[state, action_idx] = q_old + alpha * (reward + gamma * best_next - q_old)
 
             state = next_state
@@ -129,11 +138,16 @@ def main() -> None:
     parser.add_argument("--source-csv", type=str, default=None, help="Optional local CSV or URL with OHLC columns")
     parser.add_argument("--max-bars", type=int, default=1500)
     parser.add_argument("--output", type=Path, default=Path("artifacts/q_learning_model.json"))
+    parser.add_argument(
+        "--precision", choices=sorted(PRECISIONS), default="float64", help="Float precision of observations and Q-table"
+    )
     args = parser.parse_args()
 
     price_df = load_real_close_prices(symbol=args.symbol, source_csv=args.source_csv, limit=args.max_bars)
-    observations = build_observations_from_prices(price_df)
-    result = train_q_learning(args.episodes, args.alpha, args.gamma, args.epsilon, args.seed, observations)
+    observations = build_observations_from_prices(price_df, args.precision)
+    result = train_q_learning(
+        args.episodes, args.alpha, args.gamma, args.epsilon, args.seed, observations, precision=args.precision
+    )
 
     result["data"] = {
         "symbol": args.symbol,
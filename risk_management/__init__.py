@@ -1,7 +1,23 @@
 """Risk management utilities."""
 
-from .position_size import calculate_position_size
-from .stop_loss import calculate_stop_loss
-from .max_drawdown import check_max_drawdown
+from .position_size import calculate_position_size, position_leverage, position_quantities, position_sizes
+from .stop_loss import calculate_stop_loss, stop_distances
+from .max_drawdown import check_max_drawdown, drawdown_halt_mask, drawdowns, within_drawdown_limit
+from .config import load_risk_config
+from .exposure import ExposureTracker, RiskDecision
 
-__all__ = ["calculate_position_size", "calculate_stop_loss", "check_max_drawdown"]
+__all__ = [
+    "calculate_position_size",
+    "position_sizes",
+    "position_leverage",
+    "position_quantities",
+    "calculate_stop_loss",
+    "stop_distances",
+    "check_max_drawdown",
+    "within_drawdown_limit",
+    "drawdowns",
+    "drawdown_halt_mask",
+    "load_risk_config",
+    "ExposureTracker",
+    "RiskDecision",
+]
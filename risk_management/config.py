@@ -0,0 +1,19 @@
+"""Risk configuration loading."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict
+
+DEFAULT_RISK_CONFIG = Path("configs/risk.yaml")
+
+
+def load_risk_config(path: str | Path | None = None) -> Dict[str, float]:
+    """Load risk settings from a YAML file (defaults to ``configs/risk.yaml``)."""
+    import yaml
+
+    source = Path(path) if path is not None else DEFAULT_RISK_CONFIG
+    with source.open("r", encoding="utf-8") as handle:
+        loaded = yaml.safe_load(handle) or {}
+    if not isinstance(loaded, dict):
+        raise ValueError(f"Risk config must be a mapping: {source}")
+    return {str(key): float(value) for key, value in loaded.items()}
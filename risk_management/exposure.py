@@ -0,0 +1,231 @@
+"""Incremental exposure tracking for pre-trade risk checks."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Tuple
+
+from .max_drawdown import check_max_drawdown
+from .stop_loss import calculate_stop_loss
+
+
+@dataclass(frozen=True)
+class RiskDecision:
+    allowed: bool
+    reason: str = "ok"
+
+    def __bool__(self) -> bool:
+        return self.allowed
+
+
+_ALLOW = RiskDecision(True)
+
+
+class _SymbolExposure:
+    __slots__ = ("qty", "avg_price", "last_price", "stop")
+
+    def __init__(self, stop: float):
+        self.qty = 0.0
+        self.avg_price = 0.0
+        self.last_price = 0.0
+        self.stop = stop
+
+
+class ExposureTracker:
+    """Running portfolio aggregates with O(1) fill, mark and order-check updates.
+
+    Per-symbol contributions to gross/net notional, unrealized PnL and open
+    risk are removed and re-added on every fill or price mark, so no update
+    walks the open positions. Equity is ``account_balance`` plus realized
+    and unrealized PnL; drawdowns are measured from running peaks of total
+    and realized-only equity.
+
+    Config keys: ``account_balance``, ``risk_percent`` (one R),
+    ``stop_loss`` (default stop for open risk), ``max_drawdown``,
+    ``max_open_risk`` (fraction of equity), ``max_symbol_exposure`` and
+    ``max_gross_exposure`` (notional as a multiple of equity) and
+    ``max_orders_per_second`` / ``max_orders_per_minute``. Limits that are
+    absent or zero are not enforced.
+    """
+
+    def __init__(self, risk_config: Dict[str, float]):
+        self.config = risk_config
+        self.balance = float(risk_config.get("account_balance", 0.0))
+        self.risk_percent = float(risk_config.get("risk_percent", 0.0))
+        self.default_stop = calculate_stop_loss(risk_config)
+        self.max_drawdown = float(risk_config.get("max_drawdown", 0.0))
+        self.max_open_risk = float(risk_config.get("max_open_risk", 0.0))
+        self.max_symbol_exposure = float(risk_config.get("max_symbol_exposure", 0.0))
+        self.max_gross_exposure = float(risk_config.get("max_gross_exposure", 0.0))
+        self._rate_limits: List[Tuple[float, int, Deque[float]]] = [
+            (window, int(risk_config[key]), deque())
+            for key, window in (("max_orders_per_second", 1.0), ("max_orders_per_minute", 60.0))
+            if float(risk_config.get(key, 0.0)) > 0
+        ]
+        self._symbols: Dict[str, _SymbolExposure] = {}
+
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self.gross_notional = 0.0
+        self.net_notional = 0.0
+        self.open_risk = 0.0
+        self.peak_equity = self.balance
+        self.peak_realized_equity = self.balance
+        self.fills = 0
+
+    # -- aggregates ----------------------------------------------------------
+
+    @property
+    def equity(self) -> float:
+        return self.balance + self.realized_pnl + self.unrealized_pnl
+
+    @property
+    def drawdown(self) -> float:
+        """Drawdown of mark-to-market equity from its peak."""
+        return 1.0 - self.equity / self.peak_equity if self.peak_equity > 0 else 0.0
+
+    @property
+    def realized_drawdown(self) -> float:
+        """Drawdown of realized-only equity from its peak."""
+        realized = self.balance + self.realized_pnl
+        return 1.0 - realized / self.peak_realized_equity if self.peak_realized_equity > 0 else 0.0
+
+    @property
+    def open_risk_r(self) -> float:
+        """Open risk in R multiples (one R = ``risk_percent`` of equity)."""
+        unit = self.equity * self.risk_percent
+        return self.open_risk / unit if unit > 0 else 0.0
+
+    def position(self, symbol: str) -> float:
+        state = self._symbols.get(symbol)
+        return state.qty if state is not None else 0.0
+
+    def notional(self, symbol: str) -> float:
+        state = self._symbols.get(symbol)
+        return state.qty * state.last_price if state is not None else 0.0
+
+    def _state(self, symbol: str) -> _SymbolExposure:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = _SymbolExposure(self.default_stop)
+        return state
+
+    def _contribute(self, state: _SymbolExposure, sign: float) -> None:
+        qty, price = state.qty, state.last_price
+        self.unrealized_pnl += sign * qty * (price - state.avg_price)
+        self.gross_notional += sign * abs(qty) * price
+        self.net_notional += sign * qty * price
+        self.open_risk += sign * abs(qty) * price * state.stop
+
+    def _update_peaks(self) -> None:
+        equity = self.equity
+        if equity > self.peak_equity:
+            self.peak_equity = equity
+        realized = self.balance + self.realized_pnl
+        if realized > self.peak_realized_equity:
+            self.peak_realized_equity = realized
+
+    # -- updates -------------------------------------------------------------
+
+    def mark(self, symbol: str, price: float) -> None:
+        """Mark a symbol to a new price."""
+        state = self._state(symbol)
+        self._contribute(state, -1.0)
+        state.last_price = price
+        self._contribute(state, 1.0)
+        self._update_peaks()
+
+    def on_fill(self, symbol: str, signed_qty: float, price: float, fee: float = 0.0, stop_distance: float | None = None) -> None:
+        """Apply a fill (positive qty buys) and its fee; a zero-quantity fill is ignored."""
+        if signed_qty == 0:
+            return
+        state = self._state(symbol)
+        self._contribute(state, -1.0)
+        qty = state.qty
+        if qty == 0 or (qty > 0) == (signed_qty > 0):
+            total = qty + signed_qty
+            state.avg_price = (state.avg_price * qty + price * signed_qty) / total
+            state.qty = total
+            if stop_distance is not None:
+                state.stop = stop_distance
+        else:
+            closing = min(abs(signed_qty), abs(qty))
+            self.realized_pnl += closing * (price - state.avg_price) * (1.0 if qty > 0 else -1.0)
+            state.qty = qty + signed_qty
+            if abs(state.qty) < 1e-12:
+                state.qty = 0.0
+                state.avg_price = 0.0
+            elif (state.qty > 0) != (qty > 0):
+                state.avg_price = price
+                if stop_distance is not None:
+                    state.stop = stop_distance
+        self.realized_pnl -= fee
+        state.last_price = price
+        self._contribute(state, 1.0)
+        self._update_peaks()
+        self.fills += 1
+
+    # -- pre-trade check -----------------------------------------------------
+
+    def check_order(
+        self,
+        symbol: str,
+        signed_qty: float,
+        price: float | None = None,
+        stop_distance: float | None = None,
+        now: float | None = None,
+    ) -> RiskDecision:
+        """Allow or deny an order against current exposure; allowed orders count toward rate limits.
+
+        Orders that only reduce a position skip the drawdown and exposure
+        limits but still count against the order-rate windows.
+        """
+        now = time.monotonic() if now is None else now
+        for window, limit, stamps in self._rate_limits:
+            while stamps and stamps[0] <= now - window:
+                stamps.popleft()
+            if len(stamps) >= limit:
+                return RiskDecision(False, "order_rate")
+
+        state = self._symbols.get(symbol)
+        qty = state.qty if state is not None else 0.0
+        after = qty + signed_qty
+        reducing = abs(after) <= abs(qty) and after * qty >= 0
+        if not reducing:
+            if self.max_drawdown > 0 and not check_max_drawdown(self.config, self.drawdown):
+                return RiskDecision(False, "max_drawdown")
+            equity = self.equity
+            last = state.last_price if state is not None else 0.0
+            price = last if price is None else price
+            notional_after = abs(after) * price
+            if self.max_symbol_exposure > 0 and notional_after > self.max_symbol_exposure * equity:
+                return RiskDecision(False, "symbol_exposure")
+            if self.max_gross_exposure > 0:
+                gross_after = self.gross_notional - abs(qty) * last + notional_after
+                if gross_after > self.max_gross_exposure * equity:
+                    return RiskDecision(False, "gross_exposure")
+            if self.max_open_risk > 0:
+                stop = self.default_stop if stop_distance is None else stop_distance
+                current = abs(qty) * last * (state.stop if state is not None else 0.0)
+                if self.open_risk - current + notional_after * stop > self.max_open_risk * equity:
+                    return RiskDecision(False, "open_risk")
+
+        for _, _, stamps in self._rate_limits:
+            stamps.append(now)
+        return _ALLOW
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "equity": self.equity,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "gross_notional": self.gross_notional,
+            "net_notional": self.net_notional,
+            "open_risk": self.open_risk,
+            "open_risk_r": self.open_risk_r,
+            "drawdown": self.drawdown,
+            "realized_drawdown": self.realized_drawdown,
+            "symbols": float(len(self._symbols)),
+            "fills": float(self.fills),
+        }
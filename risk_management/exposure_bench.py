@@ -0,0 +1,73 @@
+"""Microbenchmark for ExposureTracker fills, marks and pre-trade checks."""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Dict
+
+import numpy as np
+
+from .config import load_risk_config
+from .exposure import ExposureTracker
+
+
+def run_benchmark(symbols: int, operations: int, seed: int = 7) -> Dict[str, float]:
+    """Time ``operations`` fills, marks and order checks spread over ``symbols`` symbols."""
+    config = {
+        **load_risk_config(),
+        "account_balance": 1e9,
+        "max_open_risk": 1.0,
+        "max_symbol_exposure": 5.0,
+        "max_gross_exposure": 50.0,
+        "max_orders_per_second": 1e9,
+        "max_orders_per_minute": 1e9,
+    }
+    tracker = ExposureTracker(config)
+    rng = np.random.default_rng(seed)
+    names = [f"SYM{i}" for i in range(symbols)]
+    picks = [names[i] for i in rng.integers(0, symbols, operations).tolist()]
+    qtys = rng.normal(0.0, 10.0, operations).tolist()
+    prices = (100.0 * np.exp(rng.normal(0.0, 0.01, operations))).tolist()
+    for name in names:
+        tracker.mark(name, 100.0)
+
+    started = time.perf_counter()
+    for symbol, qty, price in zip(picks, qtys, prices):
+        tracker.on_fill(symbol, qty, price, fee=0.01)
+    fill_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for symbol, price in zip(picks, prices):
+        tracker.mark(symbol, price)
+    mark_seconds = time.perf_counter() - started
+
+    allowed = 0
+    now = 0.0
+    started = time.perf_counter()
+    for symbol, qty, price in zip(picks, qtys, prices):
+        now += 1e-4
+        allowed += tracker.check_order(symbol, qty, price, now=now).allowed
+    check_seconds = time.perf_counter() - started
+
+    return {
+        "symbols": float(symbols),
+        "operations": float(operations),
+        "fill_us": fill_seconds / operations * 1e6,
+        "mark_us": mark_seconds / operations * 1e6,
+        "check_us": check_seconds / operations * 1e6,
+        "checks_per_sec": operations / check_seconds if check_seconds > 0 else 0.0,
+        "allowed": float(allowed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark O(1) exposure tracking and pre-trade risk checks.")
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--operations", type=int, default=200000)
+    args = parser.parse_args()
+    print(json.dumps(run_benchmark(args.symbols, args.operations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
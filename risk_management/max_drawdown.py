@@ -1,10 +1,32 @@
 """Max drawdown checks."""
 from __future__ import annotations
 
-from typing import Dict
+from typing import Any, Dict
+
+import numpy as np
+
+
+def drawdowns(equity: Any, axis: int = 0) -> np.ndarray:
+    """Fractional drawdown from the running peak along ``axis`` (bars)."""
+    equity = np.asarray(equity, dtype=float)
+    peak = np.maximum.accumulate(equity, axis=axis)
+    return np.where(peak > 0, 1.0 - equity / np.where(peak > 0, peak, 1.0), 0.0)
+
+
+def within_drawdown_limit(risk_config: Dict[str, float], current_drawdown: Any) -> np.ndarray:
+    """Elementwise ``current_drawdown <= max_drawdown``; all True when ``max_drawdown`` is absent or <= 0."""
+    drawdown = np.asarray(current_drawdown, dtype=float)
+    limit = float(risk_config.get("max_drawdown", 0.0))
+    if limit <= 0:
+        return np.ones(drawdown.shape, dtype=bool)
+    return drawdown <= limit
+
+
+def drawdown_halt_mask(risk_config: Dict[str, float], equity: Any, axis: int = 0) -> np.ndarray:
+    """True on bars (per symbol column) where drawdown from the running peak breaches the limit."""
+    return ~within_drawdown_limit(risk_config, drawdowns(equity, axis=axis))
 
 
 def check_max_drawdown(risk_config: Dict[str, float], current_drawdown: float) -> bool:
     """Return True if current drawdown is within limits."""
-    limit = risk_config.get("max_drawdown", 0.0)
-    return current_drawdown <= limit
+    return bool(within_drawdown_limit(risk_config, current_drawdown))
@@ -1,11 +1,43 @@
 """Position sizing utilities."""
 from __future__ import annotations
 
-from typing import Dict
+from typing import Any, Dict
+
+import numpy as np
+
+
+def position_sizes(risk_config: Dict[str, float], equity: Any = None) -> np.ndarray:
+    """Capital at risk per trade (``equity * risk_percent``) for a scalar or array of equity.
+
+    ``equity`` defaults to ``account_balance``.
+    """
+    if equity is None:
+        equity = risk_config.get("account_balance", 0.0)
+    return np.asarray(equity, dtype=float) * float(risk_config.get("risk_percent", 0.0))
+
+
+def position_leverage(risk_config: Dict[str, float], stop_distance: Any) -> np.ndarray:
+    """Notional exposure per unit of equity so a stop-out loses ``risk_percent``.
+
+    Capped at ``max_leverage`` when configured; zero where the stop is not positive.
+    """
+    stop_distance = np.asarray(stop_distance, dtype=float)
+    safe = np.where(stop_distance > 0, stop_distance, 1.0)
+    leverage = np.where(stop_distance > 0, float(risk_config.get("risk_percent", 0.0)) / safe, 0.0)
+    if "max_leverage" in risk_config:
+        leverage = np.minimum(leverage, float(risk_config["max_leverage"]))
+    return leverage
+
+
+def position_quantities(risk_config: Dict[str, float], price: Any, stop_distance: Any, equity: Any = None) -> np.ndarray:
+    """Units to trade at ``price`` with the given stop distance, broadcast over bars x symbols."""
+    if equity is None:
+        equity = risk_config.get("account_balance", 0.0)
+    price = np.asarray(price, dtype=float)
+    notional = np.asarray(equity, dtype=float) * position_leverage(risk_config, stop_distance)
+    return np.where(price > 0, notional / np.where(price > 0, price, 1.0), 0.0)
 
 
 def calculate_position_size(risk_config: Dict[str, float]) -> float:
     """Calculate position size based on account risk settings."""
-    account_balance = risk_config.get("account_balance", 0.0)
-    risk_percent = risk_config.get("risk_percent", 0.0)
-    return account_balance * risk_percent
+    return float(position_sizes(risk_config))
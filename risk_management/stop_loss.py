@@ -1,9 +1,33 @@
 """Stop loss calculations."""
 from __future__ import annotations
 
-from typing import Dict
+from typing import Any, Dict
+
+import numpy as np
+
+
+def stop_distances(risk_config: Dict[str, float], volatility: Any = None) -> np.ndarray:
+    """Stop distances (fraction of price) for a scalar or bars x symbols array.
+
+    With ``stop_vol_multiple`` set and a ``volatility`` array given (per-bar
+    return volatility, e.g. the ``volatility`` indicator column), the stop is
+    ``stop_vol_multiple * volatility`` clipped to ``stop_loss_min`` /
+    ``stop_loss_max``. Elements without a volatility estimate (NaN or 0) and
+    calls without volatility use the fixed ``stop_loss``.
+    """
+    fixed = float(risk_config.get("stop_loss", 0.0))
+    multiple = float(risk_config.get("stop_vol_multiple", 0.0))
+    if volatility is None or multiple <= 0:
+        return np.asarray(fixed) if volatility is None else np.full(np.shape(volatility), fixed)
+    volatility = np.asarray(volatility, dtype=float)
+    scaled = np.clip(
+        multiple * volatility,
+        float(risk_config.get("stop_loss_min", 0.0)),
+        float(risk_config.get("stop_loss_max", np.inf)),
+    )
+    return np.where(np.isfinite(volatility) & (volatility > 0), scaled, fixed)
 
 
 def calculate_stop_loss(risk_config: Dict[str, float]) -> float:
     """Calculate stop loss distance from risk settings."""
-    return risk_config.get("stop_loss", 0.0)
+    return float(stop_distances(risk_config))
@@ -1,11 +1,22 @@
 """Trading strategy package."""
 
+from .evaluator import STRATEGIES, StrategySignals, describe_reason, evaluate_strategies
+from .rules import Rule, RuleEvaluator, RuleSet, compile_rules, load_rules
 from .sweep_mss_ob import generate_sweep_mss_ob_signals
 from .fvg_continuation import generate_fvg_continuation_signals
 from .premium_reversal import generate_premium_reversal_signals
 from .killzone_breakout import generate_killzone_breakout_signals
 
 __all__ = [
+    "STRATEGIES",
+    "StrategySignals",
+    "describe_reason",
+    "evaluate_strategies",
+    "Rule",
+    "RuleEvaluator",
+    "RuleSet",
+    "compile_rules",
+    "load_rules",
     "generate_sweep_mss_ob_signals",
     "generate_fvg_continuation_signals",
     "generate_premium_reversal_signals",
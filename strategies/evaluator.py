@@ -0,0 +1,151 @@
+"""Fused evaluation of all ICT strategies over one feature frame.
+
+Feature columns are read once into NumPy arrays, shared conditions are
+computed once, and every strategy's direction lands in one int8 matrix
+(bars x strategies). Reasons are bitmasks of the conditions that fired.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+STRATEGIES: Tuple[str, ...] = ("sweep_mss_ob", "fvg_continuation", "premium_reversal", "killzone_breakout")
+
+REASON_SWEEP = 1 << 0
+REASON_BOS = 1 << 1
+REASON_MSS = 1 << 2
+REASON_ORDER_BLOCK = 1 << 3
+REASON_FVG = 1 << 4
+REASON_PREMIUM = 1 << 5
+REASON_DISCOUNT = 1 << 6
+REASON_KILLZONE = 1 << 7
+REASON_VOLATILITY = 1 << 8
+
+REASON_NAMES: Dict[int, str] = {
+    REASON_SWEEP: "liquidity_sweep",
+    REASON_BOS: "bos",
+    REASON_MSS: "mss",
+    REASON_ORDER_BLOCK: "order_block",
+    REASON_FVG: "fvg",
+    REASON_PREMIUM: "premium",
+    REASON_DISCOUNT: "discount",
+    REASON_KILLZONE: "killzone",
+    REASON_VOLATILITY: "volatility",
+}
+
+# (long reasons, short reasons) per strategy, in STRATEGIES order.
+_REASONS = {
+    "sweep_mss_ob": (REASON_SWEEP | REASON_BOS | REASON_ORDER_BLOCK, REASON_SWEEP | REASON_MSS | REASON_ORDER_BLOCK),
+    "fvg_continuation": (REASON_BOS | REASON_FVG, REASON_MSS | REASON_FVG),
+    "premium_reversal": (
+        REASON_SWEEP | REASON_DISCOUNT | REASON_ORDER_BLOCK | REASON_BOS,
+        REASON_SWEEP | REASON_PREMIUM | REASON_ORDER_BLOCK | REASON_MSS,
+    ),
+    "killzone_breakout": (
+        REASON_KILLZONE | REASON_VOLATILITY | REASON_BOS | REASON_FVG,
+        REASON_KILLZONE | REASON_VOLATILITY | REASON_MSS | REASON_FVG,
+    ),
+}
+
+
+@dataclass
+class StrategySignals:
+    index: "pd.Index"
+    signals: np.ndarray
+    reasons: np.ndarray
+    names: Tuple[str, ...] = STRATEGIES
+
+    def column(self, strategy: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (signal, reason) views for one strategy."""
+        j = self.names.index(strategy)
+        return self.signals[:, j], self.reasons[:, j]
+
+    def frame(self, strategy: str) -> "pd.DataFrame":
+        """Return ``signal`` and ``signal_reason`` columns for one strategy."""
+        import pandas as pd
+
+        signal, reason = self.column(strategy)
+        return pd.DataFrame({"signal": signal, "signal_reason": reason}, index=self.index, copy=False)
+
+
+def describe_reason(code: int) -> str:
+    """Expand a reason bitmask into a readable ``a+b+c`` label."""
+    return "+".join(name for bit, name in REASON_NAMES.items() if code & bit)
+
+
+def _bool(features: "pd.DataFrame", column: str) -> np.ndarray:
+    if column not in features:
+        return np.zeros(len(features), dtype=bool)
+    values = features[column].to_numpy()
+    if values.dtype == bool:
+        return values
+    return np.asarray(features[column].fillna(0).to_numpy(dtype=float) != 0)
+
+
+def _equals(features: "pd.DataFrame", column: str, label: str) -> np.ndarray:
+    if column not in features:
+        return np.zeros(len(features), dtype=bool)
+    return np.asarray(features[column].to_numpy() == label, dtype=bool)
+
+
+def _float(features: "pd.DataFrame", column: str) -> np.ndarray:
+    import pandas as pd
+
+    if column not in features:
+        return np.full(len(features), np.nan)
+    return pd.to_numeric(features[column], errors="coerce").to_numpy(dtype=float)
+
+
+def evaluate_strategies(features: "pd.DataFrame", config: Dict[str, Any]) -> StrategySignals:
+    """Evaluate every strategy on the same feature frame in one pass.
+
+    Args:
+        features: Feature dataframe produced by the ``features`` package.
+        config: Strategy configuration (``killzone_min_volatility``).
+
+    Returns:
+        Signal matrix (int8, -1/0/1) and reason bitmask matrix (uint16), both
+        shaped bars x strategies in ``STRATEGIES`` order.
+    """
+    sweep = _bool(features, "liquidity_sweep")
+    bos = _bool(features, "bos")
+    mss = _bool(features, "mss")
+    bull_fvg = _equals(features, "fvg_direction", "bullish")
+    bear_fvg = _equals(features, "fvg_direction", "bearish")
+    premium = _equals(features, "premium_discount_zone", "premium")
+    discount = _equals(features, "premium_discount_zone", "discount")
+    killzone = _bool(features, "session_london") | _bool(features, "session_ny")
+    volatile = _float(features, "volatility") > float(config.get("killzone_min_volatility", 0.0))
+
+    low = _float(features, "low")
+    high = _float(features, "high")
+    close = _float(features, "close")
+    ob_high = _float(features, "order_block_high")
+    ob_low = _float(features, "order_block_low")
+    in_bull_ob = _equals(features, "order_block_type", "bullish") & (low <= ob_high) & (close >= ob_low)
+    in_bear_ob = _equals(features, "order_block_type", "bearish") & (high >= ob_low) & (close <= ob_high)
+
+    sweep_bull = sweep & bos
+    sweep_bear = sweep & mss
+    conditions = {
+        "sweep_mss_ob": (sweep_bull & in_bull_ob, sweep_bear & in_bear_ob),
+        "fvg_continuation": (bos & bull_fvg, mss & bear_fvg),
+        "premium_reversal": (sweep_bull & in_bull_ob & discount, sweep_bear & in_bear_ob & premium),
+        "killzone_breakout": (killzone & volatile & bos & bull_fvg, killzone & volatile & mss & bear_fvg),
+    }
+
+    n = len(features)
+    signals = np.zeros((n, len(STRATEGIES)), dtype=np.int8, order="F")
+    reasons = np.zeros((n, len(STRATEGIES)), dtype=np.uint16, order="F")
+    for j, name in enumerate(STRATEGIES):
+        long_mask, short_mask = conditions[name]
+        long_reason, short_reason = _REASONS[name]
+        signals[:, j] = long_mask.view(np.int8) - short_mask.view(np.int8)
+        reasons[:, j] = np.where(signals[:, j] > 0, long_reason, np.where(signals[:, j] < 0, short_reason, 0))
+
+    return StrategySignals(index=features.index, signals=signals, reasons=reasons)
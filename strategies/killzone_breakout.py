@@ -3,21 +3,26 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, Dict
 
+from .evaluator import StrategySignals, evaluate_strategies
+
 if TYPE_CHECKING:
     import pandas as pd
 
 
-def generate_killzone_breakout_signals(features: "pd.DataFrame", config: Dict[str, Any]) -> "pd.DataFrame":
+def generate_killzone_breakout_signals(
+    features: "pd.DataFrame", config: Dict[str, Any], evaluated: StrategySignals | None = None
+) -> "pd.DataFrame":
     """Generate trade signals for kill zone momentum.
 
     Args:
         features: Feature dataframe with session encodings.
         config: Strategy configuration.
+        evaluated: Optional precomputed output of ``evaluate_strategies`` to
+            reuse when several strategies run on the same features.
 
     Returns:
-        Dataframe with signal columns appended.
+        Dataframe with ``signal`` (-1/0/1) and ``signal_reason`` (bitmask)
+        columns, indexed like ``features``.
     """
-    signals = features.copy()
-    signals["signal"] = 0
-    signals["signal_reason"] = ""
-    return signals
+    evaluated = evaluated if evaluated is not None else evaluate_strategies(features, config)
+    return evaluated.frame("killzone_breakout")
@@ -0,0 +1,223 @@
+"""Declarative strategy rules compiled to vectorized NumPy masks.
+
+A rule is a mapping (or YAML document) such as::
+
+    name: sweep_mss_ob_long
+    direction: 1
+    reasons: [liquidity_sweep, bos, order_block]
+    when:
+      sequence: [liquidity_sweep, bos, {col: order_block_type, eq: bullish}]
+      within: 12
+
+Conditions:
+
+- ``"column"``: the column is truthy: nonzero numbers, and non-null,
+  non-empty values in object/string columns.
+- ``{col: name, <op>: value}`` with ``op`` in ``eq, ne, gt, ge, lt, le, in``;
+  ``value`` may itself be ``{col: other}`` to compare two columns.
+- ``{all: [...]}``, ``{any: [...]}``, ``{not: cond}``.
+- ``{within: N, of: cond}``: ``cond`` held on any of the last ``N`` bars.
+- ``{sequence: [a, b, ...], within: N}``: each step on a later bar than the
+  previous one, the whole chain inside the last ``N`` bars and the final
+  step on the current bar.
+
+Every node is evaluated once per feature frame: masks are cached under a
+canonical key, so sub-expressions shared between rules are computed once.
+"""
+from __future__ import annotations
+
+import json
+import operator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+from .evaluator import REASON_NAMES, StrategySignals
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+}
+_REASON_BITS = {name: bit for bit, name in REASON_NAMES.items()}
+
+
+@dataclass
+class Rule:
+    name: str
+    direction: int
+    when: Any
+    reasons: int = 0
+
+
+def _key(node: Any) -> str:
+    return json.dumps(node, sort_keys=True, default=str)
+
+
+def _rolling_any(mask: np.ndarray, window: int) -> np.ndarray:
+    """True where ``mask`` held on any of the last ``window`` bars."""
+    counts = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+    start = np.maximum(np.arange(1, len(mask) + 1) - window, 0)
+    return counts[1:] - counts[start] > 0
+
+
+class RuleEvaluator:
+    """Evaluates conditions on one feature frame with a shared mask cache."""
+
+    def __init__(self, features: "pd.DataFrame"):
+        self.features = features
+        self.cache: Dict[str, np.ndarray] = {}
+        self.hits = 0
+
+    def mask(self, node: Any) -> np.ndarray:
+        key = _key(node)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        result = self._compute(node)
+        self.cache[key] = result
+        return result
+
+    def _column(self, name: str, numeric: bool) -> np.ndarray:
+        import pandas as pd
+
+        key = _key({"__column__": name, "numeric": numeric})
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        if name not in self.features:
+            raise ValueError(f"Unknown feature column in rule: {name}")
+        series = self.features[name]
+        if numeric:
+            values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+        else:
+            values = series.to_numpy()
+        self.cache[key] = values
+        return values
+
+    def _compute(self, node: Any) -> np.ndarray:
+        if isinstance(node, str):
+            values = self._column(node, numeric=False)
+            if values.dtype == bool:
+                return values
+            numbers = self._column(node, numeric=True)
+            if values.dtype.kind in "iuf":
+                return np.nan_to_num(numbers) != 0
+            # Object/string columns: numbers by value, other entries when non-null and non-empty.
+            series = self.features[node]
+            text = (series.notna() & series.ne("").fillna(False)).to_numpy(dtype=bool)
+            return np.where(np.isnan(numbers), text, numbers != 0)
+        if not isinstance(node, dict):
+            raise ValueError(f"Invalid rule condition: {node!r}")
+
+        if "all" in node:
+            return np.logical_and.reduce([self.mask(child) for child in node["all"]])
+        if "any" in node:
+            return np.logical_or.reduce([self.mask(child) for child in node["any"]])
+        if "not" in node:
+            return ~self.mask(node["not"])
+        if "sequence" in node:
+            return self._sequence(node["sequence"], int(node["within"]))
+        if "within" in node:
+            return _rolling_any(self.mask(node["of"]), int(node["within"]))
+        if "col" in node:
+            return self._compare(node)
+        raise ValueError(f"Invalid rule condition: {node!r}")
+
+    def _compare(self, node: Dict[str, Any]) -> np.ndarray:
+        ops = [op for op in node if op != "col"]
+        if len(ops) != 1:
+            raise ValueError(f"Comparison needs exactly one operator: {node!r}")
+        op = ops[0]
+        value = node[op]
+        if op == "in":
+            return np.isin(self._column(node["col"], numeric=False), list(value))
+        if op not in _COMPARISONS:
+            raise ValueError(f"Unknown comparison operator: {op}")
+
+        if isinstance(value, dict) and "col" in value:
+            numeric = op not in ("eq", "ne")
+            left = self._column(node["col"], numeric=numeric)
+            right = self._column(value["col"], numeric=numeric)
+            return np.asarray(_COMPARISONS[op](left, right), dtype=bool)
+        if isinstance(value, str):
+            return np.asarray(_COMPARISONS[op](self._column(node["col"], numeric=False), value), dtype=bool)
+        return np.asarray(_COMPARISONS[op](self._column(node["col"], numeric=True), float(value)), dtype=bool)
+
+    def _sequence(self, steps: Sequence[Any], within: int) -> np.ndarray:
+        """Ordered steps inside a window, tracked via latest chain start per bar."""
+        masks = [self.mask(step) for step in steps]
+        idx = np.arange(len(self.features))
+        start = np.where(masks[0], idx, -1)
+        for step_mask in masks[1:]:
+            latest = np.maximum.accumulate(start)
+            previous = np.concatenate(([-1], latest[:-1]))
+            start = np.where(step_mask & (previous >= 0), previous, -1)
+        return (start >= 0) & (idx - start < within)
+
+
+def compile_rule(spec: Dict[str, Any]) -> Rule:
+    """Validate and normalize one rule mapping."""
+    for field in ("name", "direction", "when"):
+        if field not in spec:
+            raise ValueError(f"Rule is missing '{field}': {spec!r}")
+    direction = int(spec["direction"])
+    if direction not in (-1, 1):
+        raise ValueError(f"Rule direction must be 1 or -1: {spec['name']}")
+    reasons = 0
+    for reason in spec.get("reasons", []):
+        if reason not in _REASON_BITS:
+            raise ValueError(f"Unknown reason '{reason}' in rule {spec['name']}")
+        reasons |= _REASON_BITS[reason]
+    return Rule(name=str(spec["name"]), direction=direction, when=spec["when"], reasons=reasons)
+
+
+class RuleSet:
+    """A compiled list of rules evaluated together over shared masks."""
+
+    def __init__(self, rules: List[Rule]):
+        self.rules = rules
+
+    def evaluate(self, features: "pd.DataFrame", evaluator: RuleEvaluator | None = None) -> StrategySignals:
+        """Return a bars x rules signal matrix; pass ``evaluator`` to share masks across rule sets."""
+        evaluator = evaluator or RuleEvaluator(features)
+        n = len(features)
+        signals = np.zeros((n, len(self.rules)), dtype=np.int8, order="F")
+        reasons = np.zeros((n, len(self.rules)), dtype=np.uint16, order="F")
+        for j, rule in enumerate(self.rules):
+            fired = evaluator.mask(rule.when)
+            signals[:, j] = fired.view(np.int8) * np.int8(rule.direction)
+            reasons[:, j] = np.where(fired, rule.reasons, 0)
+        return StrategySignals(
+            index=features.index,
+            signals=signals,
+            reasons=reasons,
+            names=tuple(rule.name for rule in self.rules),
+        )
+
+    def combined(self, features: "pd.DataFrame", evaluator: RuleEvaluator | None = None) -> np.ndarray:
+        """Net direction across all rules (-1/0/1) per bar."""
+        signals = self.evaluate(features, evaluator).signals
+        return np.sign(signals.sum(axis=1, dtype=np.int32)).astype(np.int8)
+
+
+def compile_rules(specs: List[Dict[str, Any]]) -> RuleSet:
+    """Compile rule mappings into a ``RuleSet``."""
+    return RuleSet([compile_rule(spec) for spec in specs])
+
+
+def load_rules(path: str | Path) -> RuleSet:
+    """Compile rules from a YAML file with a top-level ``rules`` list."""
+    import yaml
+
+    loaded = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or {}
+    return compile_rules(list(loaded.get("rules", [])))
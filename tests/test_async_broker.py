@@ -0,0 +1,38 @@
+"""Async broker client against the local mock exchange."""
+from __future__ import annotations
+
+import asyncio
+
+from execution.async_broker import AsyncBrokerClient, BrokerError
+from execution.mock_exchange import MockExchange
+
+ORDER = {"symbol": "BTCUSD", "side": "buy", "qty": 1.0, "type": "market"}
+
+
+async def _place(orders: int, client_config, exchange_config, batched: bool):
+    async with MockExchange(exchange_config) as exchange:
+        config = {**client_config, "host": exchange.host, "port": exchange.port}
+        async with AsyncBrokerClient(config) as client:
+            results = await client.place_orders([dict(ORDER) for _ in range(orders)], batched=batched)
+            return results, client.retried, len(exchange.orders)
+
+
+def test_pool_wait_does_not_count_against_timeout():
+    # 40 requests x 50 ms over 2 connections queue for ~1 s, far beyond the 0.2 s timeout.
+    results, retried, accepted = asyncio.run(
+        _place(40, {"pool_size": 2, "timeout": 0.2, "retries": 0}, {"latency": 0.05}, batched=False)
+    )
+    assert retried == 0
+    assert accepted == 40
+    assert not any(isinstance(result, BrokerError) for result in results)
+
+
+def test_failed_requests_keep_acks_of_accepted_orders():
+    for batched in (False, True):
+        results, _, accepted = asyncio.run(
+            _place(60, {"retries": 0, "batch_size": 10}, {"failure_rate": 0.5, "seed": 3}, batched=batched)
+        )
+        assert len(results) == 60
+        acks = [result for result in results if not isinstance(result, BrokerError)]
+        assert 0 < len(acks) < 60
+        assert len(acks) == accepted
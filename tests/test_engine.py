@@ -0,0 +1,143 @@
+"""Vectorized backtest simulation against a bar-by-bar reference."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+from backtesting.engine import _simulate
+
+
+def _reference(signal, open_, high, low, close, stops, config: Dict[str, Any]):
+    """Straightforward loop over bars with the engine's fill rules."""
+    n = len(close)
+    equity_value = float(config.get("account_balance", 10000.0))
+    fee = float(config.get("fee_bps", 6.0)) / 10000.0
+    slip = float(config.get("slippage_bps", 2.0)) / 10000.0
+    stop_first = str(config.get("intrabar_priority", "stop")) == "stop"
+    max_leverage = float(config.get("max_leverage", np.inf))
+
+    rows = []
+    equity = np.empty(n)
+    position = np.zeros(n)
+    held_stop = np.zeros(n)
+    trade = None
+    previous_target = 0
+    for t in range(n):
+        target = int(signal[t - 1]) if t > 0 else 0
+        new_run = t == 0 or target != previous_target
+        previous_target = target
+
+        if trade is not None and new_run:
+            direction = trade["direction"]
+            trade.update(exit_index=t, exit_price=open_[t] * (1.0 - direction * slip), exit_reason="signal")
+            equity_value = _close(trade, rows, equity_value, fee)
+            trade = None
+        if trade is None and new_run and target != 0:
+            stop_pct = stops[max(t - 1, 0)]
+            target_pct = float(config["take_profit"]) if "take_profit" in config else stop_pct * float(config.get("reward_risk", 2.0))
+            entry = open_[t] * (1.0 + target * slip)
+            trade = {
+                "entry_index": t,
+                "direction": target,
+                "entry_price": entry,
+                "stop_price": entry * (1.0 - target * stop_pct),
+                "target_price": entry * (1.0 + target * target_pct),
+                "stop_pct": stop_pct,
+                "leverage": min(float(config["risk_percent"]) / stop_pct, max_leverage),
+                "equity_before": equity_value,
+            }
+
+        if trade is not None:
+            direction = trade["direction"]
+            position[t] = direction * trade["leverage"]
+            held_stop[t] = trade["stop_pct"]
+            stop, target_price = trade["stop_price"], trade["target_price"]
+            hit_stop = low[t] <= stop if direction > 0 else high[t] >= stop
+            hit_target = high[t] >= target_price if direction > 0 else low[t] <= target_price
+            gapped = t > trade["entry_index"]
+            if hit_stop and (not hit_target or stop_first):
+                fill = (min(open_[t], stop) if direction > 0 else max(open_[t], stop)) if gapped else stop
+                trade.update(exit_index=t, exit_price=fill * (1.0 - direction * slip), exit_reason="stop")
+            elif hit_target:
+                fill = (max(open_[t], target_price) if direction > 0 else min(open_[t], target_price)) if gapped else target_price
+                trade.update(exit_index=t, exit_price=fill, exit_reason="target")
+            elif t == n - 1:
+                trade.update(exit_index=t, exit_price=close[t] * (1.0 - direction * slip), exit_reason="end")
+            if "exit_index" in trade:
+                equity_value = _close(trade, rows, equity_value, fee)
+                trade = None
+            else:
+                move = direction * (close[t] - trade["entry_price"]) / trade["entry_price"]
+                equity[t] = trade["equity_before"] * (1.0 + trade["leverage"] * (move - fee))
+                continue
+        equity[t] = equity_value
+    return pd.DataFrame(rows), equity, position, held_stop
+
+
+def _close(trade: Dict[str, Any], rows, equity_value: float, fee: float) -> float:
+    entry, exit_price, direction = trade["entry_price"], trade["exit_price"], trade["direction"]
+    gross = direction * (exit_price - entry) / entry
+    trade_return = trade["leverage"] * (gross - fee * (1.0 + exit_price / entry))
+    rows.append(
+        {
+            "entry_index": trade["entry_index"],
+            "exit_index": trade["exit_index"],
+            "direction": direction,
+            "entry_price": entry,
+            "exit_price": exit_price,
+            "stop_price": trade["stop_price"],
+            "target_price": trade["target_price"],
+            "exit_reason": trade["exit_reason"],
+            "r_multiple": trade_return / (trade["leverage"] * trade["stop_pct"]),
+            "return": trade_return,
+            "pnl": equity_value * trade_return,
+        }
+    )
+    return equity_value * (1.0 + trade_return)
+
+
+def _market(seed: int, n: int):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.003, n)))
+    # Occasional gaps between the previous close and this open.
+    open_ = np.concatenate(([100.0], close[:-1])) * np.exp(rng.normal(0.0, 0.004, n) * (rng.random(n) < 0.1))
+    spread = np.abs(rng.normal(0.0, 0.003, n))
+    high = np.maximum(open_, close) * (1.0 + spread)
+    low = np.minimum(open_, close) * (1.0 - spread)
+    runs = rng.integers(1, 15, n)
+    signal = np.repeat(rng.choice([-1, 0, 1], n), runs)[:n].astype(np.int8)
+    stops = rng.uniform(0.001, 0.006, n)
+    if seed % 2:
+        # Hold the final run with a wide stop so it closes at the last bar.
+        signal[-20:] = 1
+        stops[-21:] = 0.2
+    return signal, open_, high, low, close, stops
+
+
+def test_simulate_matches_bar_loop_reference():
+    configs = [
+        {},
+        {"intrabar_priority": "target"},
+        {"take_profit": 0.002, "max_leverage": 3.0},
+        {"reward_risk": 0.5, "fee_bps": 0.0, "slippage_bps": 0.0},
+    ]
+    reasons = set()
+    for seed in range(6):
+        market = _market(seed, 600)
+        for overrides in configs:
+            config = {"account_balance": 10000.0, "risk_percent": 0.01, "stop_loss": 0.002, **overrides}
+            trades, equity, position, stop = _simulate(*market, config)
+            expected, expected_equity, expected_position, expected_stop = _reference(*market, config)
+
+            assert len(trades) == len(expected) > 0
+            for column in ("entry_index", "exit_index", "direction", "exit_reason"):
+                assert trades[column].tolist() == expected[column].tolist(), column
+            for column in ("entry_price", "exit_price", "stop_price", "target_price", "r_multiple", "return", "pnl"):
+                np.testing.assert_allclose(trades[column], expected[column], rtol=1e-9, err_msg=column)
+            np.testing.assert_allclose(equity, expected_equity, rtol=1e-9)
+            np.testing.assert_allclose(position, expected_position, rtol=1e-12)
+            np.testing.assert_allclose(stop, expected_stop, rtol=1e-12)
+            reasons.update(trades["exit_reason"])
+    assert reasons == {"stop", "target", "signal", "end"}
@@ -0,0 +1,90 @@
+"""Live trading loop against the paper trader."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+from typing import Any, Dict
+
+import numpy as np
+
+from execution.async_broker import BrokerError
+from execution.live_trader import LiveTrader
+from execution.paper_trader import PaperTrader
+
+SYMBOL = "BTCUSD"
+CONFIG = {
+    "symbol": SYMBOL,
+    "account_balance": 100000.0,
+    "risk_percent": 0.01,
+    "stop_loss": 0.01,
+    "max_drawdown": 0.0,
+    "max_open_risk": 0.05,
+}
+
+
+class FlakyBroker(PaperTrader):
+    """Paper trader whose every third submission fails."""
+
+    submitted = 0
+
+    async def place_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        self.submitted += 1
+        await asyncio.sleep(0)
+        if self.submitted % 3 == 0:
+            raise BrokerError("broker unavailable")
+        return self.execute(order)
+
+
+def _bars(n: int, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    close = 30000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, n)))
+    open_ = np.concatenate(([30000.0], close[:-1]))
+    for i in range(n):
+        yield {
+            "symbol": SYMBOL,
+            "timestamp": 1.6e9 + 300.0 * i,
+            "open": open_[i],
+            "high": max(open_[i], close[i]) * 1.001,
+            "low": min(open_[i], close[i]) * 0.999,
+            "close": close[i],
+            "volume": 1.0,
+        }
+
+
+def _run(broker: PaperTrader, queue_size: int, bars: int = 300):
+    ticks = itertools.count()
+    trader = LiveTrader(broker, {**CONFIG, "queue_size": queue_size}, policy=lambda _: (1, -1, 0)[next(ticks) // 7 % 3])
+    report = asyncio.run(trader.run(_bars(bars)))
+    return trader, report
+
+
+def _broker_qty(broker: PaperTrader) -> float:
+    qty = broker.positions[SYMBOL].qty if SYMBOL in broker.positions else 0.0
+    for order in broker.open_orders.values():
+        qty += order["qty"] if order["side"] == "buy" else -order["qty"]
+    return qty
+
+
+def test_market_orders_fill_at_next_open_for_any_queue_size():
+    fills = []
+    for queue_size in (1, 4, 64):
+        broker = PaperTrader({"symbol": SYMBOL})
+        trader, report = _run(broker, queue_size)
+        assert report["bars"] == broker._book(SYMBOL).bars == 300
+        frame = broker.ledger.to_frame()
+        assert len(frame) == report["orders"] > 0
+        assert np.isclose(trader.position_qty, _broker_qty(broker))
+        fills.append(frame)
+    for frame in fills[1:]:
+        assert frame.equals(fills[0])
+
+
+def test_submit_errors_are_rejections_and_the_loop_keeps_running():
+    broker = FlakyBroker({"symbol": SYMBOL})
+    trader, report = _run(broker, 8)
+    assert report["bars"] == broker._book(SYMBOL).bars == 300
+    failed = broker.submitted // 3
+    assert failed > 0
+    assert report["rejections_by_reason"]["submit_error"] == failed
+    assert report["orders"] == broker.submitted - failed
+    assert np.isclose(trader.position_qty, _broker_qty(broker))
@@ -0,0 +1,57 @@
+"""Portfolio combination of per-symbol backtests."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from backtesting.engine import run_backtest
+from backtesting.portfolio import combine_portfolio
+from risk_management.max_drawdown import drawdowns
+
+CONFIG = {"account_balance": 10000.0, "risk_percent": 0.01, "stop_loss": 0.004, "reward_risk": 2.0, "max_drawdown": 0.0}
+
+
+def _symbol(seed: int, n: int = 4000, offset_minutes: int = 0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.004, n)))
+    open_ = np.concatenate(([100.0], close[:-1]))
+    spread = np.abs(rng.normal(0.0, 0.002, n)) * close
+    prices = pd.DataFrame(
+        {"open": open_, "high": np.maximum(open_, close) + spread, "low": np.minimum(open_, close) - spread, "close": close}
+    )
+    signal = np.repeat(rng.choice([-1, 0, 1], n // 20 + 1), 20)[:n]
+    timestamps = pd.date_range("2024-01-01", periods=n, freq="5min", tz="UTC") + pd.Timedelta(minutes=offset_minutes)
+    return signal, prices, timestamps
+
+
+def _run(config, symbols):
+    results, timestamps = {}, {}
+    for name, (signal, prices, stamps) in symbols.items():
+        results[name] = run_backtest(signal, prices, config)
+        timestamps[name] = stamps
+    return results, combine_portfolio(results, timestamps, config)
+
+
+def test_single_symbol_matches_its_standalone_backtest():
+    config = {**CONFIG, "max_open_risk": 1.0}
+    results, portfolio = _run(config, {"A": _symbol(1)})
+    np.testing.assert_allclose(portfolio.equity, results["A"].equity)
+    for key in ("trades", "expectancy", "profit_factor", "win_rate", "total_return_pct"):
+        assert np.isclose(portfolio.metrics[key], results["A"].metrics[key])
+
+
+def test_portfolio_drawdown_halt_and_trade_pnl():
+    config = {**CONFIG, "max_open_risk": 0.02, "max_drawdown": 0.1}
+    symbols = {name: _symbol(seed, offset_minutes=5 * seed) for seed, name in enumerate("ABC")}
+    _, unhalted = _run({**config, "max_drawdown": 0.0}, symbols)
+    assert drawdowns(unhalted.equity).max() > 0.15
+
+    _, portfolio = _run(config, symbols)
+    assert portfolio.metrics["halted"] == 1.0
+    halt_at = int(np.argmax(drawdowns(portfolio.equity) > 0.1))
+    # Only the breaching bar can overshoot; nothing moves after it.
+    assert np.all(portfolio.returns[halt_at + 1 :] == 0.0)
+    assert np.all(portfolio.scale[halt_at + 1 :] == 0.0)
+    assert drawdowns(portfolio.equity[:halt_at]).max() <= 0.1
+    np.testing.assert_allclose(10000.0 * np.cumprod(1.0 + portfolio.returns), portfolio.equity)
+    assert portfolio.metrics["trades"] < unhalted.metrics["trades"]
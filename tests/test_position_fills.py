@@ -0,0 +1,28 @@
+"""Fill bookkeeping in the exposure tracker and the paper trader's positions."""
+from __future__ import annotations
+
+from execution.paper_trader import Position
+from risk_management import ExposureTracker
+
+
+def test_zero_quantity_fill_on_flat_symbol_is_ignored():
+    tracker = ExposureTracker({"account_balance": 1000})
+    tracker.on_fill("X", 0.0, 100.0)
+    assert tracker.summary()["fills"] == 0.0
+    assert tracker.equity == 1000.0
+
+    position = Position()
+    assert position.apply(0.0, 100.0) == 0.0
+    assert (position.qty, position.avg_price) == (0.0, 0.0)
+
+
+def test_zero_quantity_fill_leaves_open_position_unchanged():
+    tracker = ExposureTracker({"account_balance": 1000})
+    tracker.on_fill("X", 2.0, 100.0)
+    tracker.on_fill("X", 0.0, 120.0)
+    assert tracker.summary()["net_notional"] == 200.0
+
+    position = Position()
+    position.apply(2.0, 100.0)
+    assert position.apply(0.0, 120.0) == 0.0
+    assert (position.qty, position.avg_price) == (2.0, 100.0)
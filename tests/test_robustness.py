@@ -0,0 +1,37 @@
+"""Block-bootstrap path merging against brute-force path evaluation."""
+from __future__ import annotations
+
+import numpy as np
+
+from backtesting.robustness import _block_layout, _block_tables, _merge_blocks, _path_stats
+
+
+def _replayed_paths(log_returns, wins, active, lengths, seed: int, m: int):
+    """Rebuild the bar-level paths from the same block picks ``_merge_blocks`` draws."""
+    rng = np.random.default_rng(seed)
+    n = len(log_returns)
+    full = lengths.count(lengths[0])
+    starts = [rng.integers(0, n - lengths[0] + 1, size=(m, full), dtype=np.int32)]
+    if full < len(lengths):
+        starts.append(rng.integers(0, n - lengths[-1] + 1, size=(m, 1), dtype=np.int32))
+    starts = np.hstack(starts)
+    index = np.array([np.concatenate([np.arange(s, s + L) for s, L in zip(row, lengths)]) for row in starts])
+    return log_returns[index], wins[index], active[index]
+
+
+def test_merged_block_stats_match_brute_force_paths():
+    rng = np.random.default_rng(11)
+    for n, block_size in ((103, 10), (100, 10), (7, 7), (50, 1)):
+        log_returns = rng.normal(0.0, 0.02, n)
+        active = rng.random(n) < 0.6
+        wins = active & (rng.random(n) < 0.5)
+        lengths = _block_layout(n, block_size)
+        tables = {
+            length: _block_tables(log_returns, wins.astype(float), active.astype(float), length, chunk_elements=64)
+            for length in set(lengths)
+        }
+        m = 300
+        merged = _merge_blocks(tables, lengths, np.random.default_rng(5), m)
+        paths = _replayed_paths(log_returns, wins.astype(float), active.astype(float), lengths, 5, m)
+        assert paths[0].shape == (m, n)
+        np.testing.assert_allclose(merged, _path_stats(*paths), rtol=1e-9, atol=1e-12)
@@ -0,0 +1,29 @@
+"""Declarative strategy rule conditions."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from strategies.rules import RuleEvaluator
+
+
+def test_bare_column_condition_is_truthiness_for_every_dtype():
+    features = pd.DataFrame(
+        {
+            "fvg_direction": ["bullish", None, "", np.nan, "bearish"],
+            "labels": pd.array(["a", None, "", "x", "y"], dtype="string"),
+            "flags": pd.Series([True, None, False, 1, 0], dtype=object),
+            "score": [1.0, np.nan, 0.0, 2.0, 0.0],
+            "count": [0, 1, 2, 0, 3],
+        }
+    )
+    evaluator = RuleEvaluator(features)
+    expected = {
+        "fvg_direction": [True, False, False, False, True],
+        "labels": [True, False, False, True, True],
+        "flags": [True, False, False, True, False],
+        "score": [True, False, False, True, False],
+        "count": [False, True, True, False, True],
+    }
+    for column, mask in expected.items():
+        np.testing.assert_array_equal(evaluator.mask(column), mask, err_msg=column)